@@ -0,0 +1,8 @@
+"""URLconf of the ASGI app: the same routes, with the blog reads on async views."""
+from django.urls import include, path
+from .urls import urlpatterns as wsgi_urlpatterns
+
+urlpatterns = [
+    path("blogs/", include("blogs.async_urls")),
+    *wsgi_urlpatterns,
+]
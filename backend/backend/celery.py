@@ -1,6 +1,11 @@
+import itertools
+import json
+import logging
 import os
 from celery import Celery
+from celery.signals import task_postrun, worker_process_init
 from django.conf import settings
+from .db_pool import discard_inherited_pools, pool_stats
 
 # Sets the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
@@ -11,6 +16,28 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 
 app.autodiscover_tasks(lambda: settings.INSTALLED_APPS)
 
+logger = logging.getLogger(__name__)
+# Every this many tasks a worker process logs its connection pool metrics
+POOL_STATS_EVERY = int(os.getenv('DB_POOL_STATS_EVERY', 100))
+tasks_run = itertools.count(1)
+
+
+@worker_process_init.connect
+def reset_database_pools(**kwargs):
+    # Celery's Django fixup has closed the inherited connections, the pools go too
+    discard_inherited_pools()
+
+
+@task_postrun.connect
+def log_database_pools(**kwargs):
+    # Connections go back to the pool (or stay open up to CONN_MAX_AGE) through
+    # Celery's Django fixup, which closes them around every task
+    if POOL_STATS_EVERY and next(tasks_run) % POOL_STATS_EVERY == 0:
+        stats = pool_stats()
+        if any(database['pooled'] for database in stats.values()):
+            logger.info('db_pool %s', json.dumps({'pid': os.getpid(), 'databases': stats}))
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
\ No newline at end of file
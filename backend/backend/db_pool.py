@@ -0,0 +1,73 @@
+import logging
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def describe_pool(pool):
+    """
+    Sizing metrics of a psycopg ConnectionPool: connections in use and idle,
+    clients waiting, and how long waits and new connections took. Counters
+    add up from the start of the process.
+    """
+    # get_stats() leaves out counters that are still zero
+    stats = pool.get_stats()
+    size, available = stats.get('pool_size', 0), stats.get('pool_available', 0)
+    connections_made = stats.get('connections_num', 0)
+    return {
+        'min_size': stats.get('pool_min', pool.min_size),
+        'max_size': stats.get('pool_max', pool.max_size),
+        'size': size,
+        # Handed to a request or task, or still connecting
+        'in_use': size - available,
+        'idle': available,
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': stats.get('requests_num', 0),
+        'waits': stats.get('requests_queued', 0),
+        'wait_ms': stats.get('requests_wait_ms', 0),
+        'wait_timeouts': stats.get('requests_errors', 0),
+        'connections': connections_made,
+        'connect_ms': stats.get('connections_ms', 0),
+        'connect_ms_mean': round(stats.get('connections_ms', 0) / connections_made, 2) if connections_made else 0,
+        'connect_errors': stats.get('connections_errors', 0),
+        'connections_lost': stats.get('connections_lost', 0),
+        'returned_broken': stats.get('returns_bad', 0),
+    }
+
+
+def pool_stats():
+    """How each database alias of this process connects, with pool metrics where pooled."""
+    stats = {}
+    for connection in connections.all():
+        # Only the PostgreSQL backend has pools, and only with OPTIONS['pool'] set
+        pool = getattr(connection, 'pool', None)
+        stats[connection.alias] = {
+            'pooled': pool is not None,
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+            **(describe_pool(pool) if pool is not None else {}),
+        }
+    return stats
+
+
+def close_pools():
+    """Close this process's pools, before forking workers that must not share them."""
+    for connection in connections.all():
+        if getattr(connection, 'pool', None) is not None:
+            connection.close_pool()
+
+
+def discard_inherited_pools():
+    """
+    Forget pools copied from the parent process, in a freshly forked child.
+
+    They are dropped without closing: their sockets still belong to the
+    parent and their background threads didn't survive the fork. The next
+    query creates a new pool for this process.
+    """
+    for connection in connections.all():
+        # Django 5.1 keeps the pools in the private class attribute
+        # DatabaseWrapper._connection_pools, test_discard_inherited_pools
+        # fails if that moves
+        getattr(type(connection), '_connection_pools', {}).pop(connection.alias, None)
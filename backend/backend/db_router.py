@@ -0,0 +1,150 @@
+"""
+Read replica routing.
+
+Everything reads from and writes to ``default`` (the primary) unless code
+runs inside ``replica_reads()``: the GET blog views (see ReplicaReadsMixin)
+and the read-only Celery work. Without a ``replica`` database configured
+the router does nothing.
+
+Replicas trail the primary, so a user who just wrote through the API is
+pinned to the primary for REPLICA_PIN_SECONDS and reads their own writes.
+Any blog write, wherever it comes from, also flags the replica as possibly
+behind for as long, see note_write().
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+REPLICA = 'replica'
+PIN_KEY_PREFIX = 'db:pin:'
+# Set by every blog write, while it lives shared caches aren't filled from the replica
+RECENT_WRITE_KEY = 'db:recent-write'
+
+# A context variable follows a request into sync_to_async threads and stays
+# apart between threads and between coroutines
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def has_replica():
+    return REPLICA in connections.settings
+
+
+@contextmanager
+def replica_reads():
+    """Send the reads of the block to the replica, when there is one."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def reading_from_replica():
+    return _replica_reads.get() and has_replica()
+
+
+def pin_to_primary(user_id):
+    cache.set(PIN_KEY_PREFIX + str(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def note_write():
+    """
+    Flag that the replica may not have the latest writes for a while. Called
+    by the blog signals as the write happens, before it commits, so the API,
+    the admin, Celery and the shell are all covered, and no reader can cache
+    a stale page in between.
+    """
+    if has_replica():
+        cache.set(RECENT_WRITE_KEY, True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return user_id is not None and has_replica() and cache.get(PIN_KEY_PREFIX + str(user_id)) is not None
+
+
+def pinned_to_primary():
+    """True inside a read that would use the replica if its user hadn't just written."""
+    return has_replica() and not _replica_reads.get()
+
+
+def replica_may_lag():
+    """
+    True when the current reads come from a replica that may not have the
+    latest writes yet. Results cached for everyone shouldn't be stored then,
+    or a stale page would outlive the replication lag.
+    """
+    return reading_from_replica() and cache.get(RECENT_WRITE_KEY) is not None
+
+
+def token_user_id(request):
+    """
+    User id of the request's bearer token, checked without a query, for
+    views that don't go through DRF authentication. None when anonymous or
+    invalid.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        return authentication.get_validated_token(raw_token).get(jwt_settings.USER_ID_CLAIM)
+    except InvalidToken:
+        return None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reading_from_replica():
+            return REPLICA
+        # None lets related objects load from the database their instance came from
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema by replication
+        return db != REPLICA
+
+
+class ReplicaReadsMixin:
+    """
+    For APIViews: GET and HEAD read from the replica, and a successful write
+    pins its user to the primary for a while.
+
+    Authentication runs before the switch, on the primary, so a user created
+    moments ago is still found.
+    """
+    replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned(request.user.id):
+            self.replica_token = _replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (request.method not in SAFE_METHODS and response.status_code < 400
+                and request.user.is_authenticated and has_replica()):
+            pin_to_primary(request.user.id)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # Threads serve one request after another, the next one starts on the primary
+            if self.replica_token is not None:
+                _replica_reads.reset(self.replica_token)
+                self.replica_token = None
@@ -0,0 +1,86 @@
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework.exceptions import AuthenticationFailed
+
+from users.authentication import CachedJWTAuthentication
+
+
+class QueryStats:
+    """execute_wrapper that counts queries and accumulates their wall time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class QueryStatsMiddleware:
+    """
+    Records the number of SQL queries and total DB time of every request.
+
+    The numbers are kept on ``request.query_stats`` and, in DEBUG or for
+    staff users, returned as X-DB-Query-Count and X-DB-Time-Ms headers.
+    Staff is read from the bearer token with the API's JWT authenticator on
+    both paths, so async views that never authenticate show them as well.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.authenticator = CachedJWTAuthentication()
+        # Under ASGI the middleware runs as a coroutine so async views don't get pushed to a thread
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        with self.wrap_connections(stats):
+            response = self.get_response(request)
+        return self.record(request, response, stats, self.token_user(request))
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        # Connections belong to the thread the request's sync code and ORM calls run in
+        wrappers = await sync_to_async(self.wrap_connections)(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(wrappers.close)()
+        return self.record(request, response, stats, await sync_to_async(self.token_user)(request))
+
+    def wrap_connections(self, stats):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        return stack
+
+    def token_user(self, request):
+        if settings.DEBUG:
+            return None
+        try:
+            result = self.authenticator.authenticate(request)
+        except AuthenticationFailed:
+            return None
+        return result[0] if result else None
+
+    def record(self, request, response, stats, user):
+        request.query_stats = stats
+        if settings.DEBUG or (user is not None and user.is_staff):
+            response['X-DB-Query-Count'] = str(stats.count)
+            response['X-DB-Time-Ms'] = f'{stats.duration * 1000:.2f}'
+        return response
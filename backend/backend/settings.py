@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import copy
 from pathlib import Path
 from datetime import timedelta
 # from decouple import config
@@ -32,15 +33,16 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-c)ux*y&eh9x%6qas2(-ivrd@qjdl)o6k^smj%9jy44gm4ne6%2'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# gunicorn.conf.py turns it off for the production server
+DEBUG = os.getenv('DEBUG', 'True') == 'True'
 
 ALLOWED_HOSTS = ["*"]
 
 # Custom User Model
 AUTH_USER_MODEL = 'users.CustomUser'
 # for case insensitive authentication
+# One backend, so a login hashes the password once whether it succeeds or not
 AUTHENTICATION_BACKENDS = (
-    'django.contrib.auth.backends.ModelBackend',
     'users.backends.CaseInsensitiveModelBackend',
 )
 
@@ -88,19 +90,51 @@ CELERY_BEAT_SCHEDULE = {
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
 }
 
+# Redis backs the cache when CACHE_URL is set (see docker-compose), local memory otherwise
+if os.getenv('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a rendered feed page stays cached, blog writes invalidate it earlier
+FEED_CACHE_TIMEOUT = int(os.getenv('FEED_CACHE_TIMEOUT', 60))
+
+# JSON encoder of the API renderer: 'orjson' (used when installed) or 'json'
+JSON_RENDERER_ENCODER = os.getenv('JSON_RENDERER_ENCODER', 'orjson')
+
+# How feed pagination totals are computed: 'exact' (COUNT(*) per request),
+# 'cached' (COUNT once, invalidated on blog writes) or 'estimate' (planner
+# estimate on PostgreSQL once the result is above the threshold)
+BLOG_COUNT_STRATEGY = os.getenv('BLOG_COUNT_STRATEGY', 'cached')
+BLOG_COUNT_CACHE_TIMEOUT = int(os.getenv('BLOG_COUNT_CACHE_TIMEOUT', 300))
+BLOG_COUNT_ESTIMATE_THRESHOLD = int(os.getenv('BLOG_COUNT_ESTIMATE_THRESHOLD', 10000))
+
+# Seconds an authenticated user stays cached, changes to the user row drop it earlier
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 60))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
 MIDDLEWARE = [
+    'backend.middleware.QueryStatsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -111,7 +145,9 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'backend.urls'
+# The ASGI entrypoint turns this on to serve the blog reads from async views
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
+ROOT_URLCONF = 'backend.asgi_urls' if ASYNC_READ_VIEWS else 'backend.urls'
 
 TEMPLATES = [
     {
@@ -136,10 +172,6 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
 DATABASES = {
-    # 'default': {
-    #     'ENGINE': 'django.db.backends.sqlite3',
-    #     'NAME': BASE_DIR / 'db.sqlite3',
-    # }
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': os.getenv('POSTGRES_DB'),
@@ -147,9 +179,54 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': 'db',
         'PORT': '5432',
+        # Seconds a connection is reused across requests, 0 closes it after each one
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 0)),
     }
 }
 
+# SQLite profile for local development without the db container
+if os.getenv('DB_ENGINE') == 'sqlite':
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+
+# A reused connection is checked before the first query of a request or task
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# DB_POOL_MAX_SIZE switches PostgreSQL to a connection pool per process
+# (web worker or Celery worker) holding at most that many connections.
+# Size it to the threads of the process, see GET /metrics/db-pool/.
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 0))
+if DB_POOL_MAX_SIZE and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    # The pool does the reusing, Django refuses persistent connections on top of it
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+            'max_size': DB_POOL_MAX_SIZE,
+            # Seconds a request waits for a free connection before failing
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+            # Connections above min_size are closed after idling this long
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', 300)),
+        },
+    }
+
+# POSTGRES_REPLICA_HOST adds a streaming replica of the default database as
+# the 'replica' alias. backend.db_router sends the blog GET views and the
+# read-only Celery work there, and everything else to the primary.
+if os.getenv('POSTGRES_REPLICA_HOST') and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['replica'] = {
+        **copy.deepcopy(DATABASES['default']),
+        'HOST': os.getenv('POSTGRES_REPLICA_HOST'),
+        'PORT': os.getenv('POSTGRES_REPLICA_PORT', '5432'),
+        # Tests read the primary's test database through this alias
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['backend.db_router.ReplicaRouter']
+# Seconds a user's reads stay on the primary after they write through the API
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -0,0 +1,92 @@
+from importlib import import_module
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test.utils import CaptureQueriesContext
+
+from .db_router import REPLICA
+
+
+class QueryBudgetMixin:
+    """
+    Per-endpoint SQL query budgets for API test cases.
+
+    ``query_budgets`` maps ``(route, method)`` to the maximum number of
+    queries that request may run, where ``route`` is the pattern string from
+    ``budget_urlconf``. Every route of the urlconf needs at least one budget,
+    so new endpoints can't skip the guard.
+    """
+    budget_urlconf = None
+    query_budgets = {}
+
+    def assertRoutesBudgeted(self):
+        routes = {str(pattern.pattern) for pattern in import_module(self.budget_urlconf).urlpatterns}
+        budgeted = {route for route, method in self.query_budgets}
+        self.assertEqual(routes - budgeted, set(), 'Routes without a query budget')
+
+    def assertQueryBudget(self, route, method, url, **kwargs):
+        budget = self.query_budgets[(route, method)]
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, **kwargs)
+            if response.streaming:
+                # Streamed bodies run their queries while being read
+                response.streaming_content = [b''.join(response.streaming_content)]
+        executed = '\n'.join(f"{i}. {q['sql']}" for i, q in enumerate(queries.captured_queries, start=1))
+        self.assertLessEqual(
+            len(queries), budget,
+            f'{method.upper()} {url} ran {len(queries)} queries, budget is {budget}:\n{executed}'
+        )
+        return response
+
+
+class ReplicaDatabaseMixin:
+    """
+    Adds an in-memory SQLite database as the ``replica`` alias for a
+    TransactionTestCase. It is a separate database, so it trails the primary
+    until ``replicate()`` copies ``replicated_models`` over, the way a
+    lagging replica would.
+    """
+    replicated_models = ()
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Registered after the test runner set up its databases, it must not
+        # create this one
+        connections.settings[REPLICA] = connections.configure_settings({
+            DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+            REPLICA: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'},
+        })[REPLICA]
+        cls.databases = {*cls.databases, REPLICA}
+        # The router keeps migrations off the replica, the schema is created directly
+        with connections[REPLICA].schema_editor() as editor:
+            for model in cls.replicated_models:
+                editor.create_model(model)
+
+    @classmethod
+    def tearDownClass(cls):
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        cls.databases = cls.databases - {REPLICA}
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.replicate()
+
+    def replicate(self):
+        """Bring the replica up to date with the primary, row for row."""
+        # Plain SQL, deletes would fire signals that write to the primary and
+        # bulk_create() would restamp auto_now fields
+        replica = connections[REPLICA]
+        with replica.cursor() as cursor:
+            for model in reversed(self.replicated_models):
+                cursor.execute(f'DELETE FROM {replica.ops.quote_name(model._meta.db_table)}')
+            for model in self.replicated_models:
+                fields = model._meta.concrete_fields
+                rows = model.objects.using(DEFAULT_DB_ALIAS).order_by('pk').values_list(*(f.attname for f in fields))
+                cursor.executemany(
+                    f"INSERT INTO {replica.ops.quote_name(model._meta.db_table)} "
+                    f"({', '.join(replica.ops.quote_name(f.column) for f in fields)}) "
+                    f"VALUES ({', '.join(['%s'] * len(fields))})",
+                    [[f.get_db_prep_save(value, replica) for f, value in zip(fields, row)] for row in rows],
+                )
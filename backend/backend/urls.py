@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from blogs.views import ContactFormView
+from .views import DatabasePoolView, FeedCacheView
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -11,6 +12,8 @@ urlpatterns = [
     path("users/", include("users.urls")),
     path("blogs/", include("blogs.urls")),
     path("contact/", ContactFormView.as_view(), name="contact-form"),
+    path("metrics/db-pool/", DatabasePoolView.as_view(), name="db-pool-metrics"),
+    path("metrics/feed-cache/", FeedCacheView.as_view(), name="feed-cache-metrics"),
 
 ]
 
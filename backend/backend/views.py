@@ -0,0 +1,26 @@
+import os
+
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from blogs.feed_cache import feed_cache_stats
+
+from .db_pool import pool_stats
+
+
+class DatabasePoolView(APIView):
+    """Connection pool metrics of the worker process that answers the request."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, format=None):
+        return Response({'pid': os.getpid(), 'databases': pool_stats()}, status=status.HTTP_200_OK)
+
+
+class FeedCacheView(APIView):
+    """Feed cache hits and misses of the worker process that answers the request."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, format=None):
+        return Response({'pid': os.getpid(), 'feed_cache': feed_cache_stats()}, status=status.HTTP_200_OK)
@@ -0,0 +1,68 @@
+import logging
+import time
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import get_resolver
+
+from .db_pool import close_pools
+
+logger = logging.getLogger(__name__)
+
+# Requests run once before taking traffic, so their code paths, lazy imports
+# and translation catalogs are loaded in the process that forks the workers
+WARMUP_PATHS = ('/blogs/', '/blogs/?pagination=cursor')
+
+
+@contextmanager
+def timed(timings, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+def warm_up_app():
+    """
+    Load everything a first request would otherwise pay for, returning the
+    milliseconds each step took.
+
+    Meant for the server's master process before it forks: the workers
+    inherit the loaded state, and the database connections and pools the
+    warm-up requests opened are closed so no socket is shared across
+    processes.
+    """
+    timings = {}
+    with timed(timings, 'urls'):
+        get_resolver().reverse_dict  # Imports every view and builds the lookup tables
+    with timed(timings, 'models'):
+        for model in apps.get_models():
+            model._meta.get_fields()
+    with timed(timings, 'requests'):
+        factory = RequestFactory()
+        for path in WARMUP_PATHS:
+            request = factory.get(path)
+            match = get_resolver().resolve(request.path_info)
+            try:
+                match.func(request, *match.args, **match.kwargs).render()
+            except Exception:
+                # A cold or unreachable database only makes the warm-up less useful
+                logger.warning('Warm-up request to %s failed', path, exc_info=True)
+    connections.close_all()
+    close_pools()
+    return timings
+
+
+def warm_up_connections():
+    """Open and check this process's database connections, for freshly forked workers."""
+    timings = {}
+    for connection in connections.all():
+        with timed(timings, f'db:{connection.alias}'):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            # Kept open when persistent, handed back when pooled
+            connection.close_if_unusable_or_obsolete()
+    return timings
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using, **kwargs):
+    from .search import ensure_sqlite_search_index
+
+    ensure_sqlite_search_index(using)
 
 
 class BlogsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blogs'
+
+    def ready(self):
+        import blogs.signals  # Connect count invalidation when app is ready
+        post_migrate.connect(ensure_search_index, sender=self)
@@ -0,0 +1,18 @@
+from django.urls import path
+from .async_views import get_all_blogs, get_comments, get_one_blog, get_replies, read_view
+from .urls import urlpatterns as sync_urlpatterns
+
+# Route name -> async GET handler, the other methods keep their DRF view
+ASYNC_READS = {
+    'blogs': get_all_blogs,
+    'single-blog': get_one_blog,
+    'comment': get_comments,
+    'reply': get_replies,
+}
+
+# The routes of blogs.urls in the same order, so matching doesn't change
+urlpatterns = [
+    path(str(pattern.pattern), read_view(ASYNC_READS[pattern.name], pattern.callback), name=pattern.name)
+    if pattern.name in ASYNC_READS else pattern
+    for pattern in sync_urlpatterns
+]
@@ -0,0 +1,154 @@
+"""
+Async versions of the public read endpoints, served by the ASGI app.
+
+They build the same querysets as the views in blogs.views but fetch them
+with the async ORM, and render with the same renderer, so responses are
+byte for byte the ones of the synchronous views. Writes and everything
+that needs authentication stay on the DRF views.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from backend.db_router import has_replica, is_pinned, pinned_to_primary, replica_reads, token_user_id
+
+from .comment_tree import TREE_FIELDS, aload_comment_tree, aload_reply_previews
+from .conditional import POST_VALIDATORS, has_validators, loaded_post_version, not_modified, post_version, set_validators
+from .counts import get_blog_count, published_count_key
+from .feed_cache import cache_feed, feed_cache_key, get_cached_feed
+from .models import BlogPost, Comment
+from .pagination import CommentCursorPagination, ReplyCursorPagination, cursor_requested, get_blog_paginator
+from .renderers import BlogPostJSONRenderer
+from .serializers import BlogPostSerializer, narrow_queryset, requested_fields
+from .values_serializers import BlogPostListValuesSerializer, CommentValuesSerializer
+from .views import CommentView
+
+
+def rendered(response):
+    """The HttpResponse an APIView using BlogPostJSONRenderer makes of a DRF ``response``."""
+    if not isinstance(response, Response):
+        return response  # 304s from the conditional helpers
+    renderer = BlogPostJSONRenderer()
+    headers = {name: value for name, value in response.items() if name != 'Content-Type'}
+    # A plain HttpResponse, a deferred render would cost a hop to a thread
+    http_response = HttpResponse(
+        renderer.render(response.data, renderer.media_type),
+        status=response.status_code, content_type=renderer.media_type, headers=headers,
+    )
+    patch_vary_headers(http_response, ['Accept'])
+    return http_response
+
+
+def read_view(get, view):
+    """
+    A view answering GET and HEAD with the coroutine ``get`` and every other
+    method with the synchronous DRF ``view`` registered on the same route.
+    """
+    fallback = sync_to_async(view)
+
+    async def dispatch(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return await fallback(request, *args, **kwargs)
+        # Same routing as ReplicaReadsMixin, the user comes from the token alone
+        user_id = token_user_id(request) if has_replica() else None
+        if user_id is not None and await sync_to_async(is_pinned)(user_id):
+            return rendered(await get(Request(request), *args, **kwargs))
+        with replica_reads():
+            return rendered(await get(Request(request), *args, **kwargs))
+
+    # Like APIView, CSRF is left to DRF's session authentication
+    return csrf_exempt(dispatch)
+
+
+async def get_all_blogs(request):
+    key = await sync_to_async(feed_cache_key)(request)
+    cached = None if pinned_to_primary() else await sync_to_async(get_cached_feed)(key)
+    if cached is not None:
+        return Response(cached, status=status.HTTP_200_OK, headers={'X-Cache': 'HIT'})
+
+    blogs = BlogPost.objects.filter(status='published').order_by('-published_date')
+    paginator = get_blog_paginator(request)
+    total = lambda: get_blog_count(blogs, published_count_key())
+    page = BlogPostListValuesSerializer.values(blogs, requested_fields(request), required=('published_date',))
+    response = await paginator.agenerate_response(page, BlogPostListValuesSerializer, request, total=total)
+    if response.status_code == status.HTTP_200_OK:
+        response.data = await sync_to_async(cache_feed)(key, response.data)
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+async def get_one_blog(request, slug):
+    if has_validators(request):
+        row = await BlogPost.objects.filter(slug=slug).values_list(*POST_VALIDATORS).afirst()
+        if row is not None:
+            response = not_modified(request, *post_version(*row))
+            if response is not None:
+                return response
+
+    blogs = narrow_queryset(
+        BlogPost.objects.select_related('author'), BlogPostSerializer, requested_fields(request),
+        required=('author', *POST_VALIDATORS)
+    )
+    try:
+        blog = await blogs.aget(slug=slug)
+    except BlogPost.DoesNotExist:
+        return Response(data={'message': 'Blog does not exist'}, status=status.HTTP_404_NOT_FOUND)
+    serializer = BlogPostSerializer(blog, context={'request': request})
+    response = Response(serializer.data, status=status.HTTP_200_OK)
+    return set_validators(response, request, *loaded_post_version(blog))
+
+
+async def get_comments(request, blog_id):
+    try:
+        blog = await BlogPost.objects.only('id', 'comments_updated_at').aget(pk=blog_id)
+    except BlogPost.DoesNotExist:
+        return Response(data={'message': 'Blog does not exist'}, status=status.HTTP_404_NOT_FOUND)
+    response = not_modified(request, blog.comments_updated_at)
+    if response is not None:
+        return response
+
+    fields = requested_fields(request)
+    if not cursor_requested(request):
+        tree = await aload_comment_tree(blog, fields, as_values=True)
+        serializer = CommentValuesSerializer(tree.top_level, many=True, context={'request': request, 'comment_tree': tree})
+        return set_validators(Response(serializer.data, status=status.HTTP_200_OK), request, blog.comments_updated_at)
+
+    paginator = CommentCursorPagination()
+    comments = CommentValuesSerializer.values(
+        Comment.objects.filter(post=blog, reply__isnull=True), fields,
+        required=(*TREE_FIELDS, 'created_at', 'reply_count')
+    )
+    try:
+        page = await paginator.apaginate_queryset(comments, request)
+    except NotFound:
+        return Response({'message': paginator.invalid_cursor_message}, status=status.HTTP_400_BAD_REQUEST)
+    tree = await aload_reply_previews(page, CommentView.reply_preview_limit, fields, as_values=True)
+    serializer = CommentValuesSerializer(tree.top_level, many=True, context={'request': request, 'comment_tree': tree})
+    return set_validators(paginator.get_paginated_response(serializer.data), request, blog.comments_updated_at)
+
+
+async def get_replies(request, comment_id):
+    try:
+        parent_comment = await Comment.objects.only('post_id', 'path', 'depth').aget(pk=comment_id)
+    except Comment.DoesNotExist:
+        return Response(data={'message': 'Comment does not exist'}, status=status.HTTP_404_NOT_FOUND)
+    max_depth = request.GET.get('depth')
+    max_depth = int(max_depth) if max_depth and max_depth.isdigit() else None
+    replies = CommentValuesSerializer.values(
+        parent_comment.get_subtree(max_depth), requested_fields(request), required=('reply', 'path')
+    )
+    if not cursor_requested(request):
+        serializer = CommentValuesSerializer([reply async for reply in replies], many=True, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+    paginator = ReplyCursorPagination()
+    try:
+        page = await paginator.apaginate_queryset(replies, request)
+    except NotFound:
+        return Response({'message': paginator.invalid_cursor_message}, status=status.HTTP_400_BAD_REQUEST)
+    serializer = CommentValuesSerializer(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,154 @@
+from collections import defaultdict
+from django.db import connections
+from django.db.models import CharField, F, OuterRef, Q, Subquery, Value, Window
+from django.db.models.functions import Cast, Concat, LPad, RowNumber, Substr
+from .models import PATH_MAX_ID, PATH_STEP, Comment, subtree_filter
+from .serializers import CommentSerializer, ReplySerializer, narrow_queryset
+from .values_serializers import CommentValuesSerializer, ReplyValuesSerializer
+
+# Fields the tree needs on every comment, whatever the client asked for,
+# post included since thread ranges are looked up per post
+TREE_FIELDS = ('post', 'reply', 'path', 'depth')
+
+
+class CommentTree:
+    """
+    Comments of a post grouped into threads, built from a single query.
+    The comments are model instances or values rows, the tree only reads
+    their ``path`` and ``depth``.
+
+    With ``reply_limit`` each thread only exposes its first replies, the
+    rows past the limit just signal that there are more to load.
+    """
+
+    def __init__(self, comments, reply_limit=None):
+        self.top_level = []
+        self.descendants = defaultdict(list)
+        self.reply_limit = reply_limit
+        for comment in comments:
+            if comment.depth == 0:
+                self.top_level.append(comment)
+            else:
+                self.descendants[comment.path[:PATH_STEP]].append(comment)
+
+    def replies_for(self, comment):
+        # Replies below a top-level comment, depth first, newest siblings first
+        return self.descendants.get(comment.path, [])[:self.reply_limit]
+
+    def has_more_replies(self, comment):
+        return self.reply_limit is not None and len(self.descendants.get(comment.path, [])) > self.reply_limit
+
+
+def load_comment_tree(post, fields=None, as_values=False):
+    return CommentTree(comment_tree_queryset(post, fields, as_values))
+
+
+async def aload_comment_tree(post, fields=None, as_values=False):
+    """load_comment_tree() for async views."""
+    return CommentTree([comment async for comment in comment_tree_queryset(post, fields, as_values)])
+
+
+def comment_tree_queryset(post, fields=None, as_values=False):
+    # Authors are joined in so serializing the tree never goes back to the DB
+    comments = Comment.objects.filter(post=post).order_by('path')
+    if as_values:
+        return CommentValuesSerializer.values(comments, fields, required=TREE_FIELDS)
+    return narrow_queryset(comments, CommentSerializer, fields, required=TREE_FIELDS)
+
+
+def narrow_replies(queryset, fields, required, as_values):
+    """Replies as instances narrowed for ReplySerializer, or as rows for ReplyValuesSerializer."""
+    if as_values:
+        return ReplyValuesSerializer.values(queryset, fields, required=required)
+    return narrow_queryset(queryset, ReplySerializer, fields, required=required)
+
+
+def load_reply_previews(comments, limit, fields=None, as_values=False):
+    """
+    A CommentTree for a page of top-level comments holding the first
+    ``limit`` replies of each thread, from one query.
+
+    Where the database allows it that query is a UNION ALL of per-thread
+    range scans stopping after ``limit`` + 1 rows, so a viral thread costs no
+    more than a quiet one. Otherwise the thread ranges are numbered with a
+    window function and cut at the same point.
+    """
+    replies = reply_preview_queryset(comments, limit, fields, as_values)
+    return preview_tree(comments, [] if replies is None else list(replies), limit)
+
+
+async def aload_reply_previews(comments, limit, fields=None, as_values=False):
+    """load_reply_previews() for async views, running the same query through the async ORM."""
+    replies = reply_preview_queryset(comments, limit, fields, as_values)
+    return preview_tree(comments, [] if replies is None else [reply async for reply in replies], limit)
+
+
+def reply_preview_queryset(comments, limit, fields=None, as_values=False):
+    # None when no comment on the page has replies, so there is nothing to query
+    threads = [comment for comment in comments if comment.reply_count]
+    if not threads:
+        return None
+
+    def preview(queryset):
+        return narrow_replies(queryset, fields, TREE_FIELDS, as_values)
+
+    if connections[Comment.objects.db].features.supports_slicing_ordering_in_compound:
+        queries = [
+            preview(Comment.objects.filter(subtree_filter(comment.post_id, comment.path)).order_by('path'))[:limit + 1]
+            for comment in threads
+        ]
+        return queries[0].union(*queries[1:], all=True)
+    in_threads = Q()
+    for comment in threads:
+        in_threads |= subtree_filter(comment.post_id, comment.path)
+    return preview(Comment.objects.filter(in_threads)).annotate(
+        position=Window(RowNumber(), partition_by=Substr('path', 1, PATH_STEP), order_by='path')
+    ).filter(position__lte=limit + 1)
+
+
+def preview_tree(comments, replies, limit):
+    replies = sorted(replies, key=lambda reply: reply.path)
+    return CommentTree([*comments, *replies], reply_limit=limit)
+
+
+def load_replies_by_parent(parent_ids, limit, fields=None, as_values=False):
+    """
+    Direct replies of each comment in ``parent_ids``, in thread order and
+    grouped by parent id, from one query. At most ``limit`` + 1 per parent,
+    the extra one only tells that there are more.
+    """
+    replies = narrow_replies(
+        Comment.objects.filter(reply_id__in=parent_ids), fields, ('reply', 'path'), as_values
+    ).annotate(
+        position=Window(RowNumber(), partition_by=F('reply_id'), order_by='path')
+    ).filter(position__lte=limit + 1).order_by('path')
+    grouped = {parent_id: [] for parent_id in parent_ids}
+    for reply in replies:
+        grouped[reply.reply_id].append(reply)
+    return grouped
+
+
+def fill_comment_paths(Comment, pks=None):
+    """
+    Assign missing paths one thread level per UPDATE, for backfills and bulk loads.
+
+    ``pks`` limits the work to those comments, whose parents must have their
+    paths already or be among them, so a batch costs the same however big
+    the table has grown.
+
+    An empty path is what marks a comment as missing one: Comment.save()
+    writes it in the same transaction as the insert, so only bulk_create
+    leaves empty paths behind. Replies below a comment still missing its
+    path wait until a later pass has filled the parent.
+    """
+    segment = LPad(Cast(Value(PATH_MAX_ID) - F('id'), output_field=CharField()), PATH_STEP, Value('0'))
+    missing = Comment.objects.filter(path='')
+    if pks is not None:
+        missing = missing.filter(pk__in=pks)
+    missing.filter(reply__isnull=True).update(path=segment, depth=0)
+    parent = Comment.objects.filter(pk=OuterRef('reply_id'))
+    while missing.filter(reply__path__gt='').update(
+        path=Concat(Subquery(parent.values('path')), segment, output_field=CharField()),
+        depth=Subquery(parent.values('depth')) + 1,
+    ):
+        pass
@@ -0,0 +1,47 @@
+import hashlib
+import json
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def has_validators(request):
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+
+# What a post's validators are derived from: both timestamps, comment_count changes
+# with the thread, and the author fields the post shows
+POST_VALIDATORS = ('updated_at', 'comments_updated_at', 'author__username', 'author__email')
+
+
+def post_version(updated_at, comments_updated_at, *related):
+    """``(modified, related)`` of a post from its POST_VALIDATORS values."""
+    return max(updated_at, comments_updated_at), related
+
+
+def loaded_post_version(blog):
+    author = blog.author
+    related = (author.username, author.email) if author is not None else (None, None)
+    return post_version(blog.updated_at, blog.comments_updated_at, *related)
+
+
+def make_etag(request, modified, related=()):
+    # The full path keeps ?fields= variants of the same resource apart, and the
+    # related values catch changes to joined rows that leave the timestamp alone
+    raw = json.dumps([request.get_full_path(), modified.isoformat(timespec='microseconds'), *related])
+    return quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+
+def not_modified(request, modified, related=()):
+    """A 304 response when the client's validators still match, otherwise None."""
+    return get_conditional_response(
+        request,
+        etag=make_etag(request, modified, related),
+        last_modified=int(modified.timestamp()),
+    )
+
+
+def set_validators(response, request, modified, related=()):
+    response['ETag'] = make_etag(request, modified, related)
+    response['Last-Modified'] = http_date(modified.timestamp())
+    return response
@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from backend.db_router import replica_may_lag
+
+from .feed_cache import feed_version
+
+COUNT_CACHE_PREFIX = 'blogs:count:'
+
+
+def published_count_key():
+    return 'published'
+
+
+def author_count_key(author_id):
+    return f'author:{author_id}'
+
+
+def count_cache_key(key):
+    # Under the feed version, which every blog write bumps, like the feed pages
+    return f'{COUNT_CACHE_PREFIX}{feed_version()}:{key}'
+
+
+def exact_count(queryset, key):
+    return queryset.count()
+
+
+def cached_count(queryset, key):
+    """
+    Exact count kept in the cache until the next blog write. The key is taken
+    before counting, so a count a write overtook is stored where nothing reads it.
+    """
+    cache_key = count_cache_key(key)
+    total = cache.get(cache_key)
+    if total is None:
+        total = queryset.count()
+        if not replica_may_lag():
+            cache.set(cache_key, total, settings.BLOG_COUNT_CACHE_TIMEOUT)
+    return total
+
+
+def planner_estimate(queryset):
+    """Row estimate from the PostgreSQL planner, or None on other databases."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimated_count(queryset, key):
+    # Small results are cheap to count exactly, only big ones fall back to the estimate
+    estimate = planner_estimate(queryset)
+    if estimate is None or estimate < settings.BLOG_COUNT_ESTIMATE_THRESHOLD:
+        return cached_count(queryset, key)
+    return estimate
+
+
+COUNT_STRATEGIES = {
+    'exact': exact_count,
+    'cached': cached_count,
+    'estimate': estimated_count,
+}
+
+
+def get_blog_count(queryset, key):
+    return COUNT_STRATEGIES[settings.BLOG_COUNT_STRATEGY](queryset, key)
+
+
+def rebuild_comment_counters(BlogPost, Comment, post_ids=None, comment_ids=None):
+    """
+    Recompute comment_count and reply_count from scratch with two UPDATE
+    statements, for every row or only the given posts and comments.
+    """
+    def counted(**lookup):
+        rows = Comment.objects.filter(**lookup).order_by().values(next(iter(lookup)))
+        return Coalesce(Subquery(rows.annotate(total=Count('pk')).values('total')), 0)
+
+    posts, comments = BlogPost.objects.all(), Comment.objects.all()
+    if post_ids is not None:
+        posts = posts.filter(pk__in=post_ids)
+    if comment_ids is not None:
+        comments = comments.filter(pk__in=comment_ids)
+    posts.update(comment_count=counted(post=OuterRef('pk')))
+    comments.update(reply_count=counted(reply=OuterRef('pk')))
@@ -0,0 +1,97 @@
+import csv
+import datetime
+import json
+from .models import BlogPost, Comment
+from users.models import CustomUser
+
+EXPORT_CHUNK_SIZE = 500
+# Characters buffered before a chunk is handed to the response
+EXPORT_BUFFER_SIZE = 64 * 1024
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Output column -> ORM lookup. Rows are read with values_list() in primary
+# key order, so no model instances are built and authors come from a join.
+EXPORTS = {
+    'posts': (BlogPost, {
+        'id': 'id',
+        'slug': 'slug',
+        'title': 'title',
+        'subtitle': 'subtitle',
+        'status': 'status',
+        'published_date': 'published_date',
+        'updated_at': 'updated_at',
+        'author_id': 'author_id',
+        'author_username': 'author__username',
+        'word_count': 'word_count',
+        'comment_count': 'comment_count',
+        'content': 'content',
+    }),
+    'comments': (Comment, {
+        'id': 'id',
+        'post_id': 'post_id',
+        'reply_id': 'reply_id',
+        'depth': 'depth',
+        'user_id': 'user_id',
+        'user_username': 'user__username',
+        'created_at': 'created_at',
+        'reply_count': 'reply_count',
+        'comment': 'comment',
+    }),
+    'authors': (CustomUser, {
+        'id': 'id',
+        'username': 'username',
+        'date_joined': 'date_joined',
+        'is_active': 'is_active',
+    }),
+}
+
+
+class Echo:
+    """File-like object that hands back what csv.writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def _plain(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, map(_plain, row))), ensure_ascii=False) + '\n'
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_plain(value) for value in row])
+
+
+def export_lines(kind, fmt, chunk_size=EXPORT_CHUNK_SIZE, buffer_size=EXPORT_BUFFER_SIZE, using=None):
+    """
+    Yield ``kind`` ('posts', 'comments' or 'authors') as NDJSON or CSV text
+    in pieces of roughly ``buffer_size`` characters.
+
+    Rows come from iterator(chunk_size=...), which uses a server-side cursor
+    on PostgreSQL, so memory use doesn't grow with the table. ``using``
+    picks the database, the router decides when it's None.
+    """
+    model, columns = EXPORTS[kind]
+    rows = model.objects.using(using).order_by('id').values_list(*columns.values()).iterator(chunk_size=chunk_size)
+    lines = _csv_lines(list(columns), rows) if fmt == 'csv' else _ndjson_lines(list(columns), rows)
+    buffer, buffered = [], 0
+    for line in lines:
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= buffer_size:
+            yield ''.join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield ''.join(buffer)
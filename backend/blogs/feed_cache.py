@@ -0,0 +1,69 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+from backend.db_router import replica_may_lag
+
+from .renderers import BlogPostJSONRenderer, JSONFragment
+
+FEED_VERSION_KEY = 'blogs:feed:version'
+
+# Lookups of this process, kept in memory like the pool metrics so counting costs no cache round trip
+_lookups = {'hits': 0, 'misses': 0}
+_lookups_lock = threading.Lock()
+
+
+def feed_version():
+    version = cache.get(FEED_VERSION_KEY)
+    if version is None:
+        # add() is a no-op when another process already set the version
+        cache.add(FEED_VERSION_KEY, 1, None)
+        version = cache.get(FEED_VERSION_KEY, 1)
+    return version
+
+
+def bump_feed_version():
+    """Orphans every cached feed page, old entries simply expire."""
+    try:
+        cache.incr(FEED_VERSION_KEY)
+    except ValueError:
+        cache.set(FEED_VERSION_KEY, 1, None)
+
+
+def feed_cache_key(request):
+    """
+    The key of the requested page under the current feed version. Views take
+    it before reading the page, so a page a write overtook is stored under
+    the old version, where nothing reads it.
+    """
+    # The absolute URI covers the host in next/previous links and every query parameter
+    digest = hashlib.md5(request.build_absolute_uri().encode('utf-8')).hexdigest()
+    return f'blogs:feed:page:{feed_version()}:{digest}'
+
+
+def get_cached_feed(key):
+    """The cached page as a JSONFragment, rendered without encoding it again."""
+    encoded = cache.get(key)
+    with _lookups_lock:
+        _lookups['misses' if encoded is None else 'hits'] += 1
+    return None if encoded is None else JSONFragment(encoded)
+
+
+def cache_feed(key, data):
+    """Caches a page encoded, and returns it as a JSONFragment for the response to render as is."""
+    page = JSONFragment(BlogPostJSONRenderer().render(data))
+    # Right after a blog write the replica may not have it yet, such a page isn't kept
+    if not replica_may_lag():
+        cache.set(key, page.encoded, settings.FEED_CACHE_TIMEOUT)
+    return page
+
+
+def feed_cache_stats():
+    """Hits and misses of this process's feed page lookups."""
+    with _lookups_lock:
+        stats = dict(_lookups)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else None
+    return stats
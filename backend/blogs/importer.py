@@ -0,0 +1,284 @@
+import codecs
+import json
+import re
+from collections import defaultdict
+from contextlib import contextmanager
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+from users.models import CustomUser
+from .comment_tree import fill_comment_paths
+from .counts import rebuild_comment_counters
+from .models import BlogPost, Comment, build_excerpt
+
+IMPORT_BATCH_SIZE = 1000
+READ_SIZE = 1 << 20
+
+# Fixture label -> model, in the order their rows have to be inserted
+IMPORT_MODELS = {
+    'users.customuser': CustomUser,
+    'blogs.blogpost': BlogPost,
+    'blogs.comment': Comment,
+}
+# Maintained by save() and signals, which bulk_create skips, so they are recomputed per batch
+DERIVED_FIELDS = {'excerpt', 'word_count', 'comment_count', 'reply_count', 'path', 'depth'}
+
+SEPARATORS = re.compile(r'[\s,]*')
+WHITESPACE = re.compile(r'\s*')
+
+
+class FixtureError(Exception):
+    """Malformed fixture input or a record that can't be imported."""
+
+
+def iter_jsonl(stream, offset=0):
+    """(object, offset after it) for each line of a JSON Lines fixture, from byte ``offset``."""
+    stream.seek(offset)
+    for line in iter(stream.readline, b''):
+        offset += len(line)
+        if line.strip():
+            try:
+                yield json.loads(line), offset
+            except ValueError as error:
+                raise FixtureError(f'Invalid JSON line ending at byte {offset}: {error}')
+
+
+def iter_json_array(stream, offset=0, read_size=READ_SIZE):
+    """
+    (object, offset after it) for each element of a fixture's top-level JSON
+    array, decoded ``read_size`` bytes at a time instead of loading the file.
+
+    A non-zero ``offset`` must be one this generator yielded earlier.
+    """
+    stream.seek(offset)
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    text, pos, eof = '', 0, False
+    started = offset > 0
+
+    while True:
+        # Whitespace, commas and brackets are ASCII, one byte per character
+        skip = (SEPARATORS if started else WHITESPACE).match(text, pos).end()
+        offset += skip - pos
+        pos = skip
+        if pos == len(text) or text[pos] not in '[]':
+            try:
+                obj, end = decoder.raw_decode(text, pos) if pos < len(text) else (None, None)
+            except ValueError:
+                end = None
+            if end is not None and started:
+                if not isinstance(obj, dict):
+                    raise FixtureError(f'Fixture must be a JSON array of objects (byte {offset})')
+                offset += len(text[pos:end].encode('utf-8'))
+                pos = end
+                yield obj, offset
+                continue
+            if eof:
+                raise FixtureError(f'Fixture is not a complete JSON array (byte {offset})')
+            # Need more input: drop what was consumed and read the next piece
+            chunk = stream.read(read_size)
+            eof = not chunk
+            text = text[pos:] + utf8.decode(chunk, final=eof)
+            pos = 0
+        elif text[pos] == '[' and not started:
+            started = True
+            pos += 1
+            offset += 1
+        elif text[pos] == ']' and started:
+            return
+        else:
+            raise FixtureError(f'Fixture must be a JSON array of objects (byte {offset})')
+
+
+def iter_fixture(stream, fmt, offset=0):
+    if fmt == 'jsonl':
+        return iter_jsonl(stream, offset)
+    return iter_json_array(stream, offset)
+
+
+def foreign_keys(model):
+    return [field for field in model._meta.concrete_fields if field.many_to_one]
+
+
+def auto_timestamps(model):
+    return [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+
+
+@contextmanager
+def fixture_timestamps(model):
+    """Keep the fixture's auto_now/auto_now_add values, bulk_create would stamp the import time over them."""
+    fields = [(field, field.auto_now, field.auto_now_add) for field in auto_timestamps(model)]
+    for field, _, _ in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class FixtureImporter:
+    """
+    Inserts fixture objects batch by batch with bulk_create, one transaction
+    per batch.
+
+    Objects whose author, post or parent comment is neither in the database
+    nor in the batch wait in ``pending`` and are retried with later batches,
+    so forward references resolve once their target shows up. Objects whose
+    primary key is already in the database are skipped, so replaying a batch
+    is harmless, and ones clashing with another row on a unique field are
+    invalid.
+    """
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE, skip_invalid=False, pending=()):
+        self.batch_size = batch_size
+        self.skip_invalid = skip_invalid
+        self.pending = list(pending)
+        self.imported = 0
+        self.invalid = []
+
+    def import_batch(self, objects):
+        objects = self.pending + list(objects)
+        with transaction.atomic():
+            records = self.without_unique_conflicts(self.without_existing(self.build(objects)))
+            ready, self.pending = self.resolve(records)
+            for model in IMPORT_MODELS.values():
+                instances = [instance for _, instance in ready if isinstance(instance, model)]
+                if instances:
+                    with fixture_timestamps(model):
+                        model.objects.bulk_create(instances, batch_size=self.batch_size)
+            self.refresh_derived([instance for _, instance in ready])
+        self.imported += len(ready)
+
+    def reject(self, obj, error):
+        message = f"{obj.get('model')} {obj.get('pk')}: {error}"
+        if not self.skip_invalid:
+            raise FixtureError(message)
+        self.invalid.append(message)
+
+    def build(self, objects):
+        """Validate each object into an unsaved instance, paired with the object itself."""
+        records = []
+        for obj in objects:
+            try:
+                records.append((obj, self.instance_for(obj)))
+            except (FixtureError, FieldDoesNotExist, ValidationError, TypeError, ValueError) as error:
+                self.reject(obj, error)
+        return records
+
+    def without_existing(self, records):
+        """Drop the records whose primary key is already taken, imported by an earlier run."""
+        pks = defaultdict(set)
+        for _, instance in records:
+            pks[type(instance)].add(instance.pk)
+        existing = {
+            model: set(model.objects.filter(pk__in=ids).values_list('pk', flat=True)) for model, ids in pks.items()
+        }
+        return [(obj, instance) for obj, instance in records if instance.pk not in existing[type(instance)]]
+
+    def without_unique_conflicts(self, records):
+        """Reject the records whose unique values (email, username, slug) another row or record holds."""
+        by_model = defaultdict(list)
+        for record in records:
+            by_model[type(record[1])].append(record)
+        conflicts = {}
+        for model, model_records in by_model.items():
+            for field in model._meta.concrete_fields:
+                if not field.unique or field.primary_key:
+                    continue
+                values = {getattr(instance, field.attname) for _, instance in model_records}
+                owners = dict(model.objects.filter(**{f'{field.attname}__in': values}).values_list(field.attname, 'pk'))
+                for obj, instance in model_records:
+                    value = getattr(instance, field.attname)
+                    if value is None:
+                        continue
+                    owner = owners.setdefault(value, instance.pk)
+                    if owner != instance.pk and id(obj) not in conflicts:
+                        conflicts[id(obj)] = f'{field.name} {value!r} is already used by pk {owner}'
+        kept = []
+        for obj, instance in records:
+            if id(obj) in conflicts:
+                self.reject(obj, conflicts[id(obj)])
+            else:
+                kept.append((obj, instance))
+        return kept
+
+    def instance_for(self, obj):
+        model = IMPORT_MODELS.get(str(obj.get('model', '')).lower())
+        if model is None:
+            raise FixtureError('unsupported model')
+        if obj.get('pk') is None:
+            raise FixtureError('a pk is required')
+        values = {}
+        for name, value in obj.get('fields', {}).items():
+            if name not in DERIVED_FIELDS:
+                values[model._meta.get_field(name).attname] = value
+        instance = model(pk=obj['pk'], **values)
+        for field in auto_timestamps(model):
+            # What auto_now/auto_now_add would have set when the fixture has no value
+            if getattr(instance, field.attname) is None:
+                setattr(instance, field.attname, timezone.now())
+        # Converts the JSON values (dates, numbers) to Python and checks lengths and choices
+        instance.clean_fields(exclude=[field.name for field in foreign_keys(model)])
+        if isinstance(instance, BlogPost):
+            instance.excerpt, instance.word_count = build_excerpt(instance.content)
+        return instance
+
+    def resolve(self, records):
+        """Split records into those whose references all exist and those that must wait."""
+        targets = {}
+        for _, instance in records:
+            for field in foreign_keys(type(instance)):
+                value = getattr(instance, field.attname)
+                if value is not None:
+                    targets.setdefault(field.related_model, set()).add(value)
+        known = {
+            model: set(model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+            for model, ids in targets.items()
+        }
+        batch = {}
+        for _, instance in records:
+            batch.setdefault(type(instance), set()).add(instance.pk)
+
+        def has_targets(instance):
+            for field in foreign_keys(type(instance)):
+                value = getattr(instance, field.attname)
+                if value is not None and value not in known.get(field.related_model, ()) \
+                        and value not in batch.get(field.related_model, ()):
+                    return False
+            return True
+
+        # Dropping a record can strand the ones pointing at it, so repeat until nothing changes
+        ready, waiting = list(records), []
+        while True:
+            still_ready = []
+            for obj, instance in ready:
+                if has_targets(instance):
+                    still_ready.append((obj, instance))
+                else:
+                    waiting.append(obj)
+                    batch[type(instance)].discard(instance.pk)
+            if len(still_ready) == len(ready):
+                return ready, waiting
+            ready = still_ready
+
+    def refresh_derived(self, instances):
+        posts = [instance for instance in instances if isinstance(instance, BlogPost)]
+        comments = [instance for instance in instances if isinstance(instance, Comment)]
+        if comments:
+            # Parents are in the database with their paths already, or in this batch
+            fill_comment_paths(Comment, pks=[comment.pk for comment in comments])
+        if posts or comments:
+            rebuild_comment_counters(
+                BlogPost, Comment,
+                post_ids={post.pk for post in posts} | {comment.post_id for comment in comments},
+                comment_ids={comment.pk for comment in comments} | {comment.reply_id for comment in comments},
+            )
+        # Rows came with explicit primary keys, move the sequences past them like loaddata does
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), list(IMPORT_MODELS.values())):
+                cursor.execute(sql)
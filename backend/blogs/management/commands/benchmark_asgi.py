@@ -0,0 +1,177 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from blogs.models import BlogPost, Comment
+from .benchmark_endpoints import current_commit, percentile
+
+# One worker process each, so the numbers show what a single worker can hold
+SERVERS = {
+    'wsgi': lambda port, threads: [
+        sys.executable, '-m', 'gunicorn', 'backend.wsgi:application', '--bind', f'127.0.0.1:{port}',
+        '--workers', '1', '--worker-class', 'gthread', '--threads', str(threads), '--log-level', 'warning',
+    ],
+    'asgi': lambda port, threads: [
+        sys.executable, '-m', 'uvicorn', 'backend.asgi:application', '--host', '127.0.0.1', '--port', str(port),
+        '--workers', '1', '--log-level', 'warning', '--no-access-log',
+    ],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the blog read endpoints served by one gunicorn (WSGI) worker and one uvicorn (ASGI) '
+        'worker under many concurrent slow clients, against the current database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help='Requests sent to each server')
+        parser.add_argument('--concurrency', type=int, default=50, help='Clients connected at the same time')
+        parser.add_argument('--client-delay', type=float, default=100, help='Milliseconds each client takes to send its request')
+        parser.add_argument('--threads', type=int, default=4, help='Threads of the WSGI worker')
+        parser.add_argument('--servers', default='wsgi,asgi', help='Comma separated servers to run')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite' and str(connection.settings_dict['NAME']).startswith(':memory:'):
+            raise CommandError('The servers run in their own processes and need a database on disk')
+        paths = self.sample_paths()
+        results = {
+            'meta': {
+                'commit': current_commit(),
+                'database': connection.vendor,
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'client_delay_ms': options['client_delay'],
+                'wsgi_threads': options['threads'],
+            },
+            'servers': {},
+        }
+        for server in options['servers'].split(','):
+            if server not in SERVERS:
+                raise CommandError(f'Unknown server {server!r}, choose from {", ".join(SERVERS)}')
+            results['servers'][server] = self.benchmark(server, paths, options)
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def sample_paths(self):
+        """A mix of the four read endpoints over the busiest posts and threads."""
+        posts = list(BlogPost.objects.filter(status='published').order_by('-comment_count').values_list('id', 'slug')[:20])
+        threads = list(Comment.objects.filter(reply__isnull=True).order_by('-reply_count').values_list('id', flat=True)[:20])
+        if not posts:
+            raise CommandError('No published posts found, run seed_blog_data first')
+        paths = [f'/blogs/?page={page}' for page in range(1, 4)]
+        paths += [f'/blogs/{slug}/' for _, slug in posts]
+        paths += [f'/blogs/comment/{post_id}/' for post_id, _ in posts]
+        paths += [f'/blogs/reply/{comment_id}/' for comment_id in threads]
+        return paths
+
+    def benchmark(self, server, paths, options):
+        port = free_port()
+        # Both servers run like production, without DEBUG's query log
+        env = dict(os.environ, ASYNC_READ_VIEWS=str(server == 'asgi'), DEBUG=os.getenv('DEBUG', 'False'))
+        process = subprocess.Popen(
+            SERVERS[server](port, options['threads']), cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=sys.stderr,
+        )
+        try:
+            self.wait_until_ready(port, process)
+            return asyncio.run(self.load(port, paths, options))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    def wait_until_ready(self, port, process, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'Server exited with code {process.returncode}')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'Server did not start listening on port {port}')
+
+    async def load(self, port, paths, options):
+        delay = options['client_delay'] / 1000
+        total = options['requests']
+        timings, failures, sent = [], 0, 0
+
+        async def fetch(path):
+            request = f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nAccept: application/json\r\nConnection: close\r\n\r\n'.encode()
+            start = time.perf_counter()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                # A slow client: the request arrives in two halves, delay apart
+                writer.write(request[:len(request) // 2])
+                await writer.drain()
+                await asyncio.sleep(delay)
+                writer.write(request[len(request) // 2:])
+                await writer.drain()
+                response = await reader.read()
+            finally:
+                writer.close()
+            status = int(response.split(b' ', 2)[1]) if response else 0
+            return (time.perf_counter() - start) * 1000, status
+
+        async def client():
+            nonlocal failures, sent
+            while sent < total:
+                path = paths[sent % len(paths)]
+                sent += 1
+                try:
+                    elapsed, status = await fetch(path)
+                except OSError:
+                    failures += 1
+                    continue
+                if status in (200, 304):
+                    timings.append(elapsed)
+                else:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options['concurrency'])))
+        elapsed = time.perf_counter() - started
+        samples = sorted(timings)
+        return {
+            'requests': len(samples),
+            'failures': failures,
+            'duration_s': round(elapsed, 3),
+            'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+            'p50_ms': round(percentile(samples, 50), 3),
+            'p95_ms': round(percentile(samples, 95), 3),
+            'p99_ms': round(percentile(samples, 99), 3),
+            'max_ms': round(samples[-1], 3) if samples else 0.0,
+        }
+
+    def report(self, results):
+        meta = results['meta']
+        self.stdout.write(
+            f"{meta['requests']} requests, {meta['concurrency']} concurrent clients taking "
+            f"{meta['client_delay_ms']} ms to send each request"
+        )
+        self.stdout.write(f"{'server':8} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'failed':>7}")
+        for server, stats in results['servers'].items():
+            self.stdout.write(
+                f"{server:8} {stats['throughput_rps']:>9.2f} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+                f"{stats['p99_ms']:>9.2f} {stats['failures']:>7}"
+            )
@@ -0,0 +1,258 @@
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+
+from blogs.models import BlogPost, Comment
+from users.models import CustomUser
+
+# Background work is stubbed out so the numbers cover the request path only
+PATCHED_SIDE_EFFECTS = (
+    'blogs.views.send_new_blog_notification_to_users.delay',
+    'blogs.views.send_comment_notification_email.delay',
+    'users.views.send_otp_via_email',
+)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not samples:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(samples)) - 1)
+    return samples[index]
+
+
+def summarize(timings, queries):
+    samples = sorted(timings)
+    return {
+        'requests': len(samples),
+        'mean_ms': round(sum(samples) / len(samples), 3),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'p99_ms': round(percentile(samples, 99), 3),
+        'max_ms': round(samples[-1], 3),
+        'queries_mean': round(sum(queries) / len(queries), 2),
+        'queries_max': max(queries),
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every blogs/users endpoint with a realistic traffic mix against the current database'
+
+    # Relative weight of each visitor journey in the traffic mix
+    SCENARIOS = {
+        'browse': 60,
+        'search': 8,
+        'login': 8,
+        'tokens': 4,
+        'author': 14,
+        'register': 2,
+        'account': 4,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500, help='Number of visitor journeys to run')
+        parser.add_argument('--warmup', type=int, default=20, help='Journeys run before measuring')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--password', default='seedpassword', help='Password of the seeded users')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='Previous results JSON to print p50/p95 deltas against')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.password = options['password']
+        self.client = Client()
+        self.timings = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.sequence = 0
+        self.created_users = []
+        self.created_posts = []
+
+        self.post_ids = list(BlogPost.objects.filter(status='published').values_list('id', flat=True)[:5000])
+        self.users = list(CustomUser.objects.filter(is_email_verified=True, is_active=True).values_list('email', flat=True)[:500])
+        if not self.post_ids or not self.users:
+            raise CommandError('No published posts or verified users found, run seed_blog_data first')
+
+        with ExitStack() as stack:
+            for target in PATCHED_SIDE_EFFECTS:
+                stack.enter_context(patch(target))
+            # Writes commit like in production, what they leave behind is deleted afterwards
+            try:
+                self.run_journeys(options['warmup'])
+                self.timings.clear()
+                self.queries.clear()
+                started = time.perf_counter()
+                self.run_journeys(options['iterations'])
+                elapsed = time.perf_counter() - started
+            finally:
+                self.clean_up()
+
+        results = self.build_results(options, elapsed)
+        self.report(results)
+        if options['compare']:
+            with open(options['compare']) as previous:
+                self.compare(json.load(previous), results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def clean_up(self):
+        # Deleting the posts takes their comments along
+        BlogPost.objects.filter(pk__in=self.created_posts).delete()
+        CustomUser.objects.filter(email__in=self.created_users).delete()
+
+    def run_journeys(self, count):
+        names = list(self.SCENARIOS)
+        weights = list(self.SCENARIOS.values())
+        for _ in range(count):
+            getattr(self, f'journey_{self.rng.choices(names, weights)[0]}')()
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        call = getattr(self.client, method)
+        start = time.perf_counter()
+        if method == 'get':
+            response = call(path, data, **headers)
+        else:
+            response = call(path, json.dumps(data or {}), content_type='application/json', **headers)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        endpoint = f'{method.upper()} /{response.resolver_match.route}' if response.resolver_match else f'{method.upper()} {path}'
+        self.timings[endpoint].append(elapsed)
+        self.queries[endpoint].append(response.wsgi_request.query_stats.count)
+        return response
+
+    def login(self):
+        email = self.rng.choice(self.users)
+        response = self.request('post', '/users/login/', {'email': email, 'password': self.password})
+        if response.status_code != 200:
+            raise CommandError(f'Login failed for {email}, pass the seeded password with --password')
+        return response.json()['token']
+
+    def unique(self, label):
+        self.sequence += 1
+        return f'{label} {self.sequence} {timezone.now().timestamp()}'
+
+    def journey_browse(self):
+        feed = self.request('get', '/blogs/', {'page': self.rng.randint(1, 5)})
+        results = feed.json().get('results') if feed.status_code == 200 else None
+        if results:
+            post = self.rng.choice(results)
+            post_id = post['id']
+            self.request('get', f"/blogs/{post['slug']}/")
+        else:
+            post_id = self.rng.choice(self.post_ids)
+        comments = self.request('get', f'/blogs/comment/{post_id}/', {'pagination': 'cursor'}).json()['results']
+        for comment in comments[:3]:
+            self.request('get', f'/blogs/reply/{comment["id"]}/', {'pagination': 'cursor'})
+        # Expanding the next level of every visible thread at once
+        reply_ids = [reply['id'] for comment in comments for reply in comment['replies'] if reply['reply_count']]
+        if reply_ids:
+            self.request('get', '/blogs/replies/', {'ids': ','.join(map(str, reply_ids[:100]))})
+
+    def journey_search(self):
+        term = self.rng.choice(['python', 'coffee', 'cache', 'river night', 'design music'])
+        self.request('get', '/blogs/search/', {'q': term})
+
+    def journey_login(self):
+        token = self.login()['access']
+        self.request('get', '/users/dashboard/', token=token)
+        self.request('get', '/users/is-auth/', token=token)
+
+    def journey_tokens(self):
+        email = self.rng.choice(self.users)
+        tokens = self.request('post', '/users/token/', {'email': email, 'password': self.password}).json()
+        self.request('post', '/users/token/refresh/', {'refresh': tokens['refresh']})
+        self.request('post', '/users/token/verify/', {'token': tokens['access']})
+
+    def journey_author(self):
+        token = self.login()['access']
+        self.request('get', '/blogs/user/', token=token)
+        title = self.unique('Benchmark post')
+        created = self.request('post', '/blogs/create/', {'title': title, 'content': 'Benchmark content ' * 200, 'status': 'published'}, token=token).json()
+        self.created_posts.append(created['id'])
+        self.request('post', '/blogs/update/', {'id': created['id'], 'title': title + ' edited', 'content': 'Edited ' * 200, 'status': 'published'}, token=token)
+        comment = self.request('post', f"/blogs/comment/{created['id']}/", {'comment': 'Benchmark comment'}, token=token).json()
+        self.request('post', f"/blogs/reply/{comment['comment']['id']}/", {'comment': 'Benchmark reply'}, token=token)
+        self.request('post', '/blogs/delete/', {'id': created['id']}, token=token)
+
+    def journey_register(self):
+        name = self.unique('bench').replace(' ', '').replace('.', '')
+        email = f'{name}@example.com'
+        self.created_users.append(email)
+        self.request('post', '/users/register/', {'username': name, 'email': email, 'password': self.password, 'password2': self.password})
+        CustomUser.objects.filter(email=email).update(email_otp='123456')
+        self.request('post', '/users/verify/', {'email': email, 'email_otp': '123456'})
+
+    def journey_account(self):
+        token = self.login()['access']
+        self.request('post', '/users/changepassword/', {'password': self.password, 'password2': self.password}, token=token)
+
+    def build_results(self, options, elapsed):
+        total = sum(len(samples) for samples in self.timings.values())
+        return {
+            'meta': {
+                'commit': current_commit(),
+                'created_at': timezone.now().isoformat(),
+                'iterations': options['iterations'],
+                'seed': options['seed'],
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'debug': settings.DEBUG,
+                'posts': BlogPost.objects.count(),
+                'comments': Comment.objects.count(),
+                'users': CustomUser.objects.count(),
+            },
+            'total': {
+                'requests': total,
+                'duration_s': round(elapsed, 3),
+                'throughput_rps': round(total / elapsed, 2) if elapsed else 0.0,
+            },
+            'endpoints': {
+                endpoint: summarize(self.timings[endpoint], self.queries[endpoint])
+                for endpoint in sorted(self.timings)
+            },
+        }
+
+    def report(self, results):
+        self.stdout.write(f"{'endpoint':42} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8}")
+        for endpoint, stats in results['endpoints'].items():
+            self.stdout.write(
+                f"{endpoint:42} {stats['requests']:>6} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+                f"{stats['p99_ms']:>9.2f} {stats['queries_mean']:>8.2f}"
+            )
+        total = results['total']
+        self.stdout.write(self.style.SUCCESS(
+            f"{total['requests']} requests in {total['duration_s']}s ({total['throughput_rps']} req/s)"
+        ))
+
+    def compare(self, previous, results):
+        self.stdout.write(f"Compared with {previous['meta'].get('commit') or 'previous run'}:")
+        for endpoint, stats in results['endpoints'].items():
+            before = previous['endpoints'].get(endpoint)
+            if before is None:
+                continue
+            self.stdout.write(
+                f"{endpoint:42} p50 {stats['p50_ms'] - before['p50_ms']:+9.2f} ms  "
+                f"p95 {stats['p95_ms'] - before['p95_ms']:+9.2f} ms  "
+                f"queries {stats['queries_mean'] - before['queries_mean']:+.2f}"
+            )
@@ -0,0 +1,111 @@
+import json
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from blogs.models import BlogPost
+from blogs.pagination import CustomPageNumberPagination
+from blogs.renderers import BlogPostJSONRenderer, JSONFragment, orjson
+from blogs.values_serializers import BlogPostListValuesSerializer
+from .benchmark_endpoints import current_commit
+
+CACHE_KEY = 'blogs:benchmark-renderer'
+
+
+class Command(BaseCommand):
+    help = (
+        'Time rendering a feed page with DRF\'s JSONRenderer, with BlogPostJSONRenderer on each encoder, and '
+        'from pre-encoded fragments, straight and after a round trip through the cache like the feed cache does'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100, help='Posts per page, the feed allows up to 100')
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson is not installed, there is only one encoder to compare')
+        request = Request(APIRequestFactory().get('/blogs/', {'page_size': options['page_size']}))
+        # The page the feed view serves
+        feed = BlogPost.objects.filter(status='published').order_by('-published_date', '-id')
+        response = CustomPageNumberPagination().generate_response(
+            BlogPostListValuesSerializer.values(feed), BlogPostListValuesSerializer, request
+        )
+        data = response.data
+        if not data.get('results'):
+            raise CommandError('No published posts found, run seed_blog_data first')
+
+        renderer = BlogPostJSONRenderer()
+        expected = JSONRenderer().render(data)
+        cases = {
+            'drf': (JSONRenderer(), 'json', data),
+            'json': (renderer, 'json', data),
+            'orjson': (renderer, 'orjson', data),
+            # Each post pre-encoded and spliced into the page
+            'fragments': (renderer, 'orjson', {
+                **data, 'results': [JSONFragment(renderer.render(item)) for item in data['results']]
+            }),
+            # The whole page pre-encoded, what the feed cache holds
+            'page': (renderer, 'orjson', JSONFragment(expected)),
+        }
+        results = {
+            'meta': {
+                'commit': current_commit(),
+                'page_size': len(data['results']),
+                'bytes': len(expected),
+                'iterations': options['iterations'],
+            },
+            'cases': {},
+        }
+        for name, (case_renderer, encoder, case_data) in cases.items():
+            with override_settings(JSON_RENDERER_ENCODER=encoder):
+                if case_renderer.render(case_data) != expected:
+                    raise CommandError(f'{name}: the rendered page differs from JSONRenderer\'s')
+                results['cases'][name] = self.measure(case_renderer, case_data, options['iterations'])
+        cache.delete(CACHE_KEY)
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def measure(self, renderer, data, iterations):
+        """Median milliseconds to render the page, and to read it from the cache and render it."""
+        cache.set(CACHE_KEY, data)
+        render, cached = [], []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            renderer.render(data)
+            render.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            renderer.render(cache.get(CACHE_KEY))
+            cached.append((time.perf_counter() - start) * 1000)
+        return {
+            'render_ms': round(statistics.median(render), 4),
+            'cached_ms': round(statistics.median(cached), 4),
+        }
+
+    def report(self, results):
+        meta = results['meta']
+        self.stdout.write(
+            f"Median of {meta['iterations']} iterations, {meta['page_size']} posts per page ({meta['bytes']} bytes)"
+        )
+        self.stdout.write(f"{'impl':10} {'render':>10} {'cached':>10} {'speedup':>16}")
+        drf = results['cases']['drf']
+        for name, stats in results['cases'].items():
+            speedup = ''
+            if name != 'drf':
+                speedup = (
+                    f"{drf['render_ms'] / max(stats['render_ms'], 0.0001):.1f}x / "
+                    f"{drf['cached_ms'] / max(stats['cached_ms'], 0.0001):.1f}x"
+                )
+            self.stdout.write(f"{name:10} {stats['render_ms']:>8.3f}ms {stats['cached_ms']:>8.3f}ms {speedup:>16}")
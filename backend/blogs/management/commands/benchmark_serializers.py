@@ -0,0 +1,135 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from blogs.comment_tree import TREE_FIELDS, load_reply_previews
+from blogs.models import BlogPost, Comment
+from blogs.renderers import BlogPostJSONRenderer
+from blogs.serializers import BlogPostListSerializer, CommentSerializer, ReplySerializer, narrow_queryset
+from blogs.values_serializers import BlogPostListValuesSerializer, CommentValuesSerializer
+from blogs.views import CommentView
+from .benchmark_endpoints import current_commit
+
+IMPLEMENTATIONS = ('drf', 'values')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the DRF serializers of the feed, comment and reply endpoints with the values() serializers '
+        'that replaced them, on pages of the current data'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Rows per page, the endpoints allow up to 100')
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        results = {
+            'meta': {
+                'commit': current_commit(),
+                'database': connection.vendor,
+                'rows': options['rows'],
+                'iterations': options['iterations'],
+            },
+            'cases': {},
+        }
+        renderer = BlogPostJSONRenderer()
+        for case, implementations in self.cases(options['rows']).items():
+            outputs = {name: renderer.render(self.serialize(*fetch())) for name, fetch in implementations.items()}
+            if outputs['drf'] != outputs['values']:
+                raise CommandError(f'{case}: the values() serializer output differs from the DRF one')
+            results['cases'][case] = {
+                name: self.measure(fetch, renderer, options['iterations'])
+                for name, fetch in implementations.items()
+            }
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def cases(self, rows):
+        """For each endpoint, how each implementation fetches a page: (serializer, objects, context)."""
+        post = BlogPost.objects.order_by('-comment_count').first()
+        thread = Comment.objects.filter(reply__isnull=True).order_by('-reply_count').first()
+        if post is None or thread is None:
+            raise CommandError('No posts with comments found, run seed_blog_data first')
+        context = {'request': Request(APIRequestFactory().get('/blogs/'))}
+        feed = BlogPost.objects.filter(status='published').order_by('-published_date', '-id')
+        top_level = Comment.objects.filter(post=post, reply__isnull=True).order_by('-created_at', '-id')
+        comment_fields = (*TREE_FIELDS, 'created_at', 'reply_count')
+        replies = thread.get_subtree()
+        limit = CommentView.reply_preview_limit
+
+        def comments(serializer, page, as_values):
+            tree = load_reply_previews(list(page[:rows]), limit, as_values=as_values)
+            return serializer, tree.top_level, {**context, 'comment_tree': tree}
+
+        return {
+            'feed': {
+                'drf': lambda: (BlogPostListSerializer, list(
+                    narrow_queryset(feed, BlogPostListSerializer, required=('published_date',))[:rows]
+                ), context),
+                'values': lambda: (BlogPostListValuesSerializer, list(
+                    BlogPostListValuesSerializer.values(feed, required=('published_date',))[:rows]
+                ), context),
+            },
+            'comments': {
+                'drf': lambda: comments(
+                    CommentSerializer, narrow_queryset(top_level, CommentSerializer, required=comment_fields), False
+                ),
+                'values': lambda: comments(
+                    CommentValuesSerializer, CommentValuesSerializer.values(top_level, required=comment_fields), True
+                ),
+            },
+            'replies': {
+                'drf': lambda: (CommentSerializer, list(
+                    narrow_queryset(replies, ReplySerializer, required=('reply', 'path'))[:rows]
+                ), context),
+                'values': lambda: (CommentValuesSerializer, list(
+                    CommentValuesSerializer.values(replies, required=('reply', 'path'))[:rows]
+                ), context),
+            },
+        }
+
+    def serialize(self, serializer, objects, context):
+        return serializer(objects, many=True, context=context).data
+
+    def measure(self, fetch, renderer, iterations):
+        """Median milliseconds to serialize a fetched page, and to fetch, serialize and render it."""
+        page = fetch()
+        serialize, total = [], []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            self.serialize(*page)
+            serialize.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            renderer.render(self.serialize(*fetch()))
+            total.append((time.perf_counter() - start) * 1000)
+        return {
+            'rows': len(page[1]),
+            'serialize_ms': round(statistics.median(serialize), 3),
+            'total_ms': round(statistics.median(total), 3),
+        }
+
+    def report(self, results):
+        self.stdout.write(f"Median of {results['meta']['iterations']} iterations, {results['meta']['rows']} rows per page")
+        self.stdout.write(f"{'case':10} {'impl':7} {'serialize':>10} {'total':>10} {'speedup':>16}")
+        for case, implementations in results['cases'].items():
+            drf = implementations['drf']
+            for name in IMPLEMENTATIONS:
+                stats = implementations[name]
+                speedup = ''
+                if name != 'drf' and stats['serialize_ms'] and stats['total_ms']:
+                    speedup = f"{drf['serialize_ms'] / stats['serialize_ms']:.1f}x / {drf['total_ms'] / stats['total_ms']:.1f}x"
+                self.stdout.write(
+                    f"{case:10} {name:7} {stats['serialize_ms']:>8.3f}ms {stats['total_ms']:>8.3f}ms {speedup:>16}"
+                )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from blogs.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, EXPORTS, export_lines
+
+
+class Command(BaseCommand):
+    help = 'Stream posts, comments or authors as NDJSON or CSV to a file or stdout'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--format', dest='fmt', choices=sorted(EXPORT_FORMATS), default='ndjson')
+        parser.add_argument('--output', help='File to write, stdout when omitted')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        chunks = export_lines(options['kind'], options['fmt'], chunk_size=options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Exported {options['kind']} to {options['output']}"))
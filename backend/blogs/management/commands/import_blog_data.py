@@ -0,0 +1,84 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.db_router import note_write
+from blogs.feed_cache import bump_feed_version
+from blogs.importer import IMPORT_BATCH_SIZE, FixtureError, FixtureImporter, iter_fixture
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream a users/blogs fixture (JSON array or JSON Lines, as written by dumpdata) into the database '
+        'in batches, resuming from the last checkpoint after a failure'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture')
+        parser.add_argument('--format', dest='fmt', choices=['json', 'jsonl'],
+                            help='Defaults to jsonl for .jsonl/.ndjson files and json otherwise')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--checkpoint', help='Defaults to <fixture>.checkpoint')
+        parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint')
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help='Report records that fail validation instead of stopping')
+
+    def handle(self, *args, **options):
+        path = options['fixture']
+        fmt = options['fmt'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'json')
+        checkpoint_path = options['checkpoint'] or f'{path}.checkpoint'
+        state = self.load_checkpoint(checkpoint_path, path, options['restart'])
+        if state['offset']:
+            self.stdout.write(f"Resuming after {state['imported']} records (byte {state['offset']})")
+
+        importer = FixtureImporter(options['batch_size'], options['skip_invalid'], state['pending'])
+        try:
+            with open(path, 'rb') as stream:
+                batch, offset = [], state['offset']
+                for obj, offset in iter_fixture(stream, fmt, state['offset']):
+                    batch.append(obj)
+                    if len(batch) >= options['batch_size']:
+                        importer.import_batch(batch)
+                        self.save_checkpoint(checkpoint_path, state, offset, importer)
+                        batch = []
+                importer.import_batch(batch)
+                self.save_checkpoint(checkpoint_path, state, offset, importer)
+        except FixtureError as error:
+            raise CommandError(f'{error}. Committed batches are kept, run the command again to resume.')
+        finally:
+            # bulk_create skips the signals that keep the feed caches fresh
+            note_write()
+            bump_feed_version()
+
+        for message in importer.invalid:
+            self.stderr.write(f'Skipped {message}')
+        if importer.pending:
+            raise CommandError(
+                f'{len(importer.pending)} records reference authors, posts or comments that are not in the '
+                f'fixture or the database. They are kept in {checkpoint_path}.'
+            )
+        os.remove(checkpoint_path)
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {state['imported']} records, skipped {len(importer.invalid)} invalid ones"
+        ))
+
+    def load_checkpoint(self, checkpoint_path, path, restart):
+        size = os.path.getsize(path)
+        fresh = {'fixture': os.path.abspath(path), 'size': size, 'offset': 0, 'imported': 0, 'pending': []}
+        if restart or not os.path.exists(checkpoint_path):
+            return fresh
+        with open(checkpoint_path, encoding='utf-8') as checkpoint:
+            state = json.load(checkpoint)
+        if state.get('size') != size:
+            raise CommandError(f'{path} changed since {checkpoint_path} was written, use --restart to start over.')
+        return state
+
+    def save_checkpoint(self, checkpoint_path, state, offset, importer):
+        # Written after the batch commits; replaying a batch is harmless since existing rows are skipped
+        state.update(offset=offset, imported=state['imported'] + importer.imported, pending=importer.pending)
+        importer.imported = 0
+        temporary = f'{checkpoint_path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as checkpoint:
+            json.dump(state, checkpoint)
+        os.replace(temporary, checkpoint_path)
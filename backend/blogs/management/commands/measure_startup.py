@@ -0,0 +1,130 @@
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from .benchmark_asgi import free_port
+from .benchmark_endpoints import current_commit
+
+STARTUP_MARKER = 'startup '
+
+
+class Command(BaseCommand):
+    help = 'Measure how long the production gunicorn server takes to start and answer its first request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Cold starts to measure')
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--path', default='/blogs/', help='Request that has to succeed')
+        parser.add_argument('--timeout', type=float, default=60, help='Seconds to wait for one start')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='Previous results JSON to print deltas against')
+
+    def handle(self, *args, **options):
+        runs = [self.measure(options) for _ in range(options['runs'])]
+        results = {
+            'meta': {
+                'commit': current_commit(),
+                'created_at': timezone.now().isoformat(),
+                'runs': options['runs'],
+                'workers': options['workers'],
+                'path': options['path'],
+            },
+            # Medians, cold starts are noisy
+            'startup': {
+                metric: round(statistics.median(run[metric] for run in runs), 2)
+                for metric in ('first_response_ms', 'master_ready_ms', 'workers_ready_ms')
+            },
+            'warmup_ms': {
+                step: round(statistics.median(run['warmup_ms'].get(step, 0) for run in runs), 2)
+                for step in runs[0]['warmup_ms']
+            },
+            'runs': runs,
+        }
+        self.report(results)
+        if options['compare']:
+            with open(options['compare']) as previous:
+                self.compare(json.load(previous), results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def measure(self, options):
+        port = free_port()
+        url = f"http://127.0.0.1:{port}{options['path']}"
+        command = [
+            sys.executable, '-m', 'gunicorn', 'backend.wsgi:application',
+            '--bind', f'127.0.0.1:{port}', '--workers', str(options['workers']),
+        ]
+        started = time.monotonic()
+        process = subprocess.Popen(
+            command, cwd=settings.BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        events = []
+        reader = threading.Thread(target=self.read_events, args=(process.stderr, events), daemon=True)
+        reader.start()
+        try:
+            first_response = self.wait_for_response(url, process, started, options['timeout'])
+            deadline = started + options['timeout']
+            while sum(event['event'] == 'worker_ready' for event in events) < options['workers']:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise CommandError('Workers did not report ready, check the gunicorn output')
+                time.sleep(0.05)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+            reader.join(timeout=5)
+
+        master = next((event for event in events if event['event'] == 'master_ready'), None)
+        if master is None:
+            raise CommandError('gunicorn did not log its startup, is gunicorn.conf.py being loaded?')
+        return {
+            'first_response_ms': first_response,
+            'master_ready_ms': master['since_start_ms'],
+            'workers_ready_ms': max(event['since_start_ms'] for event in events if event['event'] == 'worker_ready'),
+            'warmup_ms': master['warmup_ms'],
+        }
+
+    def read_events(self, stream, events):
+        for line in stream:
+            if STARTUP_MARKER in line:
+                events.append(json.loads(line.split(STARTUP_MARKER, 1)[1]))
+
+    def wait_for_response(self, url, process, started, timeout):
+        """Milliseconds from launching the server to the first successful response."""
+        while time.monotonic() - started < timeout:
+            if process.poll() is not None:
+                raise CommandError(f'gunicorn exited with code {process.returncode}')
+            try:
+                with urllib.request.urlopen(url, timeout=5) as response:
+                    if response.status == 200:
+                        return round((time.monotonic() - started) * 1000, 2)
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            time.sleep(0.02)
+        raise CommandError(f'No successful response from {url} within {timeout}s')
+
+    def report(self, results):
+        startup = results['startup']
+        self.stdout.write(
+            f"first response {startup['first_response_ms']:.0f} ms, master ready {startup['master_ready_ms']:.0f} ms, "
+            f"workers ready {startup['workers_ready_ms']:.0f} ms (median of {results['meta']['runs']})"
+        )
+        for step, duration in results['warmup_ms'].items():
+            self.stdout.write(f"  warm-up {step:10} {duration:>9.2f} ms")
+
+    def compare(self, previous, results):
+        self.stdout.write(f"Compared with {previous['meta'].get('commit') or 'previous run'}:")
+        for metric, value in results['startup'].items():
+            before = previous['startup'].get(metric)
+            if before is not None:
+                self.stdout.write(f"  {metric:18} {value - before:+9.2f} ms")
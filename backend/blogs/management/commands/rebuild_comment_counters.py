@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blogs.counts import rebuild_comment_counters
+from blogs.models import BlogPost, Comment
+
+
+class Command(BaseCommand):
+    help = 'Recompute BlogPost.comment_count and Comment.reply_count from the comments table'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_comment_counters(BlogPost, Comment)
+        self.stdout.write(self.style.SUCCESS('Comment counters rebuilt'))
@@ -0,0 +1,172 @@
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend.db_router import note_write
+from blogs.comment_tree import fill_comment_paths
+from blogs.feed_cache import bump_feed_version
+from blogs.importer import fixture_timestamps
+from blogs.models import BlogPost, Comment, build_excerpt
+from users.models import CustomUser
+
+WORDS = (
+    'the of and to in is you that it he was for on are as with his they at be this have from or one had by '
+    'word but not what all were we when your can said there use an each which she do how their if will up '
+    'other about out many then them these so some her would make like him into time has look two more write '
+    'go see number no way could people my than first water been call who oil its now find long down day did '
+    'get come made may part django python server query index cache latency database coffee travel garden '
+    'music design thread cursor page blog post comment reply author story night river city mountain market'
+).split()
+
+SEED_PASSWORD = 'seedpassword'
+# Every date is drawn back from here, not from the current time, so equal seeds give identical data
+SEED_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+DAY = 24 * 3600
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic synthetic dataset of users, posts, comments and replies for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--hot-fraction', type=float, default=0.01,
+                            help='Share of posts that attract a large comment thread')
+        parser.add_argument('--max-comments', type=int, default=500,
+                            help='Cap on top-level comments for a single post')
+        parser.add_argument('--prefix', default='seed',
+                            help='Username/email/slug prefix, change it to seed the same database twice')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+        started = time.perf_counter()
+
+        user_ids = self.create_users(options['users'])
+        totals = self.create_posts(user_ids, options['posts'], options['hot_fraction'], options['max_comments'])
+
+        # bulk_create skips save() and model signals, so derive paths and caches once at the end
+        fill_comment_paths(Comment)
+        note_write()
+        bump_feed_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(user_ids)} users, {totals['posts']} posts, {totals['comments']} comments "
+            f"and {totals['replies']} replies in {time.perf_counter() - started:.1f}s "
+            f"(password for every user: {SEED_PASSWORD})"
+        ))
+
+    def sentence(self, words):
+        return ' '.join(self.rng.choices(WORDS, k=words))
+
+    def content_words(self):
+        # Log-normal lengths: most posts run a few hundred words, a few are very long
+        return max(20, min(8000, int(self.rng.lognormvariate(6.2, 0.8))))
+
+    def skewed_count(self, alpha, cap):
+        return min(cap, int(self.rng.paretovariate(alpha)) - 1)
+
+    def date_after(self, start, days):
+        return min(SEED_EPOCH, start + timedelta(seconds=self.rng.randint(0, days * DAY)))
+
+    def create_users(self, count):
+        # Hashing once keeps seeding fast, every user shares the same password
+        password = make_password(SEED_PASSWORD)
+        user_ids = []
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for i in range(start, min(count, start + self.batch_size)):
+                joined = SEED_EPOCH - timedelta(seconds=self.rng.randint(3 * 365 * DAY, 4 * 365 * DAY))
+                batch.append(CustomUser(
+                    email=f'{self.prefix}{i}@example.com',
+                    username=f'{self.prefix}{i}',
+                    password=password,
+                    is_email_verified=True,
+                    date_joined=joined,
+                    last_login=joined,
+                ))
+            with transaction.atomic(), fixture_timestamps(CustomUser):
+                user_ids.extend(user.id for user in CustomUser.objects.bulk_create(batch))
+        return user_ids
+
+    def create_posts(self, user_ids, count, hot_fraction, max_comments):
+        totals = {'posts': 0, 'comments': 0, 'replies': 0}
+        for start in range(0, count, self.batch_size):
+            posts, threads = [], []
+            for i in range(start, min(count, start + self.batch_size)):
+                # Skew authorship towards a small group of prolific writers
+                author_id = user_ids[int(len(user_ids) * self.rng.random() ** 3)]
+                title = self.sentence(self.rng.randint(3, 9)).capitalize()
+                content = '\n\n'.join(
+                    self.sentence(80) for _ in range(math.ceil(self.content_words() / 80))
+                )
+                excerpt, word_count = build_excerpt(content)
+                published = SEED_EPOCH - timedelta(seconds=self.rng.randint(0, 3 * 365 * DAY))
+                thread = self.thread_shape(hot_fraction, max_comments)
+                threads.append(thread)
+                posts.append(BlogPost(
+                    title=title,
+                    slug=f'{self.prefix}-{i}',
+                    subtitle=self.sentence(self.rng.randint(0, 12)),
+                    content=content,
+                    excerpt=excerpt,
+                    word_count=word_count,
+                    published_date=published,
+                    updated_at=published,
+                    comments_updated_at=published,
+                    status='published' if self.rng.random() < 0.9 else 'draft',
+                    author_id=author_id,
+                    comment_count=len(thread) + sum(thread),
+                ))
+
+            with transaction.atomic(), fixture_timestamps(BlogPost), fixture_timestamps(Comment):
+                posts = BlogPost.objects.bulk_create(posts)
+                totals['posts'] += len(posts)
+                for counted, created in self.create_threads(posts, threads, user_ids).items():
+                    totals[counted] += created
+        return totals
+
+    def thread_shape(self, hot_fraction, max_comments):
+        # Reply counts for each top-level comment, drawn up front so the
+        # denormalized counters can be written with the rows themselves
+        hot = self.rng.random() < hot_fraction
+        count = self.skewed_count(0.8 if hot else 1.6, max_comments)
+        return [self.skewed_count(2.0, 50) for _ in range(count)]
+
+    def create_threads(self, posts, threads, user_ids):
+        comments = []
+        for post, thread in zip(posts, threads):
+            comments.extend(
+                Comment(post_id=post.id, user_id=self.rng.choice(user_ids), reply_count=replies,
+                        comment=self.sentence(self.rng.randint(4, 60)),
+                        created_at=self.date_after(post.published_date, 30))
+                for replies in thread
+            )
+        comments = Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+
+        replies = []
+        for parent in comments:
+            replies.extend(
+                Comment(post_id=parent.post_id, reply_id=parent.id, user_id=self.rng.choice(user_ids),
+                        comment=self.sentence(self.rng.randint(3, 40)),
+                        created_at=self.date_after(parent.created_at, 7))
+                for _ in range(parent.reply_count)
+            )
+        Comment.objects.bulk_create(replies, batch_size=self.batch_size)
+
+        # A post's comments last changed with its newest comment or reply
+        latest = {}
+        for comment in comments + replies:
+            latest[comment.post_id] = max(latest.get(comment.post_id, comment.created_at), comment.created_at)
+        for post in posts:
+            post.comments_updated_at = latest.get(post.id, post.published_date)
+        BlogPost.objects.bulk_update(posts, ['comments_updated_at'], batch_size=self.batch_size)
+        return {'comments': len(comments), 'replies': len(replies)}
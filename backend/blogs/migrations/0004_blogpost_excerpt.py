@@ -0,0 +1,44 @@
+# Generated by Django 5.1.7 on 2026-10-18 10:40
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+
+# Frozen copy of blogs.models.build_excerpt as of this migration
+def build_excerpt(content):
+    text = ' '.join(strip_tags(content).split())
+    return Truncator(text).chars(280), len(text.split())
+
+
+def backfill_excerpts(apps, schema_editor):
+    BlogPost = apps.get_model('blogs', 'BlogPost')
+    batch = []
+    for blog in BlogPost.objects.only('id', 'content').iterator(chunk_size=1000):
+        blog.excerpt, blog.word_count = build_excerpt(blog.content)
+        batch.append(blog)
+        if len(batch) >= 1000:
+            BlogPost.objects.bulk_update(batch, ['excerpt', 'word_count'])
+            batch = []
+    if batch:
+        BlogPost.objects.bulk_update(batch, ['excerpt', 'word_count'])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0003_blogpost_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=280),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
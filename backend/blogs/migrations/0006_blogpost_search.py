@@ -0,0 +1,79 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:30
+
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE blogs_blogpost ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(subtitle, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX blogpost_search_idx ON blogs_blogpost USING GIN (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS blogpost_search_idx",
+    "ALTER TABLE blogs_blogpost DROP COLUMN IF EXISTS search_vector",
+]
+
+# External content FTS5 table kept in sync with blogs_blogpost by triggers
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE blogs_blogpost_fts USING fts5(
+        title, subtitle, content, content='blogs_blogpost', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER blogs_blogpost_fts_insert AFTER INSERT ON blogs_blogpost BEGIN
+        INSERT INTO blogs_blogpost_fts(rowid, title, subtitle, content)
+        VALUES (new.id, new.title, new.subtitle, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER blogs_blogpost_fts_delete AFTER DELETE ON blogs_blogpost BEGIN
+        INSERT INTO blogs_blogpost_fts(blogs_blogpost_fts, rowid, title, subtitle, content)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER blogs_blogpost_fts_update AFTER UPDATE ON blogs_blogpost BEGIN
+        INSERT INTO blogs_blogpost_fts(blogs_blogpost_fts, rowid, title, subtitle, content)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.content);
+        INSERT INTO blogs_blogpost_fts(rowid, title, subtitle, content)
+        VALUES (new.id, new.title, new.subtitle, new.content);
+    END
+    """,
+    "INSERT INTO blogs_blogpost_fts(blogs_blogpost_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS blogs_blogpost_fts_update",
+    "DROP TRIGGER IF EXISTS blogs_blogpost_fts_delete",
+    "DROP TRIGGER IF EXISTS blogs_blogpost_fts_insert",
+    "DROP TABLE IF EXISTS blogs_blogpost_fts",
+]
+
+
+def run_for_vendor(postgres, sqlite):
+    def run(apps, schema_editor):
+        statements = {'postgresql': postgres, 'sqlite': sqlite}.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0005_blogpost_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(POSTGRES_REVERSE, SQLITE_REVERSE),
+        ),
+    ]
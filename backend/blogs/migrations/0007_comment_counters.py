@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-18 10:56
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    # Frozen copy of blogs.counts.rebuild_comment_counters as of this migration
+    BlogPost = apps.get_model('blogs', 'BlogPost')
+    Comment = apps.get_model('blogs', 'Comment')
+
+    def counted(**lookup):
+        rows = Comment.objects.filter(**lookup).order_by().values(next(iter(lookup)))
+        return Coalesce(Subquery(rows.annotate(total=Count('pk')).values('total')), 0)
+
+    BlogPost.objects.update(comment_count=counted(post=OuterRef('pk')))
+    Comment.objects.update(reply_count=counted(reply=OuterRef('pk')))
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0006_blogpost_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:10
+
+from django.db import migrations
+
+SEARCH_VECTOR = """
+    setweight(to_tsvector('english', coalesce({row}.title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}.subtitle, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}.content, '')), 'C')
+"""
+
+# A generated column is recomputed on every UPDATE, including the comment
+# counter bumps, so the vector is now maintained by a trigger that only
+# fires when the searchable text changes
+POSTGRES_FORWARD = [
+    "DROP INDEX IF EXISTS blogpost_search_idx",
+    "ALTER TABLE blogs_blogpost DROP COLUMN IF EXISTS search_vector",
+    "ALTER TABLE blogs_blogpost ADD COLUMN search_vector tsvector",
+    f"""
+    CREATE FUNCTION blogs_blogpost_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {SEARCH_VECTOR.format(row='NEW')};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER blogs_blogpost_search_vector
+    BEFORE INSERT OR UPDATE OF title, subtitle, content ON blogs_blogpost
+    FOR EACH ROW EXECUTE FUNCTION blogs_blogpost_search_vector()
+    """,
+    f"UPDATE blogs_blogpost SET search_vector = {SEARCH_VECTOR.format(row='blogs_blogpost')}",
+    "CREATE INDEX blogpost_search_idx ON blogs_blogpost USING GIN (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP TRIGGER IF EXISTS blogs_blogpost_search_vector ON blogs_blogpost",
+    "DROP FUNCTION IF EXISTS blogs_blogpost_search_vector()",
+    "DROP INDEX IF EXISTS blogpost_search_idx",
+    "ALTER TABLE blogs_blogpost DROP COLUMN IF EXISTS search_vector",
+    f"""
+    ALTER TABLE blogs_blogpost ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS ({SEARCH_VECTOR.format(row='blogs_blogpost')}) STORED
+    """,
+    "CREATE INDEX blogpost_search_idx ON blogs_blogpost USING GIN (search_vector)",
+]
+
+
+def run_for_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for statement in statements:
+                schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0007_comment_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_for_postgres(POSTGRES_FORWARD), run_for_postgres(POSTGRES_REVERSE)),
+    ]
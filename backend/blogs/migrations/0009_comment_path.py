@@ -0,0 +1,48 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:05
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import CharField, F, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Concat, LPad
+
+
+def backfill_paths(apps, schema_editor):
+    # Frozen copy of blogs.comment_tree.fill_comment_paths as of this migration:
+    # ten-digit segments counting down from 10 ** 10 - 1, one thread level per UPDATE
+    Comment = apps.get_model('blogs', 'Comment')
+    segment = LPad(Cast(Value(10 ** 10 - 1) - F('id'), output_field=CharField()), 10, Value('0'))
+    missing = Comment.objects.filter(path='')
+    missing.filter(reply__isnull=True).update(path=segment, depth=0)
+    parent = Comment.objects.filter(pk=OuterRef('reply_id'))
+    while missing.filter(reply__path__gt='').update(
+        path=Concat(Subquery(parent.values('path')), segment, output_field=CharField()),
+        depth=Subquery(parent.values('depth')) + 1,
+    ):
+        pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0008_blogpost_search_trigger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=250),
+        ),
+        # Filled before the index exists so the backfill doesn't maintain it row by row
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'path'], name='comment_thread_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0009_comment_path'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('reply__isnull', True)), fields=['post', '-created_at', '-id'], name='comment_top_level_idx'),
+        ),
+    ]
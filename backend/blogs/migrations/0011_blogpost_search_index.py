@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:50
+
+import blogs.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0010_comment_top_level_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogPostSearchIndex',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='blogs.blogpost')),
+                ('document', blogs.models.FTS5IndexField(db_column='blogs_blogpost_fts')),
+            ],
+            options={
+                'db_table': 'blogs_blogpost_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -1,5 +1,53 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import Lookup
 from django.utils import timezone
+from django.utils.html import strip_tags
+from django.utils.text import Truncator, slugify
+
+EXCERPT_LENGTH = 280
+
+
+def build_excerpt(content):
+    # Content may hold HTML from the editor, the excerpt is plain text
+    text = ' '.join(strip_tags(content).split())
+    return Truncator(text).chars(EXCERPT_LENGTH), len(text.split())
+
+
+COUNTER_FIELDS = {'comment_count', 'reply_count'}
+# Written by blogs.signals with update(), like the counters, so saves leave them alone
+SIGNAL_FIELDS = COUNTER_FIELDS | {'comments_updated_at'}
+
+# Paths of the fixed routes blogs/urls.py matches before <slug>/
+RESERVED_SLUGS = {'user', 'create', 'delete', 'update', 'search', 'replies'}
+
+
+def blog_slug(title):
+    """The slug of a post titled ``title``, never one a fixed route would shadow."""
+    slug = slugify(title)
+    return f'{slug}-post' if slug in RESERVED_SLUGS else slug
+
+# A comment's thread path is its parent's path plus one fixed-width segment per
+# level. Segments count down from PATH_MAX_ID so newer siblings sort first,
+# and paths stay all digits so every collation orders them the same way.
+PATH_STEP = 10
+PATH_MAX_ID = 10 ** PATH_STEP - 1
+PATH_MAX_LENGTH = 250
+MAX_THREAD_DEPTH = PATH_MAX_LENGTH // PATH_STEP - 1
+
+
+def thread_segment(pk):
+    return f'{PATH_MAX_ID - pk:0{PATH_STEP}d}'
+
+
+def fields_without_counters(instance):
+    # Saving a stale in-memory counter would undo concurrent F() increments, and a
+    # stale comments_updated_at would hand out 304s for a thread that has changed.
+    # Like a plain save(), fields deferred by only()/defer() are left out, not loaded.
+    deferred = instance.get_deferred_fields()
+    return [
+        field.name for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name not in SIGNAL_FIELDS and field.attname not in deferred
+    ]
 
 
 class BlogPost(models.Model):
@@ -15,22 +63,133 @@ class BlogPost(models.Model):
     ], default='draft')
     author = models.ForeignKey(
         'users.CustomUser', on_delete=models.CASCADE, related_name='blogs', default=None, null=True, blank=True)
+    # Precomputed on save so list responses never have to load content
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    # Validators for conditional GETs on the post and on its comment thread
+    updated_at = models.DateTimeField(auto_now=True)
+    comments_updated_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Comments and replies on the post, maintained with F() updates by blogs.signals
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        # Keyset pagination walks these in (published_date, id) order
+        indexes = [
+            models.Index(fields=['status', '-published_date', '-id'], name='blogpost_feed_idx'),
+            models.Index(fields=['author', '-published_date', '-id'], name='blogpost_author_feed_idx'),
+        ]
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            update_fields = kwargs['update_fields'] = fields_without_counters(self)
+        if update_fields is None or 'content' in update_fields:
+            self.excerpt, self.word_count = build_excerpt(self.content)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt', 'word_count'}
+        super().save(*args, **kwargs)
     
     # def comments(self):
     #     return Comment.objects.filter(post=self).order_by('-created_at')
     
+def subtree_filter(post_id, path):
+    """Filter for the replies below the comment at ``path``, also usable with values() rows."""
+    if not path:
+        # Bulk loaded and waiting for fill_comment_paths, there's no range to scan yet
+        return models.Q(pk__in=[])
+    # Paths are all digits, so everything below this one sorts before path + 1
+    upper = f'{int(path) + 1:0{len(path)}d}'
+    return models.Q(post_id=post_id, path__gt=path, path__lt=upper)
+
+
 class Comment(models.Model):
     comment = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='comments')
     user = models.ForeignKey('users.CustomUser', on_delete=models.CASCADE, related_name='comments', default=None, null=True, blank=True)
     reply = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
+    # Direct replies, maintained with F() updates by blogs.signals
+    reply_count = models.PositiveIntegerField(default=0, editable=False)
+    # Materialized path, a subtree is one range scan over (post, path), see blogs.comment_tree
+    path = models.CharField(max_length=PATH_MAX_LENGTH, default='', editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', 'path'], name='comment_thread_idx'),
+            # Cursor pages of top-level comments, newest first
+            models.Index(
+                fields=['post', '-created_at', '-id'], name='comment_top_level_idx',
+                condition=models.Q(reply__isnull=True),
+            ),
+        ]
 
     def __str__(self):
         return f'Comment by {self.username} on {self.post.title}'
     
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if kwargs.get('update_fields') is None and not adding:
+            kwargs['update_fields'] = fields_without_counters(self)
+        if not adding or self.path:
+            super().save(*args, **kwargs)
+            return
+        # The path is written right after the insert, a failure in between must not leave a
+        # pathless row. Inside a transaction already, that one rolls back, no savepoint needed.
+        using = kwargs.get('using') or router.db_for_write(Comment, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+            self.assign_path()
+
+    def assign_path(self):
+        # The segment needs the primary key, so the path is written right after the insert
+        parent_path = self.reply.path if self.reply_id is not None else ''
+        self.path = parent_path + thread_segment(self.pk)
+        self.depth = len(self.path) // PATH_STEP - 1
+        Comment.objects.using(self._state.db).filter(pk=self.pk).update(path=self.path, depth=self.depth)
+
     def get_replies(self):
         return self.replies.all().order_by('-created_at')
+
+    def subtree_filter(self):
+        return subtree_filter(self.post_id, self.path)
+
+    def get_subtree(self, max_depth=None):
+        """Replies at any depth below this comment in thread order, from one range scan."""
+        replies = Comment.objects.filter(self.subtree_filter()).order_by('path')
+        if max_depth is not None:
+            replies = replies.filter(depth__lte=self.depth + max_depth)
+        return replies
+
+
+class FTS5IndexField(models.TextField):
+    """The hidden column of an FTS5 table, named like the table, that MATCH and bm25() take."""
+
+
+@FTS5IndexField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class BlogPostSearchIndex(models.Model):
+    """
+    The FTS5 index of the posts on SQLite (migration 0006, triggers in
+    blogs.search), joined to them by rowid. Never a table on PostgreSQL.
+    """
+    post = models.OneToOneField(
+        BlogPost, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid', db_constraint=False,
+        related_name='search_index',
+    )
+    document = FTS5IndexField(db_column='blogs_blogpost_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'blogs_blogpost_fts'
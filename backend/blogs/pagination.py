@@ -1,9 +1,90 @@
+import base64
+import binascii
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger, Paginator as DjangoPaginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.dateparse import parse_datetime
 from rest_framework import pagination, status
 from rest_framework.exceptions import NotFound as NotFoundError
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+class LookaheadPage(Page):
+    """A page that knows from one extra row whether another page follows."""
+
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+
+class CountedPaginator(DjangoPaginator):
+    """
+    Django paginator that takes its total from a count strategy instead of COUNT(*).
+
+    ``total`` may be an int or a callable, so cursor mode never pays for a count.
+    It may also be an estimate or a little stale, so it is only shown: a page
+    is fetched with one extra row to tell whether another one follows, instead
+    of being clamped to the total, and what the page saw corrects the total.
+    """
+
+    def __init__(self, object_list, per_page, total=None, **kwargs):
+        self.total = total
+        super().__init__(object_list, per_page, **kwargs)
+
+    @cached_property
+    def count(self):
+        if self.total is None:
+            return super().count
+        return self.total() if callable(self.total) else self.total
+
+    def validate_number(self, number):
+        # Only the lower bound, the total doesn't decide which pages exist
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page_slice(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return number, bottom, self.object_list[bottom:bottom + self.per_page + 1]
+
+    def page(self, number):
+        number, bottom, rows = self.page_slice(number)
+        return self.settle(number, bottom, list(rows))
+
+    async def apage(self, number):
+        number, bottom, rows = self.page_slice(number)
+        rows = [row async for row in rows]
+        # Settling may run the count strategy, after that the total is pure Python
+        return await sync_to_async(self.settle)(number, bottom, rows)
+
+    def settle(self, number, bottom, rows):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+        seen = bottom + len(rows)
+        # The last page gives the exact total for free, any other one a lower bound
+        self.__dict__['count'] = max(self.count, seen + 1) if has_more else seen
+        self.__dict__.pop('num_pages', None)
+        return LookaheadPage(rows, number, self, has_more)
+
 
 class CustomPageNumberPagination(pagination.PageNumberPagination):
+    django_paginator_class = CountedPaginator
     page_size = 6
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -19,10 +100,240 @@ class CustomPageNumberPagination(pagination.PageNumberPagination):
         })
 
     def generate_response(self, query_set, serializer, request: Request, total=None) -> Response:
+        if total is not None:
+            self.django_paginator_class = partial(CountedPaginator, total=total)
         try:
             page_data = self.paginate_queryset(query_set, request)
         except NotFoundError:
             return Response({"message": "No results found for the requested page"}, status=status.HTTP_400_BAD_REQUEST)
 
-        serialized_page = serializer(page_data, many=True)
-        return self.get_paginated_response(serialized_page.data)
\ No newline at end of file
+        serialized_page = serializer(page_data, many=True, context={'request': request})
+        return self.get_paginated_response(serialized_page.data)
+
+    async def apaginate_queryset(self, queryset, request):
+        """paginate_queryset() for async views, the page rows come from the async ORM."""
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        # Only ?page=last needs the total up front, and the count strategy may read the database
+        page_number = await sync_to_async(self.get_page_number)(request, paginator)
+        try:
+            self.page = await paginator.apage(page_number)
+        except InvalidPage as exc:
+            raise NotFoundError(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        return list(self.page)
+
+    async def agenerate_response(self, query_set, serializer, request: Request, total=None) -> Response:
+        if total is not None:
+            self.django_paginator_class = partial(CountedPaginator, total=total)
+        try:
+            page_data = await self.apaginate_queryset(query_set, request)
+        except NotFoundError:
+            return Response({"message": "No results found for the requested page"}, status=status.HTTP_400_BAD_REQUEST)
+
+        serialized_page = serializer(page_data, many=True, context={'request': request})
+        return self.get_paginated_response(serialized_page.data)
+
+
+class SearchPageNumberPagination(CustomPageNumberPagination):
+    """Page numbers over a CappedCount total, ``count_capped`` tells clients ``count`` stopped at the cap."""
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        # The last page counts its rows itself, its total is exact
+        response.data['count_capped'] = getattr(self.page.paginator.total, 'capped', False) and self.page.has_next()
+        return response
+
+
+class KeysetCursorPagination(pagination.BasePagination):
+    """
+    Keyset pagination on (ordering_field, id), newest first.
+
+    Each page is a single indexed range query with no COUNT and no OFFSET,
+    so deep pages cost the same as the first one. Cursors are opaque tokens
+    carried in the next/previous links.
+    """
+    ordering_field = None
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            return pagination._positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def encode_cursor(self, obj, reverse):
+        # obj is a model instance or a values_list(named=True) row, both have id
+        raw = f"{getattr(obj, self.ordering_field).isoformat()}|{obj.id}|{int(reverse)}"
+        return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            position, pk, reverse = raw.rsplit('|', 2)
+            timestamp = parse_datetime(position)
+            if timestamp is None:
+                raise ValueError(position)
+            return timestamp, int(pk), bool(int(reverse))
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFoundError(self.invalid_cursor_message)
+
+    def page_queryset(self, queryset, request):
+        """The query for the requested page, plus one row to tell whether another page exists."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[2]
+
+        field = self.ordering_field
+        if cursor is None:
+            queryset = queryset.order_by(f'-{field}', '-id')
+        elif reverse:
+            # Walking back towards newer rows, nearest to the cursor first
+            timestamp, pk, _ = cursor
+            queryset = queryset.filter(
+                Q(**{f'{field}__gt': timestamp}) | Q(**{field: timestamp, 'id__gt': pk})
+            ).order_by(field, 'id')
+        else:
+            timestamp, pk, _ = cursor
+            queryset = queryset.filter(
+                Q(**{f'{field}__lt': timestamp}) | Q(**{field: timestamp, 'id__lt': pk})
+            ).order_by(f'-{field}', '-id')
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        # The extra row tells us whether another page exists without counting
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.cursor is not None and self.cursor[2]:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        self.page = rows
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        return self.set_page([row async for row in self.page_queryset(queryset, request)])
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1], reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[0], reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
+
+    def generate_response(self, query_set, serializer, request: Request, total=None) -> Response:
+        try:
+            page_data = self.paginate_queryset(query_set, request)
+        except NotFoundError:
+            return Response({"message": self.invalid_cursor_message}, status=status.HTTP_400_BAD_REQUEST)
+
+        serialized_page = serializer(page_data, many=True, context={'request': request})
+        return self.get_paginated_response(serialized_page.data)
+
+    async def agenerate_response(self, query_set, serializer, request: Request, total=None) -> Response:
+        try:
+            page_data = await self.apaginate_queryset(query_set, request)
+        except NotFoundError:
+            return Response({"message": self.invalid_cursor_message}, status=status.HTTP_400_BAD_REQUEST)
+
+        serialized_page = serializer(page_data, many=True, context={'request': request})
+        return self.get_paginated_response(serialized_page.data)
+
+
+class BlogCursorPagination(KeysetCursorPagination):
+    ordering_field = 'published_date'
+
+
+class CommentCursorPagination(KeysetCursorPagination):
+    """Top-level comments of a post, newest first."""
+    ordering_field = 'created_at'
+    page_size = 20
+
+
+class ReplyCursorPagination(KeysetCursorPagination):
+    """
+    Forward-only keyset pagination over a thread in path order.
+
+    The cursor is the path of the last reply on the page, so "load more"
+    is the same range scan as the first page, started further along.
+    """
+    page_size = 20
+
+    def encode_cursor(self, reply, reverse=False):
+        return base64.urlsafe_b64encode(reply.path.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            path = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFoundError(self.invalid_cursor_message)
+        if not path.isdigit():
+            raise NotFoundError(self.invalid_cursor_message)
+        return path
+
+    def page_queryset(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is not None:
+            queryset = queryset.filter(path__gt=self.cursor)
+        return queryset.order_by('path')[:self.page_size + 1]
+
+    def set_page(self, rows):
+        self.has_next, self.has_previous = len(rows) > self.page_size, False
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data
+        })
+
+
+def cursor_requested(request: Request):
+    """Cursor mode is opt-in with ?pagination=cursor (or any ?cursor=)."""
+    params = request.query_params
+    return (
+        params.get(KeysetCursorPagination.mode_query_param) == 'cursor'
+        or KeysetCursorPagination.cursor_query_param in params
+    )
+
+
+def get_blog_paginator(request: Request):
+    """Cursor pagination when the client opts in, page numbers otherwise."""
+    if cursor_requested(request):
+        return BlogCursorPagination()
+    return CustomPageNumberPagination()
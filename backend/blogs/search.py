@@ -0,0 +1,169 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVectorField
+from django.db import connections
+from django.db.models import CharField, Expression, F, FloatField, Func, Q, Value
+from .models import BlogPost
+
+SNIPPET_START = '<mark>'
+SNIPPET_STOP = '</mark>'
+# Counting every match of a common term is as slow as a scan, so totals stop here
+MAX_COUNTED_RESULTS = 1000
+
+
+class SearchVectorColumn(Expression):
+    """
+    The post's search_vector column. It is maintained by a trigger and has a
+    GIN index (migration 0008), but it isn't a model field, so other databases
+    never select it.
+    """
+    output_field = SearchVectorField()
+
+    def as_sql(self, compiler, connection):
+        alias = compiler.query.get_initial_alias()
+        return f'{compiler.quote_name_unless_alias(alias)}.{connection.ops.quote_name("search_vector")}', []
+
+
+def _postgres_query(query):
+    return SearchQuery(query, config='english', search_type='websearch')
+
+
+def _postgres_matches(queryset, query):
+    return queryset.alias(search_vector=SearchVectorColumn()).filter(search_vector=_postgres_query(query))
+
+
+def _postgres_ranked(queryset, query):
+    search_query = _postgres_query(query)
+    return queryset.annotate(
+        rank=SearchRank(SearchVectorColumn(), search_query, cover_density=True),
+        snippet=SearchHeadline(
+            'content', search_query, config='english', start_sel=SNIPPET_START, stop_sel=SNIPPET_STOP,
+            max_fragments=1, max_words=30, min_words=10,
+        ),
+    ).order_by('-rank', '-published_date')
+
+
+def _fts5_query(query):
+    # Quote every term so user input can't break the FTS5 query syntax
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+def _sqlite_matches(queryset, query):
+    # Joins the FTS5 index, see BlogPostSearchIndex
+    return queryset.filter(search_index__document__match=_fts5_query(query))
+
+
+def _sqlite_ranked(queryset, query):
+    index = F('search_index__document')
+    return queryset.annotate(
+        rank=Func(index, function='bm25', output_field=FloatField()) * -1,
+        # Fragments of column 2, the content
+        snippet=Func(
+            index, Value(2), Value(SNIPPET_START), Value(SNIPPET_STOP), Value('...'), Value(30),
+            function='snippet', output_field=CharField(),
+        ),
+    ).order_by('-rank', '-published_date')
+
+
+# SQLite rebuilds blogs_blogpost on most ALTERs and drops these along with it,
+# so they are (re)created after every migrate rather than only in migration 0006.
+# Updates only reindex when searchable text changes, not on counter bumps, like
+# the PostgreSQL trigger from migration 0008.
+SQLITE_TRIGGERS = {
+    'blogs_blogpost_fts_insert': """
+        CREATE TRIGGER blogs_blogpost_fts_insert AFTER INSERT ON blogs_blogpost BEGIN
+            INSERT INTO blogs_blogpost_fts(rowid, title, subtitle, content)
+            VALUES (new.id, new.title, new.subtitle, new.content);
+        END
+    """,
+    'blogs_blogpost_fts_delete': """
+        CREATE TRIGGER blogs_blogpost_fts_delete AFTER DELETE ON blogs_blogpost BEGIN
+            INSERT INTO blogs_blogpost_fts(blogs_blogpost_fts, rowid, title, subtitle, content)
+            VALUES ('delete', old.id, old.title, old.subtitle, old.content);
+        END
+    """,
+    'blogs_blogpost_fts_update': """
+        CREATE TRIGGER blogs_blogpost_fts_update AFTER UPDATE OF title, subtitle, content ON blogs_blogpost BEGIN
+            INSERT INTO blogs_blogpost_fts(blogs_blogpost_fts, rowid, title, subtitle, content)
+            VALUES ('delete', old.id, old.title, old.subtitle, old.content);
+            INSERT INTO blogs_blogpost_fts(rowid, title, subtitle, content)
+            VALUES (new.id, new.title, new.subtitle, new.content);
+        END
+    """,
+}
+
+
+def _normalized(sql):
+    return ' '.join(sql.split())
+
+
+def ensure_sqlite_search_index(using='default'):
+    """
+    Bring the FTS5 triggers in line with SQLITE_TRIGGERS: create the missing
+    ones, replace outdated ones, and rebuild the index if any were gone.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE name LIKE 'blogs_blogpost_fts%'")
+        existing = dict(cursor.fetchall())
+        if 'blogs_blogpost_fts' not in existing:
+            return
+        missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+        for name, sql in SQLITE_TRIGGERS.items():
+            if name in missing or _normalized(existing[name]) != _normalized(sql):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+                cursor.execute(sql)
+        if missing:
+            cursor.execute("INSERT INTO blogs_blogpost_fts(blogs_blogpost_fts) VALUES ('rebuild')")
+
+
+def _fallback_matches(queryset, query):
+    # Without a full-text index every term has to appear somewhere in the post
+    for term in query.split():
+        queryset = queryset.filter(Q(title__icontains=term) | Q(subtitle__icontains=term) | Q(content__icontains=term))
+    return queryset
+
+
+def _fallback_ranked(queryset, query):
+    # Unranked, newest first, the stored excerpt stands in for the snippet
+    return queryset.annotate(rank=Value(0.0, output_field=FloatField()), snippet=F('excerpt')).order_by('-published_date')
+
+
+BACKENDS = {
+    'postgresql': (_postgres_matches, _postgres_ranked),
+    'sqlite': (_sqlite_matches, _sqlite_ranked),
+}
+
+
+class CappedCount:
+    """
+    Counts ``queryset`` when called, up to ``limit`` rows. ``capped`` then
+    tells whether there were more.
+    """
+
+    def __init__(self, queryset, limit):
+        self.queryset = queryset
+        self.limit = limit
+        self.capped = False
+
+    def __call__(self):
+        count = self.queryset[:self.limit + 1].count()
+        self.capped = count > self.limit
+        return min(count, self.limit)
+
+
+def search_blogs(query):
+    """
+    Published posts matching ``query`` as ``(results, total)``.
+
+    ``results`` is ordered best match first and carries ``rank`` and
+    ``snippet``. ``total`` is a CappedCount of the matches, which computes
+    neither. Databases without a full-text backend get unranked substring
+    matches.
+    """
+    queryset = BlogPost.objects.filter(status='published')
+    vendor = connections[queryset.db].vendor
+    matches, ranked = BACKENDS.get(vendor, (_fallback_matches, _fallback_ranked))
+    matching = matches(queryset, query)
+    results = ranked(matching.select_related('author').defer('content'), query)
+    return results, CappedCount(matching.values('id'), MAX_COUNTED_RESULTS)
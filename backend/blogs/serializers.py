@@ -1,48 +1,151 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.urls import reverse
 from rest_framework import serializers
-from .models import BlogPost, Comment
+from rest_framework.utils.urls import replace_query_param
+from .models import MAX_THREAD_DEPTH, BlogPost, Comment
+from .pagination import ReplyCursorPagination
 from users.models import CustomUser
 
+
+def requested_fields(request):
+    """Field names from a ``?fields=id,title`` query parameter, or None when absent."""
+    if request is None or request.method != 'GET':
+        return None
+    raw = request.GET.get('fields')
+    if not raw:
+        return None
+    return {name.strip() for name in raw.split(',') if name.strip()}
+
+
+def narrow_queryset(queryset, serializer_class, fields=None, required=()):
+    """Load only the columns (and joined relations) the serializer is going to read."""
+    serializer_fields = serializer_class().fields
+    if fields and not fields & set(serializer_fields):
+        fields = None  # Like trim_fields(), unknown names alone leave every field in
+    columns, related = set(required), []
+    for name, field in serializer_fields.items():
+        if fields and name not in fields:
+            continue
+        if isinstance(field, serializers.ModelSerializer):
+            related.append(field.source)
+            columns.update(f'{field.source}__{sub}' for sub in field.Meta.fields)
+            continue
+        try:
+            queryset.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue  # SerializerMethodField and other computed values
+        columns.add(field.source)
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
+
+
+def trim_fields(fields, requested):
+    """Drop from ``fields`` what ``?fields=`` didn't ask for, unless it named none of them."""
+    if requested and requested & set(fields):
+        for name in set(fields) - requested:
+            fields.pop(name)
+    return fields
+
+
+class SparseFieldsMixin:
+    """Trims the output to the fields requested with ``?fields=`` on GET requests."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        trim_fields(self.fields, requested_fields(self.context.get('request')))
+
+
+def reply_page_link(comment_id, last_reply, request, depth=None):
+    """The ReplyView page of ``comment_id``'s replies (``depth`` levels of them) after ``last_reply``."""
+    cursor = ReplyCursorPagination().encode_cursor(last_reply)
+    url = reverse('reply', kwargs={'comment_id': comment_id})
+    if request is not None:
+        url = request.build_absolute_uri(url)
+    if depth is not None:
+        url = replace_query_param(url, 'depth', depth)
+    return replace_query_param(url, ReplyCursorPagination.cursor_query_param, cursor)
+
+
+def replies_next_link(comment, tree, request):
+    """The "load more replies" link of a top-level comment, None when the tree holds all its replies."""
+    if tree is None or not tree.has_more_replies(comment):
+        return None
+    return reply_page_link(comment.id, tree.replies_for(comment)[-1], request)
+
+
 class AuthorSerializer(serializers.ModelSerializer):
     class Meta:
         model = CustomUser
         fields = ['id', 'username', 'email']
 
-class BlogPostSerializer(serializers.ModelSerializer):
+class BlogPostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = AuthorSerializer(read_only=True)
     class Meta:
         model = BlogPost
-        # fields = ('id', 'title', 'slug', 'subtitle', 'content', 'published_date', 'status', 'author')
-        fields = '__all__'  # Including all fields from the model
+        fields = ('id', 'title', 'slug', 'subtitle', 'content', 'published_date', 'status', 'author', 'comment_count')
+
 
-class CommentSerializer(serializers.ModelSerializer):
+class BlogPostListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Feed representation: the stored excerpt stands in for the full content."""
+    author = AuthorSerializer(read_only=True)
+    class Meta:
+        model = BlogPost
+        fields = ('id', 'title', 'slug', 'subtitle', 'excerpt', 'word_count', 'published_date', 'status', 'author', 'comment_count')
+
+class BlogPostSearchSerializer(BlogPostListSerializer):
+    """Feed representation plus the match rank and a highlighted snippet."""
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+    class Meta(BlogPostListSerializer.Meta):
+        fields = BlogPostListSerializer.Meta.fields + ('rank', 'snippet')
+
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = AuthorSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
+    replies_next = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
-        fields = ['id', 'comment', 'created_at', 'post', 'user', 'reply', 'replies']
+        fields = ['id', 'comment', 'created_at', 'post', 'user', 'reply', 'reply_count', 'depth', 'replies', 'replies_next']
         # fields = '__all__'
 
 
     def get_replies(self, obj):
-        if obj.reply is None:  # Only for top-level comments
-            replies = Comment.objects.filter(reply=obj)
-            return ReplySerializer(replies, many=True).data
+        if obj.reply_id is None:  # Only for top-level comments
+            # Views pass a preloaded CommentTree so replies don't cost a query per comment
+            tree = self.context.get('comment_tree')
+            if tree is not None:
+                replies = tree.replies_for(obj)
+            elif obj.reply_count == 0:
+                return []  # The denormalized counter saves a query for fresh or quiet threads
+            else:
+                replies = obj.get_subtree().select_related('user')
+            return ReplySerializer(replies, many=True, context=self.context).data
         return []
+
+    def get_replies_next(self, obj):
+        # "Load more replies" link, set when the tree only embeds the first few
+        return replies_next_link(obj, self.context.get('comment_tree'), self.context.get('request'))
+
+    def validate_reply(self, value):
+        if value is not None and value.depth >= MAX_THREAD_DEPTH:
+            raise serializers.ValidationError('This thread is too deep to reply to.')
+        return value
     
     def create(self, validated_data):
         if 'user' not in validated_data and 'request' in self.context:
             validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
     
-class ReplySerializer(serializers.ModelSerializer):
+class ReplySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = AuthorSerializer(read_only=True)
     
     class Meta:
         model = Comment
-        fields = ['id', 'comment', 'created_at', 'post', 'user', 'reply']
+        fields = ['id', 'comment', 'created_at', 'post', 'user', 'reply', 'reply_count', 'depth']
 
     def create(self, validated_data):
         if 'user' not in validated_data and 'request' in self.context:
             validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
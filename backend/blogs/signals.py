@@ -0,0 +1,76 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from backend.db_router import note_write
+from .feed_cache import bump_feed_version
+from .models import BlogPost, Comment
+from users.models import CustomUser
+
+# User fields the comment and reply payloads show, besides the id
+SHOWN_USER_FIELDS = ('username', 'email')
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+def blog_changed(sender, instance, **kwargs):
+    # Creates, publishes and deletes all change the cached feed totals and pages.
+    # Again on commit, as a reader in between may have cached the uncommitted state.
+    note_write()
+    bump_feed_version()
+    transaction.on_commit(bump_feed_version)
+
+
+def sync_loaded_counters(instance, delta):
+    # Keep already loaded parents in step with the F() updates, the serializers
+    # trust reply_count to decide whether a comment has replies at all
+    if instance.reply_id is not None and Comment.reply.is_cached(instance) and instance.reply is not None:
+        instance.reply.reply_count += delta
+    if Comment.post.is_cached(instance) and instance.post is not None:
+        instance.post.comment_count += delta
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    note_write()
+    # update() skips BlogPost signals, so the feed cache and updated_at are left alone
+    changes = {'comments_updated_at': timezone.now()}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+        if instance.reply_id is not None:
+            Comment.objects.filter(pk=instance.reply_id).update(reply_count=F('reply_count') + 1)
+        sync_loaded_counters(instance, 1)
+    BlogPost.objects.filter(pk=instance.post_id).update(**changes)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if isinstance(kwargs.get('origin'), BlogPost):
+        return  # The whole post is being deleted along with its comments
+    note_write()
+    if instance.reply_id is not None:
+        Comment.objects.filter(pk=instance.reply_id).update(reply_count=F('reply_count') - 1)
+    BlogPost.objects.filter(pk=instance.post_id).update(
+        comments_updated_at=timezone.now(), comment_count=F('comment_count') - 1
+    )
+    sync_loaded_counters(instance, -1)
+
+
+def shown_user_fields(user):
+    # Straight from __dict__, so deferred fields aren't loaded here
+    return tuple(user.__dict__.get(name) for name in SHOWN_USER_FIELDS)
+
+
+@receiver(post_init, sender=CustomUser)
+def remember_shown_user_fields(sender, instance, **kwargs):
+    instance._shown_fields = shown_user_fields(instance)
+
+
+@receiver(post_save, sender=CustomUser)
+def user_saved(sender, instance, created, **kwargs):
+    shown = shown_user_fields(instance)
+    if not created and shown != instance._shown_fields:
+        # Threads show the commenter's name without a timestamp of their own, they revalidate on this one
+        BlogPost.objects.filter(comments__user=instance).update(comments_updated_at=timezone.now())
+    instance._shown_fields = shown
@@ -0,0 +1,116 @@
+from unittest.mock import patch
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from blogs.models import BlogPost, Comment
+from users.models import CustomUser
+
+
+class AsyncReadViewTest(APITestCase):
+    """The ASGI urlconf serves the blog reads from async views with the same output."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        for i in range(8):
+            cls.blog = BlogPost.objects.create(
+                title=f'Test Post {i}',
+                slug=f'test-post-{i}',
+                content=f'Content for test post {i}',
+                author=cls.user,
+                status='published'
+            )
+        cls.comments = [Comment.objects.create(post=cls.blog, user=cls.user, comment=f'Comment {i}') for i in range(4)]
+        cls.thread = cls.comments[-1]
+        parent = cls.thread
+        for i in range(6):
+            parent = Comment.objects.create(post=cls.blog, user=cls.user, comment=f'Reply {i}', reply=parent if i % 2 else cls.thread)
+
+    def setUp(self):
+        cache.clear()
+
+    def fetch(self, url, **headers):
+        """The same GET through the WSGI urlconf and through the ASGI one."""
+        expected = self.client.get(url, headers=headers)
+        cache.clear()
+        with override_settings(ROOT_URLCONF='backend.asgi_urls'):
+            response = async_to_sync(self.async_client.get)(url, headers=headers)
+            self.assertTrue(iscoroutinefunction(response.resolver_match.func))
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response.get('Content-Type'), expected.get('Content-Type'))
+        self.assertEqual(response.asgi_request.query_stats.count, expected.wsgi_request.query_stats.count)
+        return response
+
+    def test_feed(self):
+        response = self.fetch(reverse('blogs') + '?page=2')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['current_page'], 2)
+
+        first = self.fetch(reverse('blogs') + '?pagination=cursor&page_size=3')
+        self.fetch(first.json()['next'])
+        self.fetch(reverse('blogs') + '?page=99')
+
+    def test_feed_hit(self):
+        url = reverse('blogs') + '?page=2'
+        with override_settings(ROOT_URLCONF='backend.asgi_urls'):
+            async_to_sync(self.async_client.get)(url)
+            response = async_to_sync(self.async_client.get)(url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.content, self.client.get(url).content)
+
+    def test_single_blog(self):
+        url = reverse('single-blog', kwargs={'slug': self.blog.slug})
+        response = self.fetch(url)
+        self.assertEqual(response['ETag'], self.client.get(url)['ETag'])
+        self.fetch(url + '?fields=id,title')
+        self.fetch(url + '?fields=nope')
+        missing = self.fetch(reverse('single-blog', kwargs={'slug': 'missing'}))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+        cached = self.fetch(url, **{'If-None-Match': response['ETag']})
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_comments(self):
+        url = reverse('comment', kwargs={'blog_id': self.blog.id})
+        self.fetch(url)
+        response = self.fetch(url + '?pagination=cursor&page_size=2')
+        thread = response.json()['results'][0]
+        self.assertEqual(thread['id'], self.thread.id)
+        self.assertIsNotNone(thread['replies_next'])
+        self.fetch(response.json()['next'])
+        self.fetch(url + '?fields=id,replies')
+        missing = self.fetch(reverse('comment', kwargs={'blog_id': 0}))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+        invalid = self.fetch(url + '?cursor=nope')
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_replies(self):
+        url = reverse('reply', kwargs={'comment_id': self.thread.id})
+        response = self.fetch(url + '?pagination=cursor&page_size=2')
+        self.fetch(response.json()['next'])
+        self.fetch(url + '?depth=1')
+        missing = self.fetch(reverse('reply', kwargs={'comment_id': 0}))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    @patch('blogs.views.send_comment_notification_email.delay')
+    def test_writes_stay_on_drf_views(self, mock_delay):
+        url = reverse('comment', kwargs={'blog_id': self.blog.id})
+        token = RefreshToken.for_user(self.user).access_token
+        with override_settings(ROOT_URLCONF='backend.asgi_urls'):
+            response = async_to_sync(self.async_client.post)(
+                url, {'comment': 'Posted over ASGI'}, content_type='application/json',
+                headers={'Authorization': f'Bearer {token}'}
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['comment']['comment'], 'Posted over ASGI')
+        self.assertTrue(Comment.objects.filter(comment='Posted over ASGI').exists())
@@ -0,0 +1,40 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from blogs.management.commands.benchmark_endpoints import percentile
+from blogs.models import BlogPost, Comment
+from users.models import CustomUser
+
+
+class BenchmarkEndpointsCommandTest(TestCase):
+    def test_writes_percentiles_per_endpoint(self):
+        call_command('seed_blog_data', users=5, posts=20, stdout=StringIO())
+        posts_before, comments_before, users_before = BlogPost.objects.count(), Comment.objects.count(), CustomUser.objects.count()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            call_command('benchmark_endpoints', iterations=30, warmup=0, output=path, stdout=StringIO())
+            with open(path) as output:
+                results = json.load(output)
+
+        self.assertEqual(results['meta']['iterations'], 30)
+        self.assertGreater(results['total']['requests'], 30)
+        feed = results['endpoints']['GET /blogs/']
+        self.assertLessEqual(feed['p50_ms'], feed['p95_ms'])
+        self.assertLessEqual(feed['p95_ms'], feed['p99_ms'])
+        self.assertIn('queries_mean', feed)
+        # What the benchmark wrote is deleted again
+        self.assertEqual(BlogPost.objects.count(), posts_before)
+        self.assertEqual(Comment.objects.count(), comments_before)
+        self.assertEqual(CustomUser.objects.count(), users_before)
+
+    def test_percentiles_are_nearest_rank(self):
+        samples = [float(i) for i in range(1, 11)]
+        self.assertEqual(percentile(samples, 50), 5.0)
+        self.assertEqual(percentile(samples, 95), 10.0)
+        self.assertEqual(percentile(samples, 99), 10.0)
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50), 3.0)
+        self.assertEqual(percentile([7.0], 50), 7.0)
@@ -0,0 +1,106 @@
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from blogs.models import BlogPost, Comment
+from blogs.search import search_blogs
+from users.models import CustomUser
+
+
+@patch('blogs.views.send_comment_notification_email.delay')
+class CommentCounterTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.blog = BlogPost.objects.create(
+            title='Counted Blog',
+            slug='counted-blog',
+            content='Searchable content',
+            status='published',
+            author=self.user
+        )
+
+    def refresh(self, *objects):
+        for obj in objects:
+            obj.refresh_from_db()
+
+    def test_comment_and_reply_views_bump_counters(self, mock_email):
+        response = self.client.post(reverse('comment', kwargs={'blog_id': self.blog.id}), {'comment': 'Hi'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['comment']['reply_count'], 0)
+        comment = Comment.objects.get(pk=response.data['comment']['id'])
+
+        self.client.post(reverse('reply', kwargs={'comment_id': comment.id}), {'comment': 'Hello'})
+        self.client.post(reverse('reply', kwargs={'comment_id': comment.id}), {'comment': 'Hey'})
+
+        self.refresh(self.blog, comment)
+        self.assertEqual(self.blog.comment_count, 3)
+        self.assertEqual(comment.reply_count, 2)
+
+        response = self.client.get(reverse('single-blog', kwargs={'slug': 'counted-blog'}))
+        self.assertEqual(response.data['comment_count'], 3)
+
+    def test_deletes_decrement_counters(self, mock_email):
+        comment = Comment.objects.create(post=self.blog, user=self.user, comment='Parent')
+        reply = Comment.objects.create(post=self.blog, user=self.user, reply=comment, comment='Reply')
+        Comment.objects.create(post=self.blog, user=self.user, reply=comment, comment='Reply')
+
+        reply.delete()
+        self.refresh(self.blog, comment)
+        self.assertEqual(self.blog.comment_count, 2)
+        self.assertEqual(comment.reply_count, 1)
+
+        # Deleting a thread removes its replies along with it
+        comment.delete()
+        self.refresh(self.blog)
+        self.assertEqual(self.blog.comment_count, 0)
+
+    def test_saving_a_stale_instance_keeps_counters(self, mock_email):
+        stale = BlogPost.objects.get(pk=self.blog.pk)
+        Comment.objects.create(post=self.blog, user=self.user, comment='Hi')
+
+        stale.title = 'Edited'
+        stale.save()
+        self.refresh(self.blog)
+        self.assertEqual(self.blog.title, 'Edited')
+        self.assertEqual(self.blog.comment_count, 1)
+
+    def test_saving_a_partly_loaded_instance_loads_nothing_more(self, mock_email):
+        comment = Comment.objects.create(post=self.blog, user=self.user, comment='Hi')
+        # The author is loaded for the signal that invalidates their cached counts
+        blog = BlogPost.objects.only('id', 'title', 'author').get(pk=self.blog.pk)
+        blog.title = 'Renamed'
+        with self.assertNumQueries(1):
+            blog.save()
+        comment = Comment.objects.only('id', 'comment', 'post').get(pk=comment.pk)
+        comment.comment = 'Edited'
+        with self.assertNumQueries(2):  # The UPDATE and the post's comments_updated_at bump
+            comment.save()
+
+        self.blog.refresh_from_db()
+        self.assertEqual((self.blog.title, self.blog.content, self.blog.comment_count), ('Renamed', 'Searchable content', 1))
+        self.assertEqual(Comment.objects.get(pk=comment.pk).comment, 'Edited')
+
+    def test_counter_updates_keep_post_searchable(self, mock_email):
+        Comment.objects.create(post=self.blog, user=self.user, comment='Hi')
+        results, total = search_blogs('searchable')
+        self.assertEqual(total(), 1)
+
+    def test_rebuild_command_repairs_drift(self, mock_email):
+        comment = Comment.objects.create(post=self.blog, user=self.user, comment='Parent')
+        Comment.objects.create(post=self.blog, user=self.user, reply=comment, comment='Reply')
+        BlogPost.objects.update(comment_count=10)
+        Comment.objects.update(reply_count=5)
+
+        call_command('rebuild_comment_counters', stdout=StringIO())
+        self.refresh(self.blog, comment)
+        self.assertEqual(self.blog.comment_count, 2)
+        self.assertEqual(comment.reply_count, 1)
@@ -0,0 +1,279 @@
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from blogs.comment_tree import fill_comment_paths, load_comment_tree
+from blogs.models import MAX_THREAD_DEPTH, BlogPost, Comment
+from users.models import CustomUser
+
+
+class CommentTreeTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        cls.blog = BlogPost.objects.create(
+            title='Test Blog',
+            slug='test-blog',
+            content='Test content',
+            status='published',
+            author=cls.user
+        )
+        cls.parent = Comment.objects.create(post=cls.blog, user=cls.user, comment='Parent')
+        cls.other = Comment.objects.create(post=cls.blog, user=cls.user, comment='Other')
+        cls.reply = Comment.objects.create(post=cls.blog, user=cls.user, comment='Reply', reply=cls.parent)
+
+    def test_tree_groups_replies_under_parent(self):
+        with self.assertNumQueries(1):
+            tree = load_comment_tree(self.blog)
+
+        self.assertEqual({c.id for c in tree.top_level}, {self.parent.id, self.other.id})
+        self.assertEqual([c.id for c in tree.replies_for(self.parent)], [self.reply.id])
+        self.assertEqual(tree.replies_for(self.other), [])
+
+
+class ThreadPathTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        cls.blog = BlogPost.objects.create(
+            title='Test Blog',
+            slug='test-blog',
+            content='Test content',
+            status='published',
+            author=cls.user
+        )
+        cls.root = Comment.objects.create(post=cls.blog, user=cls.user, comment='Root')
+        cls.older = Comment.objects.create(post=cls.blog, user=cls.user, comment='Older', reply=cls.root)
+        cls.deep = Comment.objects.create(post=cls.blog, user=cls.user, comment='Deep', reply=cls.older)
+        cls.deeper = Comment.objects.create(post=cls.blog, user=cls.user, comment='Deeper', reply=cls.deep)
+        cls.newer = Comment.objects.create(post=cls.blog, user=cls.user, comment='Newer', reply=cls.root)
+        cls.other = Comment.objects.create(post=cls.blog, user=cls.user, comment='Other')
+
+    def ids(self, comments):
+        return [c.id for c in comments]
+
+    def test_subtree_is_one_query_in_thread_order(self):
+        with self.assertNumQueries(1):
+            subtree = list(self.root.get_subtree())
+        # Depth first, newest siblings first, nothing from other threads
+        self.assertEqual(self.ids(subtree), [self.newer.id, self.older.id, self.deep.id, self.deeper.id])
+        self.assertEqual([c.depth for c in subtree], [1, 1, 2, 3])
+
+    def test_comment_without_a_path_has_no_subtree_yet(self):
+        Comment.objects.filter(pk=self.root.pk).update(path='')
+        self.root.refresh_from_db()
+        self.assertEqual(list(self.root.get_subtree()), [])
+
+    def test_subtree_depth_limit(self):
+        self.assertEqual(self.ids(self.root.get_subtree(max_depth=1)), [self.newer.id, self.older.id])
+        self.assertEqual(self.ids(self.older.get_subtree(max_depth=1)), [self.deep.id])
+
+    def test_tree_includes_every_level(self):
+        tree = load_comment_tree(self.blog)
+        self.assertEqual(self.ids(tree.top_level), [self.other.id, self.root.id])
+        self.assertEqual(self.ids(tree.replies_for(self.root)), self.ids(self.root.get_subtree()))
+
+    def test_fill_comment_paths_matches_save(self):
+        expected = list(Comment.objects.order_by('id').values_list('path', 'depth'))
+        Comment.objects.update(path='', depth=0)
+
+        fill_comment_paths(Comment)
+        self.assertEqual(list(Comment.objects.order_by('id').values_list('path', 'depth')), expected)
+
+
+class CommentViewQueryCountTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        self.blog = BlogPost.objects.create(
+            title='Test Blog',
+            slug='test-blog',
+            content='Test content',
+            status='published',
+            author=self.user
+        )
+        self.url = reverse('comment', kwargs={'blog_id': self.blog.id})
+
+    def add_thread(self, count):
+        for i in range(count):
+            parent = Comment.objects.create(post=self.blog, user=self.user, comment=f'Comment {i}')
+            Comment.objects.create(post=self.blog, user=self.user, comment=f'Reply {i}', reply=parent)
+
+    def test_query_count_is_constant_as_thread_grows(self):
+        self.add_thread(1)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+        self.add_thread(20)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 21)
+        self.assertTrue(all(len(c['replies']) == 1 for c in response.data))
+
+    def test_cursor_page_query_count_is_constant_as_thread_grows(self):
+        # Post, one page of comments, the reply previews of every thread on it
+        self.add_thread(1)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'pagination': 'cursor'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+        self.add_thread(20)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 25})
+        self.assertEqual(len(response.data['results']), 21)
+        self.assertTrue(all(len(c['replies']) == 1 for c in response.data['results']))
+
+    def test_deep_replies_are_returned(self):
+        parent = Comment.objects.create(post=self.blog, user=self.user, comment='Parent')
+        for level in range(3):
+            parent = Comment.objects.create(post=self.blog, user=self.user, comment=f'Level {level}', reply=parent)
+
+        response = self.client.get(self.url)
+        replies = response.data[0]['replies']
+        self.assertEqual([r['comment'] for r in replies], ['Level 0', 'Level 1', 'Level 2'])
+        self.assertEqual([r['depth'] for r in replies], [1, 2, 3])
+        self.assertIsNone(response.data[0]['replies_next'])
+
+        top = response.data[0]['id']
+        response = self.client.get(reverse('reply', kwargs={'comment_id': top}), {'depth': 2})
+        self.assertEqual([r['comment'] for r in response.data], ['Level 0', 'Level 1'])
+        response = self.client.get(reverse('reply', kwargs={'comment_id': top}), {'depth': 2, 'pagination': 'cursor'})
+        self.assertEqual([r['comment'] for r in response.data['results']], ['Level 0', 'Level 1'])
+
+    def test_comments_are_cursor_paginated(self):
+        for i in range(5):
+            Comment.objects.create(post=self.blog, user=self.user, comment=f'Comment {i}')
+
+        seen = []
+        response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 2})
+        while True:
+            seen.extend(c['comment'] for c in response.data['results'])
+            if response.data['next'] is None:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(seen, [f'Comment {i}' for i in reversed(range(5))])
+
+        previous = self.client.get(response.data['previous'])
+        self.assertEqual([c['comment'] for c in previous.data['results']], ['Comment 2', 'Comment 1'])
+
+        response = self.client.get(self.url, {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_threads_embed_first_replies_and_load_more(self):
+        quiet = Comment.objects.create(post=self.blog, user=self.user, comment='Quiet')
+        Comment.objects.create(post=self.blog, user=self.user, comment='Only reply', reply=quiet)
+        viral = Comment.objects.create(post=self.blog, user=self.user, comment='Viral')
+        for i in range(7):
+            Comment.objects.create(post=self.blog, user=self.user, comment=f'Reply {i}', reply=viral)
+        newest_first = [f'Reply {i}' for i in reversed(range(7))]
+
+        response = self.client.get(self.url, {'pagination': 'cursor'})
+        viral_data, quiet_data = response.data['results']
+        self.assertEqual([r['comment'] for r in viral_data['replies']], newest_first[:3])
+        self.assertIsNone(quiet_data['replies_next'])
+        self.assertEqual(len(quiet_data['replies']), 1)
+
+        loaded = []
+        url = viral_data['replies_next'] + '&page_size=3'
+        while url:
+            page = self.client.get(url).data
+            loaded.extend(r['comment'] for r in page['results'])
+            url = page['next']
+        self.assertEqual(loaded, newest_first[3:])
+
+    def test_reply_depth_is_capped(self):
+        parent = Comment.objects.create(post=self.blog, user=self.user, comment='Parent')
+        for level in range(MAX_THREAD_DEPTH):
+            parent = Comment.objects.create(post=self.blog, user=self.user, comment=f'Level {level}', reply=parent)
+
+        self.client.force_authenticate(self.user)
+        response = self.client.post(reverse('reply', kwargs={'comment_id': parent.id}), {'comment': 'Too deep'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BatchReplyViewTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        self.blog = BlogPost.objects.create(
+            title='Test Blog',
+            slug='test-blog',
+            content='Test content',
+            status='published',
+            author=self.user
+        )
+        self.url = reverse('batch-replies')
+
+    def test_replies_grouped_by_parent_in_one_query(self):
+        parents = [Comment.objects.create(post=self.blog, user=self.user, comment=f'Parent {i}') for i in range(3)]
+        for parent in parents[:2]:
+            for i in range(2):
+                reply = Comment.objects.create(post=self.blog, user=self.user, comment=f'{parent.comment} reply {i}', reply=parent)
+        Comment.objects.create(post=self.blog, user=self.user, comment='Nested', reply=reply)
+
+        ids = ','.join(str(parent.id) for parent in parents)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'ids': ids})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), [str(parent.id) for parent in parents])
+        self.assertEqual(
+            [r['comment'] for r in response.data[str(parents[0].id)]['results']], ['Parent 0 reply 1', 'Parent 0 reply 0']
+        )
+        # Only direct replies, the nested one shows up in its parent's reply_count
+        self.assertEqual([r['reply_count'] for r in response.data[str(parents[1].id)]['results']], [1, 0])
+        self.assertEqual(response.data[str(parents[2].id)], {'next': None, 'results': []})
+
+    def test_replies_per_comment_are_capped(self):
+        parent = Comment.objects.create(post=self.blog, user=self.user, comment='Parent')
+        for i in range(25):
+            Comment.objects.create(post=self.blog, user=self.user, comment=f'Reply {i}', reply=parent)
+
+        nested = Comment.objects.create(post=self.blog, user=self.user, comment='Nested', reply=parent.replies.first())
+
+        response = self.client.get(self.url, {'ids': parent.id})
+        replies = response.data[str(parent.id)]
+        self.assertEqual(len(replies['results']), 20)
+        self.assertEqual(replies['results'][0]['comment'], 'Reply 24')
+
+        # The rest of the direct replies, and only them, page on through ReplyView
+        rest = self.client.get(replies['next']).data
+        self.assertEqual([r['comment'] for r in rest['results']], [f'Reply {i}' for i in range(4, -1, -1)])
+        self.assertNotIn(nested.id, [r['id'] for r in rest['results']])
+        self.assertIsNone(rest['next'])
+
+    def test_invalid_ids(self):
+        for ids in ['', 'a,b', ','.join(str(i) for i in range(1, 102))]:
+            response = self.client.get(self.url, {'ids': ids})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CommentSaveTransactionTest(TransactionTestCase):
+    def test_insert_rolls_back_when_the_path_cannot_be_written(self):
+        user = CustomUser.objects.create_user(email='testuser@example.com', username='testuser', password='testpassword')
+        blog = BlogPost.objects.create(title='Test Blog', slug='test-blog', content='Test content', author=user)
+
+        with mock.patch.object(Comment, 'assign_path', side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            Comment.objects.create(post=blog, user=user, comment='Lost')
+        self.assertFalse(Comment.objects.exists())
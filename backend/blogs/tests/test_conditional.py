@@ -0,0 +1,109 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from blogs.models import BlogPost, Comment
+from users.models import CustomUser
+
+
+class ConditionalGetTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        self.blog = BlogPost.objects.create(
+            title='Test Blog',
+            slug='test-blog',
+            content='Test content',
+            status='published',
+            author=self.user
+        )
+        Comment.objects.create(post=self.blog, user=self.user, comment='First')
+        self.blog_url = reverse('single-blog', kwargs={'slug': 'test-blog'})
+        self.comments_url = reverse('comment', kwargs={'blog_id': self.blog.id})
+
+    def test_single_blog_revalidates_with_etag(self):
+        response = self.client.get(self.blog_url)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.blog_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_single_blog_revalidates_with_last_modified(self):
+        response = self.client.get(self.blog_url)
+        cached = self.client.get(self.blog_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_edit_changes_etag(self):
+        etag = self.client.get(self.blog_url)['ETag']
+        self.blog.content = 'Edited'
+        self.blog.save()
+
+        response = self.client.get(self.blog_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['content'], 'Edited')
+
+    def test_comments_revalidate_until_a_new_comment(self):
+        etag = self.client.get(self.comments_url)['ETag']
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.comments_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Comment.objects.create(post=self.blog, user=self.user, comment='Second')
+        response = self.client.get(self.comments_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+    def test_fields_variants_have_distinct_etags(self):
+        full = self.client.get(self.blog_url)['ETag']
+        sparse = self.client.get(self.blog_url, {'fields': 'title'})['ETag']
+        self.assertNotEqual(full, sparse)
+
+    def test_new_comment_changes_single_blog_etag(self):
+        # The post payload carries comment_count, so a new comment must invalidate it
+        etag = self.client.get(self.blog_url)['ETag']
+        Comment.objects.create(post=self.blog, user=self.user, comment='Second')
+
+        response = self.client.get(self.blog_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['comment_count'], 2)
+
+    def test_author_rename_changes_single_blog_etag(self):
+        etag = self.client.get(self.blog_url)['ETag']
+        sparse = self.client.get(self.blog_url, {'fields': 'title'})['ETag']
+        self.user.username = 'renamed'
+        self.user.save()
+
+        response = self.client.get(self.blog_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['author']['username'], 'renamed')
+        response = self.client.get(self.blog_url, {'fields': 'title'}, HTTP_IF_NONE_MATCH=sparse)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_commenter_rename_changes_comments_etag(self):
+        etag = self.client.get(self.comments_url)['ETag']
+        commenter = CustomUser.objects.get(pk=self.user.pk)
+        commenter.save()  # Nothing shown changed
+        self.assertEqual(self.client.get(self.comments_url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        commenter.email = 'renamed@example.com'
+        commenter.save()
+        response = self.client.get(self.comments_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['user']['email'], 'renamed@example.com')
+
+    def test_saving_a_stale_post_keeps_the_new_comment_visible(self):
+        etag = self.client.get(self.comments_url)['ETag']
+        stale = BlogPost.objects.get(pk=self.blog.pk)  # As loaded by the update view or the admin
+        Comment.objects.create(post=self.blog, user=self.user, comment='Second')
+        stale.title = 'Edited'
+        stale.save()
+
+        response = self.client.get(self.comments_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
@@ -0,0 +1,126 @@
+from unittest import mock, skipIf, skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from blogs.counts import get_blog_count, published_count_key, planner_estimate
+from blogs.models import BlogPost
+from users.models import CustomUser
+
+
+class BlogCountTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        for i in range(3):
+            BlogPost.objects.create(
+                title=f'Test Post {i}',
+                slug=f'test-post-{i}',
+                content='Content',
+                author=self.user,
+                status='published'
+            )
+        self.published = BlogPost.objects.filter(status='published')
+
+    def test_cached_count_skips_query_on_hit(self):
+        self.assertEqual(get_blog_count(self.published, published_count_key()), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_blog_count(self.published, published_count_key()), 3)
+
+    def test_create_publish_and_delete_invalidate(self):
+        get_blog_count(self.published, published_count_key())
+
+        draft = BlogPost.objects.create(title='Draft', slug='draft', content='Content', author=self.user)
+        self.assertEqual(get_blog_count(self.published, published_count_key()), 3)
+
+        draft.status = 'published'
+        draft.save()
+        self.assertEqual(get_blog_count(self.published, published_count_key()), 4)
+
+        draft.delete()
+        self.assertEqual(get_blog_count(self.published, published_count_key()), 3)
+
+    def test_count_overtaken_by_a_write_is_not_cached(self):
+        count = QuerySet.count
+
+        def count_then_write(queryset):
+            total = count(queryset)
+            BlogPost.objects.create(title='Late', slug='late', content='Content', author=self.user, status='published')
+            return total
+
+        with mock.patch.object(QuerySet, 'count', autospec=True, side_effect=count_then_write):
+            self.assertEqual(get_blog_count(self.published, published_count_key()), 3)
+        self.assertEqual(get_blog_count(self.published, published_count_key()), 4)
+
+    @override_settings(BLOG_COUNT_STRATEGY='exact')
+    def test_exact_strategy_always_counts(self):
+        with self.assertNumQueries(2):
+            get_blog_count(self.published, published_count_key())
+            get_blog_count(self.published, published_count_key())
+
+    @skipIf(connection.vendor == 'postgresql', 'PostgreSQL has a planner to estimate from')
+    @override_settings(BLOG_COUNT_STRATEGY='estimate')
+    def test_estimate_falls_back_without_planner(self):
+        self.assertIsNone(planner_estimate(self.published))
+        self.assertEqual(get_blog_count(self.published, published_count_key()), 3)
+
+    @skipUnless(connection.vendor == 'postgresql', 'Only PostgreSQL has a planner estimate')
+    @override_settings(BLOG_COUNT_STRATEGY='estimate')
+    def test_small_estimates_are_counted_exactly(self):
+        self.assertIsInstance(planner_estimate(self.published), int)
+        self.assertEqual(get_blog_count(self.published, published_count_key()), 3)
+
+
+class PaginatedCountTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        for i in range(8):
+            BlogPost.objects.create(
+                title=f'Test Post {i}',
+                slug=f'test-post-{i}',
+                content='Content',
+                author=self.user,
+                status='published'
+            )
+
+    def test_feed_reuses_cached_total(self):
+        url = reverse('blogs')
+        first = self.client.get(url)
+        self.assertEqual(first.data['count'], 8)
+        self.assertEqual(first.data['total_pages'], 2)
+
+        # Second request only fetches the page rows
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(url + '?page=2')
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('COUNT(' in q['sql'].upper() for q in queries.captured_queries))
+        self.assertEqual(second.data['count'], 8)
+        self.assertEqual(len(second.data['results']), 2)
+
+    def test_underestimated_total_reaches_every_row(self):
+        url = reverse('blogs')
+        with mock.patch('blogs.views.get_blog_count', return_value=3):
+            first = self.client.get(url)
+            self.assertEqual(len(first.data['results']), 6)
+            self.assertEqual(first.data['count'], 7)  # At least what the page saw
+            self.assertIsNotNone(first.data['next'])
+
+            second = self.client.get(first.data['next'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(second.data['results']), 2)
+        self.assertEqual((second.data['count'], second.data['total_pages']), (8, 2))
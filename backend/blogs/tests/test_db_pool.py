@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.db.backends.postgresql.base import DatabaseWrapper
+from django.urls import reverse
+from psycopg_pool import ConnectionPool
+from rest_framework import status
+from rest_framework.test import APITestCase
+from backend.db_pool import describe_pool, discard_inherited_pools, pool_stats
+from users.models import CustomUser
+
+
+class PoolStatsTest(APITestCase):
+    def test_unpooled_database(self):
+        stats = pool_stats()['default']
+        self.assertFalse(stats['pooled'])
+        self.assertIn('conn_max_age', stats)
+        self.assertNotIn('in_use', stats)
+
+    def test_describe_pool(self):
+        pool = ConnectionPool('', min_size=1, max_size=4, open=False)
+        stats = describe_pool(pool)
+        self.assertEqual((stats['min_size'], stats['max_size']), (1, 4))
+        self.assertEqual((stats['idle'], stats['waiting'], stats['waits'], stats['connect_ms_mean']), (0, 0, 0, 0))
+
+    def test_discard_inherited_pools(self):
+        # Fails if Django stops keeping its pools in DatabaseWrapper._connection_pools
+        connection = DatabaseWrapper({
+            'NAME': 'blog', 'USER': '', 'PASSWORD': '', 'HOST': '', 'PORT': '',
+            'OPTIONS': {'pool': True}, 'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False,
+            'AUTOCOMMIT': True, 'ATOMIC_REQUESTS': False, 'TIME_ZONE': None,
+        }, alias='inherited')
+        inherited = connection.pool
+        self.addCleanup(DatabaseWrapper._connection_pools.pop, 'inherited', None)
+
+        with mock.patch('backend.db_pool.connections.all', return_value=[connection]):
+            discard_inherited_pools()
+        self.assertNotIn('inherited', DatabaseWrapper._connection_pools)
+        self.assertIsInstance(connection.pool, ConnectionPool)
+        self.assertIsNot(connection.pool, inherited)
+
+    def test_metrics_are_staff_only(self):
+        url = reverse('db-pool-metrics')
+        user = CustomUser.objects.create_user(email='user@example.com', username='user', password='password')
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        user.is_staff = True
+        user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('default', response.data['databases'])
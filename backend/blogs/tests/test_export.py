@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from blogs.export import export_lines
+from blogs.models import BlogPost, Comment
+from users.models import CustomUser
+
+
+def make_content(testcase):
+    testcase.user = CustomUser.objects.create_user(
+        email='testuser@example.com',
+        username='testuser',
+        password='testpassword'
+    )
+    for i in range(5):
+        blog = BlogPost.objects.create(
+            title=f'Post {i}',
+            slug=f'post-{i}',
+            content=f'Content, "quoted"\nline {i}',
+            status='published' if i % 2 else 'draft',
+            author=testcase.user
+        )
+        comment = Comment.objects.create(post=blog, user=testcase.user, comment=f'Comment {i}')
+        Comment.objects.create(post=blog, user=testcase.user, comment=f'Reply {i}', reply=comment)
+
+
+class ExportLinesTest(TestCase):
+    def setUp(self):
+        make_content(self)
+
+    def test_ndjson_rows_in_id_order(self):
+        with self.assertNumQueries(1):
+            text = ''.join(export_lines('posts', 'ndjson', chunk_size=2))
+        rows = [json.loads(line) for line in text.splitlines()]
+        self.assertEqual([row['slug'] for row in rows], [f'post-{i}' for i in range(5)])
+        self.assertEqual(rows[0]['author_username'], 'testuser')
+        self.assertEqual(rows[0]['content'], 'Content, "quoted"\nline 0')
+        self.assertEqual(rows[0]['comment_count'], 2)
+
+    def test_csv_has_header_and_quotes_content(self):
+        rows = list(csv.DictReader(io.StringIO(''.join(export_lines('comments', 'csv')))))
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[1]['comment'], 'Reply 0')
+        self.assertEqual(rows[1]['reply_id'], rows[0]['id'])
+
+    def test_output_is_buffered_by_size(self):
+        chunks = list(export_lines('comments', 'ndjson', chunk_size=3, buffer_size=300))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) < 600 for chunk in chunks))
+        self.assertEqual(''.join(chunks), ''.join(export_lines('comments', 'ndjson')))
+
+    def test_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'authors.csv')
+            call_command('export_blog_data', 'authors', format='csv', output=path, stderr=io.StringIO())
+            with open(path, encoding='utf-8') as output:
+                rows = list(csv.DictReader(output))
+        self.assertEqual([row['username'] for row in rows], ['testuser'])
+        self.assertNotIn('email', rows[0])
+
+
+class ExportViewTest(APITestCase):
+    def setUp(self):
+        make_content(self)
+        self.client = APIClient()
+        self.admin = CustomUser.objects.create_superuser(
+            email='admin@example.com',
+            username='admin',
+            password='adminpassword'
+        )
+
+    def test_streams_export_to_staff(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('export', kwargs={'kind': 'posts', 'fmt': 'ndjson'}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('posts.ndjson', response['Content-Disposition'])
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+
+    def test_requires_staff(self):
+        url = reverse('export', kwargs={'kind': 'posts', 'fmt': 'csv'})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_unknown_export(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('export', kwargs={'kind': 'passwords', 'fmt': 'csv'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
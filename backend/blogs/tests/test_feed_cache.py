@@ -0,0 +1,99 @@
+import json
+from unittest.mock import patch
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from blogs.feed_cache import bump_feed_version, cache_feed, feed_cache_stats
+from blogs.models import BlogPost
+from users.models import CustomUser
+
+
+class FeedCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        self.blog = BlogPost.objects.create(
+            title='Test Blog',
+            slug='test-blog',
+            content='Test content',
+            status='published',
+            author=self.user
+        )
+        self.url = reverse('blogs')
+
+    def test_repeat_request_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+    def test_hits_and_misses_are_counted(self):
+        before = feed_cache_stats()
+        for _ in range(3):
+            self.client.get(self.url)
+        after = feed_cache_stats()
+        self.assertEqual((after['hits'] - before['hits'], after['misses'] - before['misses']), (2, 1))
+
+        url = reverse('feed-cache-metrics')
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['feed_cache']), {'hits', 'misses', 'hit_rate'})
+
+    def test_page_overtaken_by_a_write_is_not_served(self):
+        def write_while_rendering(key, data):
+            bump_feed_version()
+            return cache_feed(key, data)
+
+        with patch('blogs.views.cache_feed', side_effect=write_while_rendering):
+            self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url, {'fields': 'id,title'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+
+    @patch('blogs.views.send_new_blog_notification_to_users.delay')
+    def test_create_invalidates_cached_pages(self, mock_delay):
+        self.client.get(self.url)
+        self.client.force_authenticate(user=self.user)
+        self.client.post(
+            reverse('create-blog'),
+            data=json.dumps({'title': 'Fresh Post', 'content': 'New', 'status': 'published'}),
+            content_type='application/json'
+        )
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('fresh-post', [blog['slug'] for blog in response.data['results']])
+
+    def test_update_and_delete_invalidate_cached_pages(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.url)
+        self.client.post(
+            reverse('update-blog'),
+            data=json.dumps({'id': self.blog.id, 'title': 'Renamed', 'content': 'Test content', 'status': 'published'}),
+            content_type='application/json'
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['title'], 'Renamed')
+
+        self.client.post(reverse('delete-blog'), data=json.dumps({'id': self.blog.id}), content_type='application/json')
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'], [])
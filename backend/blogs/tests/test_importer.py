@@ -0,0 +1,179 @@
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+from blogs.importer import FixtureImporter, iter_json_array
+from blogs.models import BlogPost, Comment
+from blogs.search import search_blogs
+from users.models import CustomUser
+
+
+class IterJsonArrayTest(TestCase):
+    def test_small_reads_and_resume_offsets(self):
+        objects = [{'model': 'blogs.comment', 'pk': i, 'fields': {'comment': f'héllo – {i}'}} for i in range(5)]
+        stream = io.BytesIO(json.dumps(objects, indent=2, ensure_ascii=False).encode('utf-8'))
+
+        parsed = list(iter_json_array(stream, read_size=7))
+        self.assertEqual([obj for obj, _ in parsed], objects)
+
+        # Every offset resumes right after the object it was yielded with
+        offset = parsed[1][1]
+        self.assertEqual([obj for obj, _ in iter_json_array(stream, offset, read_size=7)], objects[2:])
+
+
+class ImportBlogDataCommandTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        for i in range(4):
+            blog = BlogPost.objects.create(
+                title=f'Post {i}',
+                slug=f'post-{i}',
+                content=f'<p>Imported content {i}</p>',
+                status='published',
+                author=self.user
+            )
+            comment = Comment.objects.create(post=blog, user=self.user, comment=f'Comment {i}')
+            reply = Comment.objects.create(post=blog, user=self.user, comment=f'Reply {i}', reply=comment)
+            Comment.objects.create(post=blog, user=self.user, comment=f'Nested {i}', reply=reply)
+        # Back-dated to whole seconds, which dumpdata writes in full, so any stamped by the import show
+        past = (timezone.now() - timedelta(days=400)).replace(microsecond=0)
+        CustomUser.objects.update(date_joined=past, last_login=past)
+        BlogPost.objects.update(published_date=past, updated_at=past, comments_updated_at=past)
+        Comment.objects.update(created_at=past)
+
+    def dump(self, fmt):
+        path = os.path.join(self.directory.name, f'data.{fmt}')
+        call_command('dumpdata', 'users.customuser', 'blogs.blogpost', 'blogs.comment', format=fmt, output=path,
+                     stdout=io.StringIO())
+        self.expected = self.snapshot()
+        Comment.objects.all().delete()
+        BlogPost.objects.all().delete()
+        CustomUser.objects.all().delete()
+        return path
+
+    def snapshot(self):
+        return (
+            list(CustomUser.objects.order_by('id').values_list('id', 'email', 'password', 'date_joined', 'last_login')),
+            list(BlogPost.objects.order_by('id').values_list(
+                'id', 'slug', 'excerpt', 'word_count', 'comment_count', 'published_date', 'updated_at',
+                'comments_updated_at',
+            )),
+            list(Comment.objects.order_by('id').values_list('id', 'reply_id', 'path', 'depth', 'reply_count', 'created_at')),
+        )
+
+    def load(self, path, **options):
+        call_command('import_blog_data', path, stdout=io.StringIO(), stderr=io.StringIO(), **options)
+
+    def test_round_trip_in_both_formats(self):
+        for fmt in ('json', 'jsonl'):
+            with self.subTest(fmt=fmt):
+                path = self.dump(fmt)
+                self.load(path, batch_size=3)
+                self.assertEqual(self.snapshot(), self.expected)
+                self.assertFalse(os.path.exists(f'{path}.checkpoint'))
+
+        self.assertEqual(search_blogs('imported')[1](), 4)
+        # Sequences were moved past the imported keys
+        BlogPost.objects.create(title='New', slug='new', content='New', author_id=self.expected[0][0][0])
+
+    def test_paths_are_filled_for_the_batch_only(self):
+        path = self.dump('jsonl')
+        # A pathless row from elsewhere, a batch must not scan the table for those
+        blog = BlogPost.objects.create(title='Other', slug='other', content='Other')
+        other = Comment.objects.bulk_create([Comment(post=blog, comment='Bulk loaded')])[0]
+
+        self.load(path, batch_size=3)
+        self.assertEqual(Comment.objects.get(pk=other.pk).path, '')
+        self.assertFalse(Comment.objects.exclude(pk=other.pk).filter(path='').exists())
+
+    def test_forward_references_wait_for_their_target(self):
+        path = self.dump('jsonl')
+        with open(path, encoding='utf-8') as fixture:
+            lines = fixture.readlines()
+        with open(path, 'w', encoding='utf-8') as fixture:
+            fixture.writelines(reversed(lines))
+
+        self.load(path, batch_size=2)
+        self.assertEqual(self.snapshot(), self.expected)
+
+    def test_resumes_from_checkpoint(self):
+        path = self.dump('json')
+        original = FixtureImporter.import_batch
+        calls = []
+
+        def fail_third_batch(importer, objects):
+            calls.append(len(objects))
+            if len(calls) == 3:
+                raise RuntimeError('connection lost')
+            return original(importer, objects)
+
+        with patch.object(FixtureImporter, 'import_batch', fail_third_batch):
+            with self.assertRaises(RuntimeError):
+                self.load(path, batch_size=4)
+        with open(f'{path}.checkpoint', encoding='utf-8') as checkpoint:
+            self.assertEqual(json.load(checkpoint)['imported'], 8)
+        self.assertEqual(BlogPost.objects.count() + Comment.objects.count() + CustomUser.objects.count(), 8)
+
+        calls.clear()
+        with patch.object(FixtureImporter, 'import_batch', lambda importer, objects: calls.append(len(objects)) or original(importer, objects)):
+            self.load(path, batch_size=4)
+        self.assertEqual(sum(calls), 17 - 8)
+        self.assertEqual(self.snapshot(), self.expected)
+
+    def test_invalid_records(self):
+        path = self.dump('jsonl')
+        with open(path, 'a', encoding='utf-8') as fixture:
+            fixture.write(json.dumps({'model': 'blogs.blogpost', 'pk': 999, 'fields': {'status': 'bogus'}}) + '\n')
+
+        with self.assertRaises(CommandError):
+            self.load(path, batch_size=100)
+        self.assertEqual(BlogPost.objects.count(), 0)
+
+        self.load(path, batch_size=100, skip_invalid=True, restart=True)
+        self.assertEqual(self.snapshot(), self.expected)
+
+    def test_existing_rows_are_skipped_and_unique_clashes_are_invalid(self):
+        path = self.dump('jsonl')
+        self.load(path)
+        user_id, email = self.expected[0][0][:2]
+        post_id, slug = self.expected[1][0][:2]
+        with open(path, 'w', encoding='utf-8') as fixture:
+            for obj in (
+                {'model': 'users.customuser', 'pk': 900, 'fields': {'email': email, 'username': 'other', 'password': 'x'}},
+                {'model': 'blogs.blogpost', 'pk': 900, 'fields': {'title': 'Copy', 'slug': slug, 'content': 'Copy'}},
+                {'model': 'blogs.blogpost', 'pk': 901, 'fields': {'title': 'New', 'slug': 'new', 'content': 'New',
+                                                                   'author': user_id}},
+                {'model': 'blogs.comment', 'pk': 900, 'fields': {'comment': 'On the copy', 'post': 900}},
+            ):
+                fixture.write(json.dumps(obj) + '\n')
+
+        with self.assertRaises(CommandError):
+            self.load(path)
+        self.assertEqual(self.snapshot(), self.expected)
+
+        importer = FixtureImporter(skip_invalid=True)
+        with open(path, encoding='utf-8') as fixture:
+            importer.import_batch([json.loads(line) for line in fixture])
+        self.assertEqual(importer.imported, 1)
+        self.assertEqual(len(importer.invalid), 2)
+        self.assertIn(f'already used by pk {post_id}', importer.invalid[1])
+        # The comment on the rejected post waits for it instead of being dropped
+        self.assertEqual(len(importer.pending), 1)
+        self.assertEqual(BlogPost.objects.get(pk=901).slug, 'new')
+
+        # Replaying already imported records inserts nothing
+        importer = FixtureImporter()
+        importer.import_batch([{'model': 'blogs.blogpost', 'pk': 901, 'fields': {'title': 'New', 'slug': 'new', 'content': 'New'}}])
+        self.assertEqual(importer.imported, 0)
@@ -15,7 +15,7 @@ class BlogPostModelTest(TestCase):
         )
         
         # Create a test blog post
-        BlogPost.objects.create(
+        cls.blog = BlogPost.objects.create(
             title='Test Blog Post',
             slug='test-blog-post',
             subtitle='Test Subtitle',
@@ -25,7 +25,7 @@ class BlogPostModelTest(TestCase):
         )
 
     def test_blog_post_fields(self):
-        blog = BlogPost.objects.get(id=1)
+        blog = BlogPost.objects.get(id=self.blog.id)
         self.assertEqual(blog.title, 'Test Blog Post')
         self.assertEqual(blog.slug, 'test-blog-post')
         self.assertEqual(blog.subtitle, 'Test Subtitle')
@@ -34,9 +34,21 @@ class BlogPostModelTest(TestCase):
         self.assertEqual(blog.author.username, 'testuser')
 
     def test_blog_post_str_method(self):
-        blog = BlogPost.objects.get(id=1)
+        blog = BlogPost.objects.get(id=self.blog.id)
         self.assertEqual(str(blog), 'Test Blog Post')
 
+    def test_excerpt_and_word_count_computed_on_save(self):
+        blog = BlogPost.objects.get(id=self.blog.id)
+        self.assertEqual(blog.excerpt, 'This is test content for the blog post.')
+        self.assertEqual(blog.word_count, 8)
+
+        blog.content = '<p>' + 'word ' * 500 + '</p>'
+        blog.save(update_fields=['content'])
+        blog.refresh_from_db()
+        self.assertEqual(blog.word_count, 500)
+        self.assertLessEqual(len(blog.excerpt), 280)
+        self.assertNotIn('<p>', blog.excerpt)
+
 
 class CommentModelTest(TestCase):
     @classmethod
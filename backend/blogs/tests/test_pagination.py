@@ -9,6 +9,10 @@ from blogs.serializers import BlogPostSerializer
 from rest_framework.test import APIRequestFactory
 from rest_framework.request import Request
 from collections import OrderedDict
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 class CustomPaginationTestCase(APITestCase):
     def setUp(self):
@@ -131,4 +135,79 @@ class CustomPaginationTestCase(APITestCase):
         # Getting custom page size
         response = self.client.get(url + '?page_size=10')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data['results']), 10)
\ No newline at end of file
+        self.assertEqual(len(response.data['results']), 10)
+
+class BlogCursorPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+
+        # Half the posts share a timestamp so the id tie-breaker is exercised
+        shared_date = timezone.now()
+        for i in range(20):
+            BlogPost.objects.create(
+                title=f'Test Post {i}',
+                slug=f'test-post-{i}',
+                content=f'Content for test post {i}',
+                author=self.user,
+                status='published',
+                published_date=shared_date if i % 2 else shared_date - timedelta(minutes=i)
+            )
+
+        self.client = APIClient()
+        self.url = reverse('blogs')
+        self.expected = list(
+            BlogPost.objects.order_by('-published_date', '-id').values_list('id', flat=True)
+        )
+
+    def test_walks_every_post_once_in_order(self):
+        seen = []
+        response = self.client.get(self.url, {'pagination': 'cursor'})
+        self.assertIsNone(response.data['previous'])
+        self.assertNotIn('count', response.data)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(blog['id'] for blog in response.data['results'])
+            if response.data['next'] is None:
+                break
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get(self.url, {'pagination': 'cursor'})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+
+        self.assertEqual(
+            [blog['id'] for blog in back.data['results']],
+            [blog['id'] for blog in first.data['results']]
+        )
+        self.assertIsNone(back.data['previous'])
+
+    def test_deep_pages_do_not_count_or_offset(self):
+        first = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 2})
+        deep = first
+        for _ in range(5):
+            deep = self.client.get(deep.data['next'])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(deep.data['next'])
+        sql = ' '.join(q['sql'] for q in queries.captured_queries).upper()
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('OFFSET', sql)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['message'], 'Invalid cursor')
+
+    def test_user_blogs_cursor_mode(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('user-blogs'), {'pagination': 'cursor', 'page_size': 20})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([blog['id'] for blog in response.data['results']], self.expected)
+        self.assertIsNone(response.data['next'])
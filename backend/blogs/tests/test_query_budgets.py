@@ -0,0 +1,131 @@
+import json
+from unittest.mock import patch
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from backend.testing import QueryBudgetMixin
+from blogs.models import BlogPost, Comment
+from users.models import CustomUser
+
+
+@patch('blogs.views.send_comment_notification_email.delay')
+@patch('blogs.views.send_new_blog_notification_to_users.delay')
+class BlogQueryBudgetTest(QueryBudgetMixin, APITestCase):
+    budget_urlconf = 'blogs.urls'
+    # Authenticated requests include the JWT user lookup, comment writes
+    # include the counter and path updates and the savepoint around them
+    query_budgets = {
+        ('', 'get'): 2,
+        ('user/', 'get'): 3,
+        ('create/', 'post'): 3,
+        ('delete/', 'post'): 6,
+        ('update/', 'post'): 5,
+        ('search/', 'get'): 2,
+        ('replies/', 'get'): 2,
+        ('export/<slug:kind>.<slug:fmt>', 'get'): 2,
+        ('<slug>/', 'get'): 1,
+        ('comment/<int:blog_id>/', 'get'): 3,
+        ('comment/<int:blog_id>/', 'post'): 8,
+        ('reply/<int:comment_id>/', 'get'): 2,
+        ('reply/<int:comment_id>/', 'post'): 10,
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        # Enough rows that a per-row query would blow every budget
+        for i in range(8):
+            blog = BlogPost.objects.create(
+                title=f'Test Post {i}',
+                slug=f'test-post-{i}',
+                content=f'Content for test post {i}',
+                author=self.user,
+                status='published'
+            )
+            for j in range(3):
+                comment = Comment.objects.create(post=blog, user=self.user, comment=f'Comment {j}')
+                Comment.objects.create(post=blog, user=self.user, comment=f'Reply {j}', reply=comment)
+        self.blog = blog
+        self.comment = comment
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+
+    def post_json(self, route, url, payload):
+        return self.assertQueryBudget(
+            route, 'post', url, data=json.dumps(payload), content_type='application/json', **self.auth
+        )
+
+    def test_every_route_has_a_budget(self, *mocks):
+        self.assertRoutesBudgeted()
+
+    def test_read_endpoints(self, *mocks):
+        self.assertQueryBudget('', 'get', reverse('blogs'))
+        self.assertQueryBudget('user/', 'get', reverse('user-blogs'), **self.auth)
+        self.assertQueryBudget('search/', 'get', reverse('search-blogs'), data={'q': 'content'})
+        self.assertQueryBudget('<slug>/', 'get', reverse('single-blog', kwargs={'slug': self.blog.slug}))
+        self.assertQueryBudget('comment/<int:blog_id>/', 'get', reverse('comment', kwargs={'blog_id': self.blog.id}))
+        self.assertQueryBudget('reply/<int:comment_id>/', 'get', reverse('reply', kwargs={'comment_id': self.comment.id}))
+        ids = ','.join(str(pk) for pk in Comment.objects.filter(reply__isnull=True).values_list('id', flat=True))
+        self.assertQueryBudget('replies/', 'get', reverse('batch-replies'), data={'ids': ids}, **self.auth)
+
+        # Saved rather than update()d, which would leave the cached user as it was
+        self.user.is_staff = True
+        self.user.save(update_fields=['is_staff'])
+        for kind in ('posts', 'comments', 'authors'):
+            url = reverse('export', kwargs={'kind': kind, 'fmt': 'ndjson'})
+            response = self.assertQueryBudget('export/<slug:kind>.<slug:fmt>', 'get', url, **self.auth)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_write_endpoints(self, *mocks):
+        response = self.post_json('create/', reverse('create-blog'), {'title': 'Budget Post', 'content': 'Text', 'status': 'published'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.post_json('update/', reverse('update-blog'), {'id': self.blog.id, 'title': 'Renamed', 'content': 'Text', 'status': 'published'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.post_json('comment/<int:blog_id>/', reverse('comment', kwargs={'blog_id': self.blog.id}), {'comment': 'Hi'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.post_json('reply/<int:comment_id>/', reverse('reply', kwargs={'comment_id': self.comment.id}), {'comment': 'Hi'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.post_json('delete/', reverse('delete-blog'), {'id': self.blog.id})
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class QueryStatsMiddlewareTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = CustomUser.objects.create_user(
+            email='staff@example.com',
+            username='staff',
+            password='testpassword',
+            is_staff=True
+        )
+
+    def test_headers_hidden_from_regular_requests(self):
+        response = self.client.get(reverse('blogs'))
+        self.assertNotIn('X-DB-Query-Count', response)
+
+    def test_headers_shown_to_staff(self):
+        token = RefreshToken.for_user(self.staff).access_token
+        response = self.client.get(reverse('user-blogs'), HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response['X-DB-Query-Count'], str(response.wsgi_request.query_stats.count))
+        self.assertIn('X-DB-Time-Ms', response)
+
+    def test_headers_shown_to_staff_on_async_views(self):
+        token = RefreshToken.for_user(self.staff).access_token
+        with override_settings(ROOT_URLCONF='backend.asgi_urls'):
+            response = async_to_sync(self.async_client.get)(reverse('blogs'), headers={'Authorization': f'Bearer {token}'})
+            self.assertTrue(iscoroutinefunction(response.resolver_match.func))
+        self.assertEqual(response['X-DB-Query-Count'], str(response.asgi_request.query_stats.count))
+        self.assertIn('X-DB-Time-Ms', response)
+
+    def test_headers_hidden_from_bad_tokens(self):
+        with override_settings(ROOT_URLCONF='backend.asgi_urls'):
+            response = async_to_sync(self.async_client.get)(reverse('blogs'), headers={'Authorization': 'Bearer nonsense'})
+        self.assertNotIn('X-DB-Query-Count', response)
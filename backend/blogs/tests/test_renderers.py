@@ -0,0 +1,82 @@
+import datetime
+import pickle
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from blogs.feed_cache import cache_feed, feed_cache_key, get_cached_feed
+from blogs.renderers import BlogPostJSONRenderer, JSONFragment
+
+
+class BlogPostJSONRendererTest(SimpleTestCase):
+    data = {
+        'title': 'Café \u2028line\u2029 "quoted" </script>',
+        'published_date': datetime.datetime(2025, 4, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        'day': datetime.date(2025, 4, 1),
+        'offset': datetime.datetime(2025, 4, 1, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        'price': Decimal('12.50'),
+        'label': gettext_lazy('Published'),
+        'author': {'id': 1, 'username': 'testuser', 'email': None},
+        'tags': ('a', 'b'),
+        'rank': 0.25,
+        'published': True,
+    }
+
+    def test_output_matches_drf_with_either_encoder(self):
+        expected = JSONRenderer().render(self.data)
+        for encoder in ('orjson', 'json'):
+            with self.subTest(encoder=encoder), override_settings(JSON_RENDERER_ENCODER=encoder):
+                self.assertEqual(BlogPostJSONRenderer().render(self.data), expected)
+
+    def test_what_orjson_cannot_encode_goes_to_the_json_module(self):
+        data = {1: 'integer key', 'big': 2 ** 70}
+        self.assertEqual(BlogPostJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_non_finite_floats_match_drf(self):
+        data = {'rank': float('nan'), 'scores': [1.5, float('inf')], 'none': None}
+        for encoder in ('orjson', 'json'):
+            with self.subTest(encoder=encoder), override_settings(JSON_RENDERER_ENCODER=encoder):
+                renderer, drf = BlogPostJSONRenderer(), JSONRenderer()
+                with self.assertRaises(ValueError):
+                    renderer.render(data)
+                # Without STRICT_JSON both write NaN and Infinity
+                renderer.strict = drf.strict = False
+                self.assertEqual(renderer.render(data), drf.render(data))
+
+    def test_indented_output_matches_drf(self):
+        media_type = 'application/json; indent=4'
+        self.assertEqual(BlogPostJSONRenderer().render(self.data, media_type), JSONRenderer().render(self.data, media_type))
+
+    def test_fragments_are_spliced_in_as_they_are(self):
+        renderer = BlogPostJSONRenderer()
+        posts = [{'id': 1, 'title': 'First'}, {'id': 2, 'title': 'Ünïcode \u2028'}]
+        page = {'count': 2, 'results': posts}
+        spliced = {'count': 2, 'results': [JSONFragment(renderer.render(post)) for post in posts]}
+        for encoder in ('orjson', 'json'):
+            with self.subTest(encoder=encoder), override_settings(JSON_RENDERER_ENCODER=encoder):
+                self.assertEqual(renderer.render(spliced), JSONRenderer().render(page))
+        self.assertEqual(renderer.render(JSONFragment(b'{"count":2}')), b'{"count":2}')
+
+    def test_fragment_reads_like_its_value(self):
+        fragment = JSONFragment(b'{"results":[{"slug":"a"}]}')
+        self.assertEqual(fragment['results'][0]['slug'], 'a')
+        self.assertEqual(fragment, {'results': [{'slug': 'a'}]})
+        self.assertEqual(list(fragment), ['results'])
+        fragment = pickle.loads(pickle.dumps(fragment))
+        self.assertEqual(fragment.encoded, b'{"results":[{"slug":"a"}]}')
+        self.assertNotIn('decoded', fragment.__dict__)
+
+
+class FeedCacheEncodingTest(SimpleTestCase):
+    def test_pages_are_cached_encoded(self):
+        cache.clear()
+        request = APIRequestFactory().get('/blogs/')
+        page = cache_feed(feed_cache_key(request), {'count': 1, 'results': [{'title': 'Café'}]})
+        self.assertEqual(page.encoded, '{"count":1,"results":[{"title":"Café"}]}'.encode())
+
+        cached = get_cached_feed(feed_cache_key(request))
+        self.assertIsInstance(cached, JSONFragment)
+        self.assertEqual(cached.encoded, page.encoded)
+        self.assertEqual(BlogPostJSONRenderer().render(cached), page.encoded)
@@ -0,0 +1,149 @@
+import json
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from backend.db_router import RECENT_WRITE_KEY, REPLICA, ReplicaRouter, replica_reads
+from backend.testing import ReplicaDatabaseMixin
+from blogs.models import BlogPost, Comment
+from users.models import CustomUser
+
+
+class ReplicaRouterTest(SimpleTestCase):
+    def test_without_a_replica_everything_uses_the_default_database(self):
+        router = ReplicaRouter()
+        with replica_reads():
+            self.assertIsNone(router.db_for_read(BlogPost))
+        self.assertEqual(router.db_for_write(BlogPost), 'default')
+
+    def test_migrations_skip_the_replica(self):
+        router = ReplicaRouter()
+        self.assertTrue(router.allow_migrate('default', 'blogs'))
+        self.assertFalse(router.allow_migrate(REPLICA, 'blogs'))
+
+
+@patch('blogs.views.send_comment_notification_email.delay')
+@patch('blogs.views.send_new_blog_notification_to_users.delay')
+class ReplicaReadsTest(ReplicaDatabaseMixin, TransactionTestCase):
+    replicated_models = (CustomUser, BlogPost, Comment)
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        self.blog = BlogPost.objects.create(
+            title='Test Blog',
+            slug='test-blog',
+            content='Test content',
+            status='published',
+            author=self.user
+        )
+        super().setUp()
+        self.client = APIClient()
+        self.anonymous = APIClient()
+
+    def comments(self, client):
+        response = client.get(reverse('comment', args=[self.blog.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [comment['comment'] for comment in response.data]
+
+    def test_get_views_read_from_the_replica(self, *mocks):
+        BlogPost.objects.filter(pk=self.blog.pk).update(title='Changed on the primary')
+
+        response = self.anonymous.get(reverse('single-blog', args=[self.blog.slug]))
+        self.assertEqual(response.data['title'], 'Test Blog')
+
+        self.replicate()
+        response = self.anonymous.get(reverse('single-blog', args=[self.blog.slug]))
+        self.assertEqual(response.data['title'], 'Changed on the primary')
+
+    def test_writer_reads_their_own_comment(self, *mocks):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse('comment', args=[self.blog.id]),
+            data=json.dumps({'comment': 'Fresh comment'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Comment.objects.using('default').count(), 1)
+
+        self.assertEqual(self.comments(self.client), ['Fresh comment'])
+        # Everyone else reads the replica, which hasn't caught up
+        self.assertEqual(self.comments(self.anonymous), [])
+
+        # Once the pin expires the writer is back on the replica
+        cache.clear()
+        self.assertEqual(self.comments(self.client), [])
+
+    def test_feed_pages_from_a_lagging_replica_are_not_cached(self, *mocks):
+        self.anonymous.get(reverse('blogs'))
+        self.client.force_authenticate(user=self.user)
+        self.client.post(
+            reverse('create-blog'),
+            data=json.dumps({'title': 'Fresh Post', 'content': 'New', 'status': 'published'}),
+            content_type='application/json'
+        )
+
+        for _ in range(2):
+            response = self.anonymous.get(reverse('blogs'))
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertNotIn('fresh-post', [blog['slug'] for blog in response.data['results']])
+
+        # The author skips the cache and reads the primary, the page they get is cached for everyone
+        response = self.client.get(reverse('blogs'))
+        self.assertIn('fresh-post', [blog['slug'] for blog in response.data['results']])
+        response = self.anonymous.get(reverse('blogs'))
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertIn('fresh-post', [blog['slug'] for blog in response.data['results']])
+
+    def test_writes_outside_the_api_stop_caching_replica_pages(self, *mocks):
+        cache.clear()
+        self.anonymous.get(reverse('blogs'))
+        self.assertEqual(self.anonymous.get(reverse('blogs'))['X-Cache'], 'HIT')
+
+        # As from the admin, a Celery task or the shell
+        BlogPost.objects.create(title='Fresh Post', slug='fresh-post', content='New', status='published', author=self.user)
+        for _ in range(2):
+            response = self.anonymous.get(reverse('blogs'))
+            self.assertEqual(response['X-Cache'], 'MISS')
+
+        # Once the replica is past the lag window pages are cached again
+        self.replicate()
+        cache.delete(RECENT_WRITE_KEY)
+        self.anonymous.get(reverse('blogs'))
+        response = self.anonymous.get(reverse('blogs'))
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertIn('fresh-post', [blog['slug'] for blog in response.data['results']])
+
+    def test_new_user_authenticates_against_the_primary(self, *mocks):
+        newcomer = CustomUser.objects.create_user(email='new@example.com', username='newcomer', password='password')
+        BlogPost.objects.create(title='Newcomer Post', slug='newcomer-post', content='Content', author=newcomer)
+        token = RefreshToken.for_user(newcomer).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        response = self.client.get(reverse('user-blogs'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The user lookup found them, their posts are still on their way to the replica
+        self.assertEqual(response.data['results'], [])
+
+    def test_async_reads_follow_the_same_routing(self, *mocks):
+        self.client.force_authenticate(user=self.user)
+        self.client.post(
+            reverse('comment', args=[self.blog.id]),
+            data=json.dumps({'comment': 'Fresh comment'}),
+            content_type='application/json'
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        url = reverse('comment', args=[self.blog.id])
+        with override_settings(ROOT_URLCONF='backend.asgi_urls'):
+            pinned = async_to_sync(self.async_client.get)(url, headers={'Authorization': f'Bearer {token}'})
+            anonymous = async_to_sync(self.async_client.get)(url)
+        self.assertEqual([comment['comment'] for comment in pinned.json()], ['Fresh comment'])
+        self.assertEqual(anonymous.json(), [])
@@ -0,0 +1,121 @@
+from unittest import skipUnless
+from unittest.mock import patch
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from blogs.models import BlogPost
+from blogs.search import SQLITE_TRIGGERS, ensure_sqlite_search_index
+from users.models import CustomUser
+
+
+class SearchBlogsViewTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        BlogPost.objects.create(
+            title='Brewing coffee at home',
+            slug='brewing-coffee',
+            content='A guide to pour over coffee, grind size and water temperature.',
+            status='published',
+            author=self.user
+        )
+        BlogPost.objects.create(
+            title='Travel notes',
+            slug='travel-notes',
+            content='We stopped for coffee once on the way to the mountains.',
+            status='published',
+            author=self.user
+        )
+        BlogPost.objects.create(
+            title='Coffee drafts',
+            slug='coffee-drafts',
+            content='Unpublished coffee thoughts.',
+            author=self.user
+        )
+        self.url = reverse('search-blogs')
+
+    def test_ranked_published_matches(self):
+        response = self.client.get(self.url, {'q': 'coffee'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        slugs = [blog['slug'] for blog in response.data['results']]
+        # The title match ranks above a passing mention in the body
+        self.assertEqual(slugs, ['brewing-coffee', 'travel-notes'])
+        self.assertIn('<mark>', response.data['results'][1]['snippet'])
+        self.assertNotIn('content', response.data['results'][0])
+
+    def test_index_follows_updates_and_deletes(self):
+        blog = BlogPost.objects.get(slug='travel-notes')
+        blog.content = 'Mountains and tea.'
+        blog.save()
+        BlogPost.objects.get(slug='brewing-coffee').delete()
+
+        response = self.client.get(self.url, {'q': 'coffee'})
+        self.assertEqual(response.data['count'], 0)
+        response = self.client.get(self.url, {'q': 'tea'})
+        self.assertEqual(response.data['results'][0]['slug'], 'travel-notes')
+
+    def test_query_syntax_is_not_interpreted(self):
+        response = self.client.get(self.url, {'q': 'coffee" OR (grind'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_total_is_capped(self):
+        response = self.client.get(self.url, {'q': 'coffee'})
+        self.assertFalse(response.data['count_capped'])
+
+        with patch('blogs.search.MAX_COUNTED_RESULTS', 1):
+            response = self.client.get(self.url, {'q': 'coffee', 'page_size': 1})
+            # The page saw a second match, the capped total is raised to that
+            self.assertEqual(response.data['count'], 2)
+            self.assertTrue(response.data['count_capped'])
+            self.assertEqual(len(self.client.get(self.url, {'q': 'coffee', 'page': 2, 'page_size': 1}).data['results']), 1)
+
+            # The last page counts its own rows, its total is exact
+            response = self.client.get(self.url, {'q': 'coffee'})
+        self.assertEqual(response.data['count'], 2)
+        self.assertFalse(response.data['count_capped'])
+
+    def test_databases_without_full_text_search_match_substrings(self):
+        with patch('blogs.search.BACKENDS', {}):
+            response = self.client.get(self.url, {'q': 'COFFEE grind'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([blog['slug'] for blog in response.data['results']], ['brewing-coffee'])
+        self.assertEqual(response.data['results'][0]['rank'], 0.0)
+
+    def test_missing_query(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'FTS5 triggers only exist on SQLite')
+class SQLiteSearchIndexTest(APITestCase):
+    def trigger_sql(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE name = %s", [name])
+            row = cursor.fetchone()
+        return row and row[0]
+
+    def test_outdated_and_missing_triggers_are_replaced(self):
+        user = CustomUser.objects.create_user(email='testuser@example.com', username='testuser', password='x')
+        BlogPost.objects.create(title='Coffee', slug='coffee', content='Coffee', status='published', author=user)
+        with connection.cursor() as cursor:
+            # The update trigger as migration 0006 wrote it, and an insert trigger lost to a table rebuild
+            cursor.execute('DROP TRIGGER blogs_blogpost_fts_update')
+            cursor.execute(
+                "CREATE TRIGGER blogs_blogpost_fts_update AFTER UPDATE ON blogs_blogpost BEGIN SELECT 1; END"
+            )
+            cursor.execute('DROP TRIGGER blogs_blogpost_fts_insert')
+            cursor.execute("INSERT INTO blogs_blogpost_fts(blogs_blogpost_fts) VALUES ('delete-all')")
+
+        ensure_sqlite_search_index()
+        for name, sql in SQLITE_TRIGGERS.items():
+            self.assertEqual(' '.join(self.trigger_sql(name).split()), ' '.join(sql.split()))
+        # The index was rebuilt since a trigger had been missing
+        response = self.client.get(reverse('search-blogs'), {'q': 'coffee'})
+        self.assertEqual(response.data['count'], 1)
@@ -0,0 +1,65 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from blogs.models import BlogPost, Comment
+from users.models import CustomUser
+
+
+class SeedBlogDataCommandTest(TestCase):
+    def seed(self, **options):
+        call_command('seed_blog_data', users=20, posts=60, batch_size=25, stdout=StringIO(), **options)
+
+    def snapshot(self):
+        return (
+            list(BlogPost.objects.order_by('slug').values_list(
+                'slug', 'title', 'word_count', 'status', 'published_date', 'updated_at', 'comments_updated_at',
+            )),
+            list(CustomUser.objects.order_by('username').values_list('username', 'date_joined', 'last_login')),
+            list(Comment.objects.filter(reply__isnull=True).order_by('post__slug', 'created_at', 'comment')
+                 .values_list('post__slug', 'created_at', 'comment')),
+            list(Comment.objects.filter(reply__isnull=False).order_by('post__slug', 'created_at', 'comment')
+                 .values_list('post__slug', 'created_at', 'comment')),
+        )
+
+    def test_creates_requested_rows(self):
+        self.seed()
+
+        self.assertEqual(CustomUser.objects.count(), 20)
+        self.assertEqual(BlogPost.objects.count(), 60)
+        self.assertTrue(BlogPost.objects.filter(status='published').exists())
+        self.assertTrue(all(blog.excerpt for blog in BlogPost.objects.all()))
+        self.assertTrue(CustomUser.objects.first().check_password('seedpassword'))
+
+    def test_same_seed_gives_same_dataset(self):
+        self.seed(seed=7)
+        first = self.snapshot()
+        Comment.objects.all().delete()
+        BlogPost.objects.all().delete()
+        CustomUser.objects.all().delete()
+
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(days=3)):
+            self.seed(seed=7)
+        self.assertEqual(self.snapshot(), first)
+
+    def test_prefix_allows_seeding_twice(self):
+        self.seed()
+        self.seed(prefix='more')
+        self.assertEqual(BlogPost.objects.count(), 120)
+
+    def test_counters_match_the_seeded_threads(self):
+        self.seed()
+        for post in BlogPost.objects.all():
+            self.assertEqual(post.comment_count, post.comments.count())
+        for comment in Comment.objects.filter(reply__isnull=True):
+            self.assertEqual(comment.reply_count, comment.replies.count())
+
+    def test_dates_are_ordered(self):
+        self.seed()
+        for post in BlogPost.objects.all():
+            newest = max((comment.created_at for comment in post.comments.all()), default=post.published_date)
+            self.assertEqual(post.comments_updated_at, newest)
+        for reply in Comment.objects.filter(reply__isnull=False).select_related('reply'):
+            self.assertGreaterEqual(reply.created_at, reply.reply.created_at)
@@ -47,7 +47,7 @@ class BlogPostSerializerTest(TestCase):
         serializer = BlogPostSerializer(self.blog_post)
         self.assertEqual(set(serializer.data.keys()), 
                         {'id', 'title', 'slug', 'subtitle', 'content', 
-                         'published_date', 'status', 'author'})
+                         'published_date', 'status', 'author', 'comment_count'})
         self.assertEqual(serializer.data['title'], 'Test Blog Post')
         self.assertEqual(serializer.data['slug'], 'test-blog-post')
         self.assertEqual(serializer.data['subtitle'], 'Test Subtitle')
@@ -103,7 +103,7 @@ class CommentSerializerTest(TestCase):
     def test_comment_serializer(self):
         serializer = CommentSerializer(self.parent_comment)
         self.assertEqual(set(serializer.data.keys()), 
-                        {'id', 'comment', 'created_at', 'post', 'user', 'reply', 'replies'})
+                        {'id', 'comment', 'created_at', 'post', 'user', 'reply', 'reply_count', 'depth', 'replies', 'replies_next'})
         self.assertEqual(serializer.data['comment'], 'This is a parent comment')
         self.assertEqual(serializer.data['post'], self.blog_post.id)
         self.assertEqual(serializer.data['user']['username'], 'testuser')
@@ -114,7 +114,7 @@ class CommentSerializerTest(TestCase):
     def test_reply_serializer(self):
         serializer = ReplySerializer(self.reply_comment)
         self.assertEqual(set(serializer.data.keys()), 
-                        {'id', 'comment', 'created_at', 'post', 'user', 'reply'})
+                        {'id', 'comment', 'created_at', 'post', 'user', 'reply', 'reply_count', 'depth'})
         self.assertEqual(serializer.data['comment'], 'This is a reply comment')
         self.assertEqual(serializer.data['post'], self.blog_post.id)
         self.assertEqual(serializer.data['user']['username'], 'testuser2')
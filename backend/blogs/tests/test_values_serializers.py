@@ -0,0 +1,102 @@
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from blogs.comment_tree import TREE_FIELDS, load_replies_by_parent, load_reply_previews
+from blogs.models import BlogPost, Comment
+from blogs.renderers import BlogPostJSONRenderer
+from blogs.serializers import BlogPostListSerializer, CommentSerializer, ReplySerializer, narrow_queryset, requested_fields
+from blogs.values_serializers import BlogPostListValuesSerializer, CommentValuesSerializer, ReplyValuesSerializer
+from users.models import CustomUser
+
+
+class ValuesSerializerTest(TestCase):
+    """The values() serializers render byte for byte what the DRF serializers do."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        for i in range(3):
+            cls.blog = BlogPost.objects.create(
+                title=f'Test Post {i}',
+                slug=f'test-post-{i}',
+                subtitle='Subtitle' if i else '',
+                content=f'<p>Content for "test" post {i} é</p>',
+                author=cls.user if i else None,
+                status='published' if i else 'draft'
+            )
+        cls.thread = Comment.objects.create(post=cls.blog, user=cls.user, comment='Thread')
+        Comment.objects.create(post=cls.blog, user=None, comment='Quiet')
+        parent = cls.thread
+        for i in range(5):
+            parent = Comment.objects.create(post=cls.blog, user=cls.user if i % 2 else None, comment=f'Reply {i}', reply=parent)
+
+    def request(self, query=''):
+        return Request(APIRequestFactory().get(f'/blogs/?{query}'))
+
+    def assertSameJSON(self, expected, actual):
+        renderer = BlogPostJSONRenderer()
+        self.assertEqual(renderer.render(actual.data), renderer.render(expected.data))
+
+    def test_feed(self):
+        blogs = BlogPost.objects.order_by('-published_date')
+        for query in ('', 'fields=id,title', 'fields=author,published_date', 'fields=unknown'):
+            request = self.request(query)
+            fields = requested_fields(request)
+            expected = BlogPostListSerializer(
+                narrow_queryset(blogs, BlogPostListSerializer, fields), many=True, context={'request': request}
+            )
+            actual = BlogPostListValuesSerializer(
+                BlogPostListValuesSerializer.values(blogs, fields), many=True, context={'request': request}
+            )
+            with self.subTest(query=query):
+                self.assertSameJSON(expected, actual)
+
+    def test_comment_previews(self):
+        top_level = Comment.objects.filter(post=self.blog, reply__isnull=True).order_by('-created_at')
+        for query in ('', 'fields=id,user,replies,replies_next'):
+            request = self.request(query)
+            fields = requested_fields(request)
+            tree = load_reply_previews(list(narrow_queryset(top_level, CommentSerializer, fields, required=TREE_FIELDS)), 2, fields)
+            rows = list(CommentValuesSerializer.values(top_level, fields, required=(*TREE_FIELDS, 'reply_count')))
+            values_tree = load_reply_previews(rows, 2, fields, as_values=True)
+
+            expected = CommentSerializer(tree.top_level, many=True, context={'request': request, 'comment_tree': tree})
+            actual = CommentValuesSerializer(values_tree.top_level, many=True, context={'request': request, 'comment_tree': values_tree})
+            with self.subTest(query=query):
+                self.assertSameJSON(expected, actual)
+                self.assertIsNotNone(actual.data[-1]['replies_next'])
+
+    def test_comments_without_a_tree_load_their_replies(self):
+        request = self.request()
+        comments = Comment.objects.filter(post=self.blog).order_by('path')
+        expected = CommentSerializer(comments, many=True, context={'request': request})
+        actual = CommentValuesSerializer(CommentValuesSerializer.values(comments), many=True, context={'request': request})
+        self.assertSameJSON(expected, actual)
+
+    def test_batch_replies(self):
+        ids = list(Comment.objects.values_list('id', flat=True))
+        expected = load_replies_by_parent(ids, 2)
+        actual = load_replies_by_parent(ids, 2, as_values=True)
+        for parent_id in ids:
+            with self.subTest(parent_id=parent_id):
+                self.assertSameJSON(
+                    ReplySerializer(expected[parent_id], many=True), ReplyValuesSerializer(actual[parent_id], many=True)
+                )
+
+    def test_single_row(self):
+        row = BlogPostListValuesSerializer.values(BlogPost.objects.filter(pk=self.blog.pk)).get()
+        self.assertEqual(BlogPostListValuesSerializer(row).data, BlogPostListSerializer(self.blog).data)
+
+    def test_datetimes_follow_the_current_timezone(self):
+        blogs = BlogPost.objects.order_by('id')
+        for zone in ('UTC', 'Europe/Paris', 'America/St_Johns'):
+            with self.subTest(zone=zone), timezone.override(zone):
+                self.assertSameJSON(
+                    BlogPostListSerializer(blogs, many=True),
+                    BlogPostListValuesSerializer(BlogPostListValuesSerializer.values(blogs), many=True)
+                )
@@ -1,12 +1,14 @@
 from django.test import TestCase
-from django.urls import reverse
+from django.urls import get_resolver, reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
-from blogs.models import BlogPost, Comment
+from blogs.models import RESERVED_SLUGS, BlogPost, Comment
 from users.models import CustomUser
 from blogs.serializers import BlogPostSerializer
 import json
 from django.utils.text import slugify
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 
 class GetAllBlogsViewTest(APITestCase):
@@ -59,6 +61,16 @@ class GetAllBlogsViewTest(APITestCase):
         self.assertIn('test-blog-2', slugs)
         self.assertNotIn('draft-blog', slugs)
 
+    def test_feed_uses_summary_without_content(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        blog = response.data['results'][0]
+        self.assertNotIn('content', blog)
+        self.assertEqual(blog['word_count'], 3)
+        self.assertTrue(blog['excerpt'].startswith('Test content'))
+        self.assertFalse(any('"content"' in q['sql'] for q in queries.captured_queries))
+
 
 class GetUserBlogsViewTest(APITestCase):
     def setUp(self):
@@ -154,6 +166,20 @@ class CreateBlogViewTest(APITestCase):
         self.assertEqual(blog.slug, 'new-test-blog')
         self.assertEqual(blog.author, self.user)
 
+    def test_slug_never_shadowed_by_a_route(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            self.url, data=json.dumps({**self.valid_payload, 'title': 'Search'}), content_type='application/json'
+        )
+        self.assertEqual(response.data['slug'], 'search-post')
+
+        response = self.client.get(reverse('single-blog', kwargs={'slug': 'search-post'}))
+        self.assertEqual(response.data['title'], 'Search')
+
+        # Every fixed single-segment route is reserved
+        fixed = {str(pattern.pattern).strip('/') for pattern in get_resolver('blogs.urls').url_patterns}
+        self.assertEqual({path for path in fixed if path and '/' not in path and '<' not in path}, RESERVED_SLUGS)
+
     def test_create_blog_without_title(self):
         self.client.force_authenticate(user=self.user)
         
@@ -499,6 +525,60 @@ class ReplyViewTest(APITestCase):
         self.assertEqual(Comment.objects.count(), 3)  # No new reply added
 
 
+class SparseFieldsViewTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+        self.blog = BlogPost.objects.create(
+            title="Test Blog",
+            slug="test-blog",
+            content="Test content",
+            status="published",
+            author=self.user
+        )
+        self.comment = Comment.objects.create(post=self.blog, user=self.user, comment="Parent")
+        Comment.objects.create(post=self.blog, user=self.user, comment="Reply", reply=self.comment)
+
+    def test_feed_fields_trim_output_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('blogs'), {'fields': 'id,title,slug,published_date'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'slug', 'published_date'})
+        sql = ' '.join(q['sql'] for q in queries.captured_queries)
+        self.assertNotIn('excerpt', sql)
+        self.assertNotIn('users_customuser', sql)
+
+    def test_single_blog_fields(self):
+        url = reverse('single-blog', kwargs={'slug': 'test-blog'})
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'fields': 'title,author'})
+        self.assertEqual(set(response.data), {'title', 'author'})
+        self.assertEqual(response.data['author']['username'], 'testuser')
+
+    def test_comment_fields_apply_to_replies(self):
+        url = reverse('comment', kwargs={'blog_id': self.blog.id})
+        response = self.client.get(url, {'fields': 'id,comment,replies'})
+
+        self.assertEqual(set(response.data[0]), {'id', 'comment', 'replies'})
+        self.assertEqual(set(response.data[0]['replies'][0]), {'id', 'comment'})
+
+    def test_unknown_fields_are_ignored(self):
+        # Every field, read by the same query as without ?fields=, a single page needs no count
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('blogs'), {'fields': 'nope'})
+        self.assertIn('excerpt', response.data['results'][0])
+
+        url = reverse('single-blog', kwargs={'slug': 'test-blog'})
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'fields': 'nope'})
+        self.assertEqual(response.data, self.client.get(url).data)
+
+
 class ContactFormViewTest(APITestCase):
     def setUp(self):
         self.client = APIClient()
@@ -0,0 +1,28 @@
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from backend.warmup import warm_up_app, warm_up_connections
+from blogs.counts import count_cache_key, published_count_key
+from blogs.models import BlogPost
+from users.models import CustomUser
+
+
+class WarmUpAppTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        user = CustomUser.objects.create_user(email='author@example.com', username='author', password='password')
+        # More than a page, so the feed needs its total
+        for i in range(7):
+            BlogPost.objects.create(title=f'Post {i}', slug=f'post-{i}', content='Content', author=user, status='published')
+
+    def test_runs_the_feed_and_fills_its_caches(self):
+        timings = warm_up_app()
+
+        self.assertEqual(set(timings), {'urls', 'models', 'requests'})
+        self.assertEqual(cache.get(count_cache_key(published_count_key())), 7)
+
+
+class WarmUpConnectionsTest(TestCase):
+    def test_checks_every_connection(self):
+        with self.assertNumQueries(1):
+            timings = warm_up_connections()
+        self.assertEqual(list(timings), ['db:default'])
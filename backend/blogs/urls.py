@@ -7,6 +7,9 @@ urlpatterns = [
     path('create/', CreateBlogView.as_view(), name='create-blog'),
     path('delete/', DeleteBlogView.as_view(), name='delete-blog'),
     path('update/', UpdateBlogView.as_view(), name='update-blog'),
+    path('search/', SearchBlogsView.as_view(), name='search-blogs'),
+    path('replies/', BatchReplyView.as_view(), name='batch-replies'),
+    path('export/<slug:kind>.<slug:fmt>', ExportView.as_view(), name='export'),
     path('<slug>/', GetOneBlogView.as_view(), name='single-blog'),
     path('comment/<int:blog_id>/', CommentView.as_view(), name='comment'),
     path('reply/<int:comment_id>/', ReplyView.as_view(), name='reply'),
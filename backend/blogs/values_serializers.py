@@ -0,0 +1,199 @@
+"""
+Serializers for the hot list endpoints that read ``values_list()`` rows
+instead of model instances.
+
+Each one mirrors a DRF serializer from blogs.serializers and outputs exactly
+what it does, ``?fields=`` included, so the rendered JSON is byte for byte
+the same. The plan (which column feeds which key, and the few fields that
+need a conversion, like datetimes) is worked out once per serializer and
+requested fields. Serializing a row is then one dict built from a named
+tuple with the author joined in, without a model instance or the per-field
+DRF machinery.
+"""
+from functools import lru_cache
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .models import Comment, subtree_filter
+from .serializers import (
+    BlogPostListSerializer, CommentSerializer, ReplySerializer, replies_next_link, requested_fields, trim_fields,
+)
+
+# Fields whose to_representation() hands back database values unchanged
+PASSTHROUGH = {
+    serializers.CharField.to_representation,
+    serializers.IntegerField.to_representation,
+    serializers.BooleanField.to_representation,
+    serializers.ChoiceField.to_representation,
+}
+
+
+def converted(get, convert):
+    # Like Serializer.to_representation(), None is never handed to the field
+    def value(row):
+        raw = get(row)
+        return None if raw is None else convert(raw)
+    return value
+
+
+def iso_datetime(get, field, tz):
+    # DateTimeField.to_representation() without looking the timezone up again for every value
+    def value(row):
+        raw = get(row)
+        if raw is None:
+            return None
+        if raw.tzinfo is None:
+            return field.to_representation(raw)
+        text = raw.astimezone(tz).isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return value
+
+
+def is_default_datetime(field, tz):
+    # ISO 8601 in the current timezone, the settings this project's fields all use
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    return (
+        isinstance(field, serializers.DateTimeField) and tz is not None and not hasattr(field, 'timezone')
+        and output_format is not None and output_format.lower() == ISO_8601
+    )
+
+
+def nested(get_key, children):
+    def value(row):
+        if get_key(row) is None:
+            return None
+        return {name: child(row) for name, child in children}
+    return value
+
+
+def field_plan(serializer, model, tz, prefix=''):
+    """
+    ``(name, columns, value)`` for each field of a serializer instance, where
+    ``value`` reads the field's output from a row and ``columns`` are the
+    values_list() lookups it needs (None for SerializerMethodFields).
+    Datetimes are output in ``tz``.
+    """
+    plan = []
+    for name, field in serializer.fields.items():
+        if isinstance(field, serializers.SerializerMethodField):
+            plan.append((name, None, None))
+            continue
+        if '.' in field.source or field.source == '*':
+            raise ImproperlyConfigured(f'{type(serializer).__name__}.{name} has no column to read from values()')
+        model_field = model._meta.get_field(field.source)
+        if isinstance(field, serializers.ModelSerializer):
+            # Null when the foreign key is, like DRF does for a missing related object
+            related_prefix = f'{prefix}{field.source}__'
+            children = field_plan(field, model_field.related_model, tz, related_prefix)
+            columns = tuple(column for _, child_columns, _ in children for column in child_columns)
+            key = related_prefix + model_field.related_model._meta.pk.attname
+            if key not in columns:
+                key = prefix + model_field.attname
+                columns = (key, *columns)
+            plan.append((name, columns, nested(attrgetter(key), [(child, value) for child, _, value in children])))
+            continue
+        # A foreign key's attname holds the primary key a PrimaryKeyRelatedField outputs
+        column = prefix + (model_field.attname if isinstance(field, serializers.PrimaryKeyRelatedField) else field.source)
+        get = attrgetter(column)
+        if type(field).to_representation in PASSTHROUGH or (
+                isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None):
+            plan.append((name, (column,), get))
+        elif is_default_datetime(field, tz):
+            plan.append((name, (column,), iso_datetime(get, field, tz)))
+        else:
+            plan.append((name, (column,), converted(get, field.to_representation)))
+    return plan
+
+
+@lru_cache(maxsize=256)
+def cached_plan(serializer_class, requested, tz):
+    # Keyed on the requested fields, which ?fields= can vary freely, hence the bound
+    serializer = serializer_class()
+    trim_fields(serializer.fields, set(requested))
+    return field_plan(serializer, serializer_class.Meta.model, tz)
+
+
+class ValuesSerializer:
+    """
+    Serializes ``values()`` rows the way ``serializer_class`` serializes
+    instances. Rows come from ``values()``, which selects the columns this
+    serializer reads for the request plus ``required`` ones.
+
+    A SerializerMethodField ``name`` is served by ``get_<name>(row)``, and
+    the columns that method reads are listed in ``method_columns[name]``.
+    """
+    serializer_class = None
+    method_columns = {}
+
+    def __init__(self, instance=None, many=False, context=None):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+        self.fields = [
+            (name, value if value is not None else getattr(self, f'get_{name}'))
+            for name, _, value in self.get_plan(requested_fields(self.context.get('request')))
+        ]
+
+    @classmethod
+    def get_plan(cls, fields):
+        # The timezone DRF's DateTimeField would use, looked up once per serializer
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        return cached_plan(cls.serializer_class, frozenset(fields or ()), tz)
+
+    @classmethod
+    def values(cls, queryset, fields=None, required=()):
+        """``queryset`` as named rows holding what this serializer reads for ``?fields=``."""
+        model = queryset.model
+        columns = [model._meta.get_field(name).attname for name in ('id', *required)]
+        for name, field_columns, _ in cls.get_plan(fields):
+            columns.extend(cls.method_columns.get(name, ()) if field_columns is None else field_columns)
+        return queryset.values_list(*dict.fromkeys(columns), named=True)
+
+    def to_representation(self, row):
+        return {name: value(row) for name, value in self.fields}
+
+    @property
+    def data(self):
+        if self.many:
+            to_representation = self.to_representation
+            return [to_representation(row) for row in self.instance]
+        return self.to_representation(self.instance)
+
+
+class BlogPostListValuesSerializer(ValuesSerializer):
+    serializer_class = BlogPostListSerializer
+
+
+class ReplyValuesSerializer(ValuesSerializer):
+    serializer_class = ReplySerializer
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    serializer_class = CommentSerializer
+    method_columns = {
+        'replies': ('reply_id', 'reply_count', 'post_id', 'path'),
+        'replies_next': ('path',),
+    }
+
+    def get_replies(self, row):
+        if row.reply_id is not None:  # Only for top-level comments
+            return []
+        tree = self.context.get('comment_tree')
+        if tree is not None:
+            replies = tree.replies_for(row)
+        elif row.reply_count == 0:
+            return []
+        else:
+            fields = requested_fields(self.context.get('request'))
+            replies = ReplyValuesSerializer.values(
+                Comment.objects.filter(subtree_filter(row.post_id, row.path)).order_by('path'), fields
+            )
+        return ReplyValuesSerializer(replies, many=True, context=self.context).data
+
+    def get_replies_next(self, row):
+        return replies_next_link(row, self.context.get('comment_tree'), self.context.get('request'))
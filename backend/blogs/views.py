@@ -1,42 +1,86 @@
 from rest_framework.response import Response
 from rest_framework import status
-from blogs.models import BlogPost, Comment
-from blogs.serializers import BlogPostSerializer, CommentSerializer
+from blogs.models import BlogPost, Comment, blog_slug
+from blogs.serializers import (
+    BlogPostSerializer, BlogPostSearchSerializer, CommentSerializer, narrow_queryset, reply_page_link, requested_fields,
+)
 from blogs.renderers import BlogPostJSONRenderer
+from blogs.values_serializers import BlogPostListValuesSerializer, CommentValuesSerializer, ReplyValuesSerializer
 from rest_framework.views import APIView
 from rest_framework.serializers import ModelSerializer
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.utils.text import slugify
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from django.core.mail import send_mail
 from django.conf import settings
-from .pagination import CustomPageNumberPagination
+from django.db import router, transaction
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+from .pagination import (
+    CommentCursorPagination, ReplyCursorPagination, SearchPageNumberPagination, cursor_requested, get_blog_paginator,
+)
+from .counts import get_blog_count, published_count_key, author_count_key
+from .comment_tree import TREE_FIELDS, load_comment_tree, load_replies_by_parent, load_reply_previews
+from .feed_cache import feed_cache_key, get_cached_feed, cache_feed
+from .conditional import POST_VALIDATORS, has_validators, loaded_post_version, not_modified, post_version, set_validators
+from .search import search_blogs
+from .export import EXPORT_FORMATS, EXPORTS, export_lines
+from backend.db_router import ReplicaReadsMixin, pinned_to_primary
 from notifications.tasks import send_comment_notification_email, send_new_blog_notification_to_users
 
 
-class GetAllBlogsView(APIView):
+class GetAllBlogsView(ReplicaReadsMixin, APIView):
     renderer_classes = [BlogPostJSONRenderer]
     permission_classes = [AllowAny]
 
     def get(self, request, format=None):
+        # The feed is the same for every visitor, so whole pages are cached until a blog write.
+        # A user who just wrote skips the cache, it may hold a page read from a lagging replica.
+        key = feed_cache_key(request)
+        cached = None if pinned_to_primary() else get_cached_feed(key)
+        if cached is not None:
+            return Response(cached, status=status.HTTP_200_OK, headers={'X-Cache': 'HIT'})
+
         blogs = BlogPost.objects.filter(status='published').order_by('-published_date')
         # serializer = BlogPostSerializer(blogs, many=True)
-        paginator = CustomPageNumberPagination()
-        return paginator.generate_response(blogs, BlogPostSerializer, request)
+        paginator = get_blog_paginator(request)
+        total = lambda: get_blog_count(blogs, published_count_key())
+        # Rows straight from values(), published_date is always loaded since cursor pagination keys on it
+        page = BlogPostListValuesSerializer.values(blogs, requested_fields(request), required=('published_date',))
+        response = paginator.generate_response(page, BlogPostListValuesSerializer, request, total=total)
+        if response.status_code == status.HTTP_200_OK:
+            # Encoded once, for the cache and the response
+            response.data = cache_feed(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
     
     
-class GetUserBlogsView(APIView):
+class GetUserBlogsView(ReplicaReadsMixin, APIView):
     renderer_classes = [BlogPostJSONRenderer]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, format=None):
         blogs = BlogPost.objects.filter(author=request.user)
         # serializer = BlogPostSerializer(blogs, many=True)
-        paginator = CustomPageNumberPagination()
+        paginator = get_blog_paginator(request)
+        total = lambda: get_blog_count(blogs, author_count_key(request.user.id))
+        page = BlogPostListValuesSerializer.values(blogs, requested_fields(request), required=('published_date',))
         # return Response(serializer.data, status=status.HTTP_200_OK)
-        return paginator.generate_response(blogs, BlogPostSerializer, request)
+        return paginator.generate_response(page, BlogPostListValuesSerializer, request, total=total)
+
+
+class SearchBlogsView(ReplicaReadsMixin, APIView):
+    renderer_classes = [BlogPostJSONRenderer]
+    permission_classes = [AllowAny]
+
+    def get(self, request, format=None):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'Search query is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        results, total = search_blogs(query)
+        paginator = SearchPageNumberPagination()
+        return paginator.generate_response(results, BlogPostSearchSerializer, request, total=total)
 
 
-class CreateBlogView(APIView):
+class CreateBlogView(ReplicaReadsMixin, APIView):
     renderer_classes = [BlogPostJSONRenderer]
     permission_classes = [IsAuthenticated]
 
@@ -45,8 +89,7 @@ class CreateBlogView(APIView):
         title = data.get('title')
         if not title:
             return Response({'error': 'Title is required.'}, status=status.HTTP_400_BAD_REQUEST)
-        slug = slugify(title)
-        data['slug'] = slug
+        data['slug'] = blog_slug(title)
         data['author'] = request.user.id
         serializer = BlogPostSerializer(data=data)
         # print(data)
@@ -63,30 +106,49 @@ class CreateBlogView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class GetOneBlogView(APIView):
+class GetOneBlogView(ReplicaReadsMixin, APIView):
     renderer_classes = [BlogPostJSONRenderer]
     permission_classes = [AllowAny]
 
     def get(self, request, slug, format=None):
-        blog = BlogPost.objects.get(slug=slug)
-        serializer = BlogPostSerializer(blog)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        try:
+            return self.get_blog(request, slug)
+        except BlogPost.DoesNotExist:
+            return Response(data={'message': 'Blog does not exist'}, status=status.HTTP_404_NOT_FOUND)
 
+    def get_blog(self, request, slug):
+        if has_validators(request):
+            # Answers revalidation from the slug index alone, without loading the post
+            row = BlogPost.objects.filter(slug=slug).values_list(*POST_VALIDATORS).first()
+            if row is not None:
+                response = not_modified(request, *post_version(*row))
+                if response is not None:
+                    return response
 
-class DeleteBlogView(APIView):
+        blogs = narrow_queryset(
+            BlogPost.objects.select_related('author'), BlogPostSerializer, requested_fields(request),
+            required=('author', *POST_VALIDATORS)
+        )
+        blog = blogs.get(slug=slug)
+        serializer = BlogPostSerializer(blog, context={'request': request})
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(response, request, *loaded_post_version(blog))
+
+
+class DeleteBlogView(ReplicaReadsMixin, APIView):
     renderer_classes = [BlogPostJSONRenderer]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, format=None):
         blog = BlogPost.objects.get(id=request.data.get('id'))
-        if blog.author != request.user:
+        if blog.author_id != request.user.id:
             return Response({'error': 'You do not have permission to delete this blog.'}, status=status.HTTP_403_FORBIDDEN)
         blog.delete()
         return Response({'message': 'Blog deleted successfully'}, status=status.HTTP_204_NO_CONTENT
                         )
 
 
-class UpdateBlogView(APIView):
+class UpdateBlogView(ReplicaReadsMixin, APIView):
     renderer_classes = [BlogPostJSONRenderer]
     permission_classes = [IsAuthenticated]
 
@@ -96,8 +158,7 @@ class UpdateBlogView(APIView):
         title = data.get('title')
         if not title:
             return Response({'error': 'Title is required.'}, status=status.HTTP_400_BAD_REQUEST)
-        slug = slugify(title)
-        data['slug'] = slug
+        data['slug'] = blog_slug(title)
         serializer = BlogPostSerializer(blog, data=data)
         if serializer.is_valid(raise_exception=True):
             updated_blog = serializer.save()
@@ -110,18 +171,42 @@ class UpdateBlogView(APIView):
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-class CommentView(APIView):
+class CommentView(ReplicaReadsMixin, APIView):
     renderer_classes = [BlogPostJSONRenderer]
     permission_classes = [AllowAny]
     serializer_class = ModelSerializer
+    # Replies embedded under each top-level comment, the rest sit behind replies_next
+    reply_preview_limit = 3
 
     def get(self, request, blog_id, format=None):
-        blog = BlogPost.objects.get(pk=blog_id)
-        # top_level_comments = blog.comments.filter(reply__isnull=True)
-        # Only get top-level comments (where reply is None)
-        comments = blog.comments.filter(reply__isnull=True).order_by('-created_at')
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        try:
+            blog = BlogPost.objects.only('id', 'comments_updated_at').get(pk=blog_id)
+        except BlogPost.DoesNotExist:
+            return Response(data={'message': 'Blog does not exist'}, status=status.HTTP_404_NOT_FOUND)
+        response = not_modified(request, blog.comments_updated_at)
+        if response is not None:
+            return response
+
+        fields = requested_fields(request)
+        if not cursor_requested(request):
+            # Every thread in full, as a list, for clients that don't page
+            tree = load_comment_tree(blog, fields, as_values=True)
+            serializer = CommentValuesSerializer(tree.top_level, many=True, context={'request': request, 'comment_tree': tree})
+            return set_validators(Response(serializer.data, status=status.HTTP_200_OK), request, blog.comments_updated_at)
+
+        # One page of top-level comments, then the first replies of each thread in one more query
+        paginator = CommentCursorPagination()
+        comments = CommentValuesSerializer.values(
+            Comment.objects.filter(post=blog, reply__isnull=True), fields,
+            required=(*TREE_FIELDS, 'created_at', 'reply_count')
+        )
+        try:
+            page = paginator.paginate_queryset(comments, request)
+        except NotFound:
+            return Response({'message': paginator.invalid_cursor_message}, status=status.HTTP_400_BAD_REQUEST)
+        tree = load_reply_previews(page, self.reply_preview_limit, fields, as_values=True)
+        serializer = CommentValuesSerializer(tree.top_level, many=True, context={'request': request, 'comment_tree': tree})
+        return set_validators(paginator.get_paginated_response(serializer.data), request, blog.comments_updated_at)
 
     def post(self, request, blog_id, format=None):
         try:
@@ -141,7 +226,9 @@ class CommentView(APIView):
 
             serializer = CommentSerializer(data=data, context={'request': request})
             if serializer.is_valid(raise_exception=True):
-                comment = serializer.save()
+                # The comment counters are bumped by signals inside the same transaction
+                with transaction.atomic():
+                    comment = serializer.save()
                 
                 # Send notification email to blog post owner
                 send_comment_notification_email.delay(comment.id)
@@ -152,16 +239,32 @@ class CommentView(APIView):
         except BlogPost.DoesNotExist:
             return Response(data={'message': 'Blog does not exist'}, status=status.HTTP_404_NOT_FOUND)
         
-class ReplyView(APIView):
+class ReplyView(ReplicaReadsMixin, APIView):
     renderer_classes = [BlogPostJSONRenderer]
     permission_classes = [AllowAny]
     serializer_class = ModelSerializer
 
     def get(self, request, comment_id, format=None):
-        parent_comment = Comment.objects.get(pk = comment_id)
-        replies = parent_comment.get_replies()
-        serializer = CommentSerializer(replies, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        try:
+            parent_comment = Comment.objects.only('post_id', 'path', 'depth').get(pk=comment_id)
+        except Comment.DoesNotExist:
+            return Response(data={'message': 'Comment does not exist'}, status=status.HTTP_404_NOT_FOUND)
+        # The subtree in thread order, or ?depth=N levels of it, a page at a time
+        max_depth = request.GET.get('depth')
+        max_depth = int(max_depth) if max_depth and max_depth.isdigit() else None
+        replies = CommentValuesSerializer.values(
+            parent_comment.get_subtree(max_depth), requested_fields(request), required=('reply', 'path')
+        )
+        if not cursor_requested(request):
+            serializer = CommentValuesSerializer(replies, many=True, context={'request': request})
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = ReplyCursorPagination()
+        try:
+            page = paginator.paginate_queryset(replies, request)
+        except NotFound:
+            return Response({'message': paginator.invalid_cursor_message}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = CommentValuesSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
     
     def post(self, request, comment_id, format=None):
         try:
@@ -174,13 +277,15 @@ class ReplyView(APIView):
             parent_comment = Comment.objects.get(pk=comment_id)
             data = {}
             # data['user'] = request.user.id
-            data['post'] = parent_comment.post.id  # link to the original post
+            data['post'] = parent_comment.post_id  # link to the original post
             data['reply'] = parent_comment.id       # link to the parent comment
             data['comment'] = request.data.get('comment') # 
 
             serializer = CommentSerializer(data=data, context={'request': request})
             if serializer.is_valid(raise_exception=True):
-                comment = serializer.save()
+                # The comment counters are bumped by signals inside the same transaction
+                with transaction.atomic():
+                    comment = serializer.save()
                 
                 # Send notification to the blog post owner (since this is still a comment on their post)
                 send_comment_notification_email.delay(comment.id)
@@ -192,7 +297,52 @@ class ReplyView(APIView):
             return Response(data={'message': 'Comment does not exist'}, status=status.HTTP_404_NOT_FOUND)
         
 
-class ContactFormView(APIView):
+class BatchReplyView(ReplicaReadsMixin, APIView):
+    """
+    Direct replies of several comments at once, ?ids=1,2,3, grouped by parent
+    id. Each parent's ``next`` links to the rest of them in ReplyView.
+    """
+    renderer_classes = [BlogPostJSONRenderer]
+    permission_classes = [AllowAny]
+    max_ids = 100
+    replies_per_comment = 20
+
+    def get(self, request, format=None):
+        try:
+            ids = list(dict.fromkeys(int(value) for value in request.GET.get('ids', '').split(',') if value.strip()))
+        except ValueError:
+            return Response({'error': 'ids must be a comma separated list of comment ids.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not ids or len(ids) > self.max_ids:
+            return Response({'error': f'Between 1 and {self.max_ids} comment ids are required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        grouped = load_replies_by_parent(ids, self.replies_per_comment, requested_fields(request), as_values=True)
+        context = {'request': request}
+        data = {}
+        for parent_id, replies in grouped.items():
+            page = replies[:self.replies_per_comment]
+            data[str(parent_id)] = {
+                'next': reply_page_link(parent_id, page[-1], request, depth=1)
+                if len(replies) > self.replies_per_comment else None,
+                'results': ReplyValuesSerializer(page, many=True, context=context).data,
+            }
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class ExportView(ReplicaReadsMixin, APIView):
+    """Streams every post, comment or author as NDJSON or CSV, for analytics."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, kind, fmt, format=None):
+        if kind not in EXPORTS or fmt not in EXPORT_FORMATS:
+            return Response({'error': 'Unknown export.'}, status=status.HTTP_404_NOT_FOUND)
+        # The rows are read after the view returns, so the database is picked now
+        using = router.db_for_read(EXPORTS[kind][0])
+        response = StreamingHttpResponse(export_lines(kind, fmt, using=using), content_type=EXPORT_FORMATS[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{kind}.{fmt}"'
+        return response
+
+
+class ContactFormView(ReplicaReadsMixin, APIView):
     renderer_classes = [BlogPostJSONRenderer]
     permission_classes = [AllowAny]
 
@@ -0,0 +1,80 @@
+"""
+Production gunicorn settings, picked up automatically when gunicorn runs from
+this directory:
+
+    gunicorn backend.wsgi:application
+
+Every value can be overridden on the command line or with GUNICORN_CMD_ARGS.
+"""
+import json
+import logging
+import os
+import time
+
+STARTED = time.monotonic()
+
+# Never serve production traffic with DEBUG on, it keeps every query in memory
+os.environ.setdefault('DEBUG', 'False')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+# Workers keep their warmed connection instead of reconnecting per request
+os.environ.setdefault('CONN_MAX_AGE', '60')
+
+
+def available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+# Threads cover requests waiting on the database, processes cover CPU
+workers = int(os.getenv('WEB_CONCURRENCY', available_cpus() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+# Load Django once in the master so workers fork with it already imported and warm
+preload_app = True
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then so slow leaks can't accumulate
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+logger = logging.getLogger('gunicorn.error')
+
+
+def since_start():
+    return round((time.monotonic() - STARTED) * 1000, 2)
+
+
+def when_ready(server):
+    # The app is preloaded at this point and no worker exists yet
+    from backend.warmup import warm_up_app
+
+    timings = warm_up_app()
+    logger.info('startup %s', json.dumps({'event': 'master_ready', 'since_start_ms': since_start(), 'warmup_ms': timings}))
+
+
+def post_worker_init(worker):
+    from backend.warmup import warm_up_connections
+
+    try:
+        timings = warm_up_connections()
+    except Exception:
+        logger.exception('Worker %s could not reach the database', worker.pid)
+        timings = {}
+    logger.info('startup %s', json.dumps({
+        'event': 'worker_ready', 'pid': worker.pid, 'since_start_ms': since_start(), 'warmup_ms': timings,
+    }))
+
+
+def worker_exit(server, worker):
+    # What the worker's connection pool went through, for sizing DB_POOL_MAX_SIZE
+    from backend.db_pool import pool_stats
+    from blogs.feed_cache import feed_cache_stats
+
+    logger.info('db_pool %s', json.dumps({'pid': worker.pid, 'databases': pool_stats()}))
+    logger.info('feed_cache %s', json.dumps({'pid': worker.pid, **feed_cache_stats()}))
@@ -4,6 +4,7 @@ from django.conf import settings
 from blogs.models import BlogPost, Comment
 from users.models import CustomUser
 from django.template.loader import render_to_string
+from backend.db_router import replica_reads
 
 @shared_task
 def send_comment_notification_email(comment_id):
@@ -55,11 +56,14 @@ def send_new_blog_notification_to_users(blog_id):
         if blog.status != 'published':
             return "Blog is not published, no notifications sent"
         
-        # Gets all active, verified users except the blog author
-        active_users = CustomUser.objects.filter(
-            is_active=True,
-            is_email_verified=True
-        ).exclude(id=blog.author.id)
+        # Gets all active, verified users except the blog author. The blog was
+        # just written so it comes from the primary, the recipients can come
+        # from the replica.
+        with replica_reads():
+            active_users = list(CustomUser.objects.filter(
+                is_active=True,
+                is_email_verified=True
+            ).exclude(id=blog.author.id))
         
         subject = f"New Blog Post: {blog.title}"
         
@@ -87,7 +91,7 @@ Your Blog App Team
                 fail_silently=False,
             )
         
-        return f"New blog notification sent to {active_users.count()} users"
+        return f"New blog notification sent to {len(active_users)} users"
     
     except Exception as e:
         return f"Failed to send blog notifications: {str(e)}"
@@ -101,15 +105,16 @@ def check_for_new_blogs():
     # Finds blogs published in the last hour
     one_hour_ago = timezone.now() - timedelta(hours=1)
     
-    # Gets recent published blogs
-    new_blogs = BlogPost.objects.filter(
-        status='published',
-        published_date__gte=one_hour_ago
-    )
+    # Gets recent published blogs, a scan the replica can take
+    with replica_reads():
+        new_blogs = list(BlogPost.objects.filter(
+            status='published',
+            published_date__gte=one_hour_ago
+        ).values_list('id', flat=True))
     
     count = 0
-    for blog in new_blogs:
-        send_new_blog_notification_to_users.delay(blog.id)
+    for blog_id in new_blogs:
+        send_new_blog_notification_to_users.delay(blog_id)
         count += 1
     
     return f"Scheduled notifications for {count} new blogs"
\ No newline at end of file
@@ -1,9 +1,10 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from unittest.mock import patch, MagicMock
 from django.utils import timezone
 from datetime import timedelta
 from blogs.models import BlogPost, Comment
 from users.models import CustomUser
+from backend.testing import ReplicaDatabaseMixin
 from notifications.tasks import (
     send_comment_notification_email,
     send_new_blog_notification_to_users,
@@ -185,4 +186,42 @@ class NotificationTasksTestCase(TestCase):
         
         # Check that the exception was caught
         self.assertIn("Failed to send comment notification:", result)
-        self.assertIn("Test exception", result)
\ No newline at end of file
+        self.assertIn("Test exception", result)
+
+
+class NotificationReplicaTestCase(ReplicaDatabaseMixin, TransactionTestCase):
+    replicated_models = (CustomUser, BlogPost, Comment)
+
+    def setUp(self):
+        self.author = CustomUser.objects.create_user(
+            email='author@example.com', username='author', password='authorpass', is_email_verified=True
+        )
+        self.subscriber = CustomUser.objects.create_user(
+            email='subscriber@example.com', username='subscriber', password='subscriberpass', is_email_verified=True
+        )
+        super().setUp()
+
+    @patch('notifications.tasks.send_mail')
+    def test_new_blog_comes_from_the_primary_and_recipients_from_the_replica(self, mock_send_mail):
+        # Neither is on the replica yet
+        CustomUser.objects.create_user(
+            email='newcomer@example.com', username='newcomer', password='newcomerpass', is_email_verified=True
+        )
+        blog = BlogPost.objects.create(
+            title='Fresh Blog', slug='fresh-blog', content='Content', author=self.author, status='published'
+        )
+
+        result = send_new_blog_notification_to_users(blog.id)
+
+        self.assertEqual(result, "New blog notification sent to 1 users")
+        self.assertEqual(mock_send_mail.call_args.kwargs['recipient_list'], [self.subscriber.email])
+
+    @patch('notifications.tasks.send_new_blog_notification_to_users')
+    def test_check_for_new_blogs_scans_the_replica(self, mock_send_notification):
+        BlogPost.objects.create(
+            title='Fresh Blog', slug='fresh-blog', content='Content', author=self.author, status='published'
+        )
+        self.assertEqual(check_for_new_blogs(), "Scheduled notifications for 0 new blogs")
+
+        self.replicate()
+        self.assertEqual(check_for_new_blogs(), "Scheduled notifications for 1 new blogs")
@@ -0,0 +1,64 @@
+"""
+JWT authentication with the user read from the cache.
+
+JWTAuthentication loads the user row on every authenticated request.
+CachedJWTAuthentication keeps it in the cache for AUTH_USER_CACHE_TIMEOUT
+seconds, keyed by user id, and users.signals drops the entry whenever the
+row is saved or deleted: password changes, deactivation, email
+verification. The active and revoked-token checks of JWTAuthentication run
+on the cached user as well.
+
+Secrets never go to the cache: the user comes back with the password and
+the email OTP deferred, loaded from the database if anything reads them.
+For the revoked-token check the entry holds the hash the token claim is
+compared with, only while CHECK_REVOKE_TOKEN is on.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+AUTH_USER_KEY_PREFIX = 'users:auth:'
+SECRET_FIELDS = {'password', 'email_otp'}
+
+
+def auth_user_key(user_id):
+    return f'{AUTH_USER_KEY_PREFIX}{user_id}'
+
+
+def forget_auth_user(user_id):
+    cache.delete(auth_user_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        key = auth_user_key(user_id)
+        entry = cache.get(key)
+        if entry is None or (api_settings.CHECK_REVOKE_TOKEN and entry['password_hash'] is None):
+            # Missing, inactive and revoked users raise here and are never cached
+            user = super().get_user(validated_token)
+            cache.set(key, self.cache_entry(user), settings.AUTH_USER_CACHE_TIMEOUT)
+            return user
+
+        user = self.user_model.from_db(entry['db'], list(entry['fields']), list(entry['fields'].values()))
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != entry['password_hash']:
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return user
+
+    def cache_entry(self, user):
+        fields = {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields if field.name not in SECRET_FIELDS
+        }
+        password_hash = get_md5_hash_password(user.password) if api_settings.CHECK_REVOKE_TOKEN else None
+        return {'db': user._state.db, 'fields': fields, 'password_hash': password_hash}
@@ -2,15 +2,20 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
 
 class CaseInsensitiveModelBackend(ModelBackend):
+    """
+    The only authentication backend: the email is matched in any letter case
+    and the password hashed once per attempt, found or not.
+    """
 
     def authenticate(self, request, username=None, password=None, **kwargs):
         UserModel = get_user_model()
         if username is None:
             username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
 
         try:
-            case_insensitive_username_field = '{}__iexact'.format(UserModel.USERNAME_FIELD)
-            user = UserModel._default_manager.get(**{case_insensitive_username_field: username})
+            user = UserModel._default_manager.get_by_email(username)
         except UserModel.DoesNotExist:
             UserModel().set_password(password)  # Prevents timing attack
         else:
@@ -33,5 +38,3 @@ class CaseInsensitiveModelBackend(ModelBackend):
 #             return None
 #         except User.MultipleObjectsReturned:
 #             return User.objects.filter(email=username).order_by('id').first()
-
-
@@ -0,0 +1,97 @@
+import json
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blogs.management.commands.benchmark_endpoints import current_commit, summarize
+from users.models import CustomUser
+
+# Stored as Benchmark.Login@example.com, normalize_email() lowercases the domain
+EMAIL = 'Benchmark.Login@Example.com'
+STORED_EMAIL = 'Benchmark.Login@example.com'
+PASSWORD = 'benchmark-password'
+
+BACKEND_SETUPS = {
+    # What AUTHENTICATION_BACKENDS used to list, ModelBackend's exact lookup before ours
+    'two-pass': ('django.contrib.auth.backends.ModelBackend', 'users.backends.CaseInsensitiveModelBackend'),
+    'single-pass': ('users.backends.CaseInsensitiveModelBackend',),
+}
+
+# (email, password, expected status) of each kind of attempt
+ATTEMPTS = {
+    'exact-case': (STORED_EMAIL, PASSWORD, 200),
+    'other-case': (EMAIL, PASSWORD, 200),
+    'wrong-password': (STORED_EMAIL, 'wrong-password', 401),
+    'unknown-email': ('nobody@example.com', PASSWORD, 401),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Login throughput of POST /users/login/ for successful and failed attempts, with the single '
+        'authentication backend against the two the project used to run'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10, help='Attempts of each kind per setup')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        results = {
+            'meta': {
+                'commit': current_commit(),
+                'database': connection.vendor,
+                'iterations': options['iterations'],
+            },
+            'setups': {},
+        }
+        client = Client()
+        # Failed attempts would each log an "Unauthorized" warning
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        with transaction.atomic():
+            CustomUser.objects.create_user(email=EMAIL, username='benchmark-login', password=PASSWORD, is_email_verified=True)
+            for setup, backends in BACKEND_SETUPS.items():
+                with override_settings(AUTHENTICATION_BACKENDS=backends):
+                    results['setups'][setup] = {
+                        attempt: self.measure(client, *credentials, options['iterations'])
+                        for attempt, credentials in ATTEMPTS.items()
+                    }
+            transaction.set_rollback(True)
+        request_logger.setLevel(level)
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def measure(self, client, email, password, expected_status, iterations):
+        payload = json.dumps({'email': email, 'password': password})
+        timings, queries = [], []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = client.post('/users/login/', payload, content_type='application/json')
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured))
+            if response.status_code != expected_status:
+                raise AssertionError(f'Login with {email} answered {response.status_code}, expected {expected_status}')
+        stats = summarize(timings, queries)
+        stats['logins_per_second'] = round(1000 / stats['mean_ms'], 2)
+        return stats
+
+    def report(self, results):
+        self.stdout.write(f"{results['meta']['iterations']} attempts of each kind, one process")
+        self.stdout.write(f"{'setup':12} {'attempt':15} {'mean':>10} {'p95':>10} {'logins/s':>9} {'queries':>8}")
+        for setup, attempts in results['setups'].items():
+            for attempt, stats in attempts.items():
+                self.stdout.write(
+                    f"{setup:12} {attempt:15} {stats['mean_ms']:>8.1f}ms {stats['p95_ms']:>8.1f}ms "
+                    f"{stats['logins_per_second']:>9.2f} {stats['queries_mean']:>8}"
+                )
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:27
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='customuser_email_lower_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Lower
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, username, password=None, password2=None, **extra_fields):
@@ -24,6 +26,16 @@ class CustomUserManager(BaseUserManager):
 
         return user
 
+    def get_by_email(self, email):
+        """
+        The user with ``email`` in any letter case, found through the lower(email)
+        index. When addresses differ only in case, the exact match wins.
+        """
+        users = list(self.alias(email_lower=Lower('email')).filter(email_lower=Lower(Value(email))).order_by('pk'))
+        if not users:
+            raise self.model.DoesNotExist(f'No user with the email {email!r}')
+        return next((user for user in users if user.email == email), users[0])
+
 class CustomUser(AbstractBaseUser):
     email = models.EmailField(unique=True)
     username = models.CharField(max_length=150, unique=True)
@@ -42,6 +54,10 @@ class CustomUser(AbstractBaseUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
+    class Meta:
+        # Case-insensitive login lookups, see CustomUserManager.get_by_email()
+        indexes = [models.Index(Lower('email'), name='customuser_email_lower_idx')]
+
     def __str__(self):
         return self.username
 
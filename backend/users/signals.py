@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .authentication import forget_auth_user
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def user_changed(sender, instance, **kwargs):
+    # Password changes, deactivation and email verification all save the row
+    pk = instance.pk
+    forget_auth_user(pk)
+    # A request that read the old row before the commit may have cached it again.
+    # The pk is taken now, a delete has set instance.pk to None by the time this runs
+    transaction.on_commit(lambda: forget_auth_user(pk))
@@ -0,0 +1,93 @@
+import json
+from unittest.mock import patch
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.authentication import auth_user_key
+from users.models import CustomUser
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword',
+            is_email_verified=True
+        )
+        self.authorize(self.user)
+
+    def authorize(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+    def test_user_is_loaded_once(self):
+        with self.assertNumQueries(1):
+            self.client.get(reverse('is-auth'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('user'))
+        self.assertEqual(response.data['data']['username'], 'testuser')
+
+    def test_secrets_are_not_cached(self):
+        CustomUser.objects.filter(pk=self.user.pk).update(email_otp='123456')
+        self.client.get(reverse('is-auth'))
+        entry = repr(cache.get(auth_user_key(self.user.id)))
+        self.assertIn('testuser@example.com', entry)
+        self.assertNotIn(self.user.password, entry)
+        self.assertNotIn('123456', entry)
+
+        # Read from the database when something needs them
+        request = self.client.get(reverse('is-auth')).wsgi_request
+        with self.assertNumQueries(1):
+            self.assertTrue(request.user.check_password('testpassword'))
+
+    def test_saving_the_user_drops_the_entry(self):
+        self.client.get(reverse('is-auth'))
+        self.user.username = 'renamed'
+        self.user.save()
+        self.assertIsNone(cache.get(auth_user_key(self.user.id)))
+        response = self.client.get(reverse('user'))
+        self.assertEqual(response.data['data']['username'], 'renamed')
+
+    def test_entry_cached_again_before_a_delete_commits_is_dropped(self):
+        key = auth_user_key(self.user.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+            # A concurrent request that read the row before the delete committed
+            cache.set(key, 'stale')
+        self.assertIsNone(cache.get(key))
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(reverse('is-auth'))
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse('is-auth'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_user_is_still_checked(self):
+        self.client.get(reverse('is-auth'))
+        # As if the row changed without a signal, the copy in the cache is checked like a fresh one
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        entry = cache.get(auth_user_key(self.user.id))
+        entry['fields']['is_active'] = False
+        cache.set(auth_user_key(self.user.id), entry)
+        response = self.client.get(reverse('is-auth'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True)
+    def test_password_change_revokes_older_tokens(self):
+        # The token now carries the password hash it was issued for
+        self.authorize(self.user)
+        self.client.get(reverse('is-auth'))
+        response = self.client.post(
+            reverse('changepassword'),
+            data=json.dumps({'password': 'changed123', 'password2': 'changed123'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.data['status'], '200')
+        response = self.client.get(reverse('is-auth'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,41 @@
+from unittest.mock import patch
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import TestCase
+from users.models import CustomUser
+
+
+class CaseInsensitiveModelBackendTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email='Test.User@example.com',
+            username='testuser',
+            password='testpassword'
+        )
+
+    def test_email_matches_in_any_case(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(authenticate(email='test.user@EXAMPLE.com', password='testpassword'), self.user)
+
+    def test_exact_match_wins_over_addresses_differing_in_case(self):
+        other = CustomUser.objects.create_user(email='test.user@example.com', username='other', password='testpassword')
+        self.assertEqual(CustomUser.objects.get_by_email('test.user@example.com'), other)
+        self.assertEqual(CustomUser.objects.get_by_email('Test.User@example.com'), self.user)
+        self.assertEqual(CustomUser.objects.get_by_email('TEST.USER@example.com'), self.user)
+
+    def test_failed_logins_hash_the_password_once(self):
+        attempts = {
+            'wrong password': {'email': 'test.user@example.com', 'password': 'wrong'},
+            'unknown email': {'email': 'nobody@example.com', 'password': 'testpassword'},
+        }
+        for name, credentials in attempts.items():
+            with self.subTest(name), \
+                    patch('django.contrib.auth.base_user.check_password', wraps=check_password) as checked, \
+                    patch('django.contrib.auth.base_user.make_password', wraps=make_password) as made:
+                self.assertIsNone(authenticate(**credentials))
+                self.assertEqual(checked.call_count + made.call_count, 1)
+
+    def test_inactive_user_is_refused(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(authenticate(email='test.user@example.com', password='testpassword'))
@@ -0,0 +1,72 @@
+import json
+from unittest.mock import patch
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from backend.testing import QueryBudgetMixin
+from users.models import CustomUser
+
+
+class UserQueryBudgetTest(QueryBudgetMixin, APITestCase):
+    budget_urlconf = 'users.urls'
+    # Authenticated requests include the JWT user lookup
+    query_budgets = {
+        ('token/', 'post'): 1,
+        ('token/refresh/', 'post'): 1,
+        ('token/verify/', 'post'): 0,
+        ('register/', 'post'): 3,
+        ('verify/', 'post'): 2,
+        ('login/', 'post'): 1,
+        ('dashboard/', 'get'): 1,
+        ('changepassword/', 'post'): 2,
+        ('is-auth/', 'get'): 1,
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpassword',
+            is_email_verified=True,
+            email_otp='123456'
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {self.refresh.access_token}'}
+
+    def post_json(self, route, url, payload, **extra):
+        return self.assertQueryBudget(
+            route, 'post', url, data=json.dumps(payload), content_type='application/json', **extra
+        )
+
+    def test_every_route_has_a_budget(self):
+        self.assertRoutesBudgeted()
+
+    def test_token_endpoints(self):
+        credentials = {'email': 'testuser@example.com', 'password': 'testpassword'}
+        response = self.post_json('token/', reverse('get_token'), credentials)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.post_json('token/refresh/', reverse('refresh'), {'refresh': str(self.refresh)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.post_json('token/verify/', '/users/token/verify/', {'token': str(self.refresh.access_token)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @patch('users.views.send_otp_via_email')
+    def test_account_endpoints(self, mock_send_otp):
+        response = self.post_json('register/', reverse('register'), {
+            'username': 'newuser', 'email': 'new@example.com', 'password': 'newpassword', 'password2': 'newpassword'
+        })
+        self.assertEqual(response.data['status'], '200')
+        response = self.post_json('verify/', '/users/verify/', {'email': 'testuser@example.com', 'email_otp': '123456'})
+        self.assertEqual(response.data['status'], '200')
+        response = self.post_json('login/', reverse('login'), {'email': 'testuser@example.com', 'password': 'testpassword'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_authenticated_endpoints(self):
+        response = self.assertQueryBudget('dashboard/', 'get', reverse('user'), **self.auth)
+        self.assertEqual(response.data['status'], '200')
+        response = self.assertQueryBudget('is-auth/', 'get', reverse('is-auth'), **self.auth)
+        self.assertTrue(response.data['success'])
+        response = self.post_json('changepassword/', reverse('changepassword'), {'password': 'changed123', 'password2': 'changed123'}, **self.auth)
+        self.assertEqual(response.data['status'], '200')